@@ -0,0 +1,78 @@
+"""
+Measures BaseAgent.ask_batch throughput (prompts/sec) at increasing concurrency.
+
+Prompts go to a local OpenAI-compatible stub that answers each request after
+`--latency` seconds, standing in for model latency, so the numbers show how
+throughput scales with requests in flight rather than how fast the API is.
+Pass `--base-url` to run against a real endpoint instead.
+
+Usage:
+    python benchmarks/bench_batch.py --prompts 200 --concurrency 1 4 16 64
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.noovox.core import BaseAgent
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        payload = json.dumps({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_stub(latency):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prompts', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--latency', type=float, default=0.1, help="seconds the stub waits before answering")
+    parser.add_argument('--base-url', default=None, help="OpenAI-compatible endpoint; starts a stub if omitted")
+    args = parser.parse_args()
+
+    base_url = args.base_url
+    if base_url is None:
+        _, base_url = start_stub(args.latency)
+    agent = BaseAgent("Bench", "economics", "", api_key=os.getenv("OPEN_AI_KEY", "bench-key"), base_url=base_url)
+    prompts = [f"Question number {i}" for i in range(args.prompts)]
+
+    print(f"{'concurrency':>12}{'seconds':>10}{'prompts/s':>12}")
+    for concurrency in args.concurrency:
+        started = time.perf_counter()
+        agent.ask_batch(prompts, concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        print(f"{concurrency:>12}{elapsed:>10.2f}{len(prompts) / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
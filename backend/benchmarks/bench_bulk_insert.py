@@ -0,0 +1,90 @@
+"""
+Compares rows/sec for single-row inserts against batched `executemany` inserts.
+
+The single-row path mirrors `POST /api/content_tracking` (one INSERT and one COMMIT
+per row); the batched path mirrors `POST /api/content_tracking/batch` (one
+`executemany` and one COMMIT per batch). Rows are written to the database
+configured through the usual MYSQL_* environment variables and removed afterwards.
+
+Usage:
+    python benchmarks/bench_bulk_insert.py --rows 2000 --batch-size 500
+"""
+import argparse
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.noovox.db import create_mysql_pool
+
+INSERT_SQL = "INSERT INTO content_tracking (user_id, content_type, content_id) VALUES (%s, %s, %s)"
+
+
+def single_row(pool, rows):
+    for row in rows:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(INSERT_SQL, row)
+            conn.commit()
+            cursor.close()
+
+
+def batched(pool, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(INSERT_SQL, rows[start:start + batch_size])
+            conn.commit()
+            cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    pool = create_mysql_pool(
+        host=os.environ.get('MYSQL_HOST', 'localhost'),
+        user=os.environ.get('MYSQL_USER', 'root'),
+        password=os.environ.get('MYSQL_PASSWORD', 'password'),
+        database=os.environ.get('MYSQL_DATABASE', 'noovox'),
+        max_size=1
+    )
+
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO users (username, email) VALUES (%s, %s)",
+                       ('bench', f'bench-{int(time.time() * 1000)}@example.com'))
+        user_id = cursor.lastrowid
+        conn.commit()
+        cursor.close()
+
+    rows = [(user_id, 'view', content_id) for content_id in range(args.rows)]
+    try:
+        results = []
+        for name, run in [('single-row', lambda: single_row(pool, rows)),
+                          (f'executemany x{args.batch_size}', lambda: batched(pool, rows, args.batch_size))]:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            results.append((name, args.rows, f"{elapsed:.3f}", f"{args.rows / elapsed:,.0f}"))
+
+        print(f"{'mode':<22}{'rows':>8}{'seconds':>10}{'rows/sec':>12}")
+        for name, count, seconds, rate in results:
+            print(f"{name:<22}{count:>8}{seconds:>10}{rate:>12}")
+    finally:
+        # Deleting the user cascades to its content_tracking rows
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+            conn.commit()
+            cursor.close()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compares the HTML parser engines of NoovoxSearcher on saved pages.
+
+Each fixture is parsed the way the searcher parses it: listing pages through
+`extract_articles` with the per-source parser picked from the fixture's name,
+`article.html` through `parse_full_article`. For every engine available here
+(lxml engines need `pip install lxml`) the benchmark reports pages/sec, the
+peak Python heap while parsing one page (tracemalloc), and whether the
+extracted articles are identical to those of the plain html.parser engine.
+
+Fixtures are named after their source (google_news, bing_news, yahoo_news,
+reuters, ft, or article for an article page); point `--fixtures` at a
+directory of pages saved from the live sites to measure on real markup.
+
+Usage:
+    python benchmarks/bench_html_parsing.py --seconds 2
+"""
+import argparse
+import copy
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.noovox.core import NoovoxSearcher
+from backend.noovox.html_parsing import available_engines
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SOURCE_URLS = {
+    'google_news': 'https://news.google.com/search?q=inflation',
+    'bing_news': 'https://www.bing.com/news/search?q=inflation',
+    'yahoo_news': 'https://news.search.yahoo.com/search?p=inflation',
+    'reuters': 'https://www.reuters.com/search/news?blob=inflation',
+    'ft': 'https://www.ft.com/search?q=inflation',
+}
+ARTICLE = {'title': 'Saved article', 'url': 'https://www.example.com/news/saved-article'}
+
+
+def load_pages(directory):
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension == '.html' and (stem in SOURCE_URLS or stem == 'article'):
+            with open(os.path.join(directory, name), encoding='utf-8') as file:
+                pages[stem] = file.read()
+    return pages
+
+
+def parse(searcher, name, html):
+    if name == 'article':
+        return searcher.parse_full_article(copy.deepcopy(ARTICLE), html)
+    source = searcher.ContentSource(name=name, url=SOURCE_URLS[name], type='search', category='general')
+    return searcher.extract_articles(html, SOURCE_URLS[name], source)
+
+
+def pages_per_second(searcher, pages, budget):
+    started = time.perf_counter()
+    done = 0
+    while time.perf_counter() - started < budget:
+        for name, html in pages.items():
+            parse(searcher, name, html)
+        done += len(pages)
+    return done / (time.perf_counter() - started)
+
+
+def peak_kb(searcher, pages):
+    """Largest peak of the Python heap while parsing a single page, in kB."""
+    peak = 0
+    for name, html in pages.items():
+        tracemalloc.start()
+        parse(searcher, name, html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak / 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default=FIXTURES, help="directory of saved pages")
+    parser.add_argument('--seconds', type=float, default=2.0, help="time budget per engine")
+    args = parser.parse_args()
+
+    pages = load_pages(os.path.abspath(args.fixtures))
+    if not pages:
+        parser.error(f"no fixtures found in {args.fixtures}")
+
+    os.chdir(tempfile.mkdtemp())  # NoovoxSearcher writes news_scraper.log to the working directory
+    searcher = NoovoxSearcher()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    searcher.parser_engine = 'html.parser'
+    baseline = {name: parse(searcher, name, html) for name, html in pages.items()}
+
+    print(f"{len(pages)} pages, {sum(map(len, pages.values())) / 1e3:.0f} kB of HTML")
+    print(f"{'engine':<16}{'pages/s':>10}{'peak kB':>10}  identical")
+    for engine in available_engines():
+        searcher.parser_engine = engine
+        identical = all(parse(searcher, name, html) == baseline[name] for name, html in pages.items())
+        rate = pages_per_second(searcher, pages, args.seconds)
+        print(f"{engine:<16}{rate:>10.1f}{peak_kb(searcher, pages):>10.0f}  {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
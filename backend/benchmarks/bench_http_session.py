@@ -0,0 +1,74 @@
+"""
+Compares fetches/sec of one-off `requests.get` calls with the shared keep-alive session.
+
+`NoovoxSearcher.make_request` used to call `requests.get`, opening a new connection
+for every fetch; it now goes through the pooled session from `noovox.http_session`.
+Both are timed against a local HTTP/1.1 stub, fetching from `--threads` threads like
+`extract_full_content` does. Against real sites the gap is larger, since each new
+connection there also costs DNS, a TLS handshake and network round trips.
+
+Usage:
+    python benchmarks/bench_http_session.py --requests 2000 --threads 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.noovox.http_session import build_session
+
+PAGE = b"<html><body>" + b"<p>Lorem ipsum dolor sit amet.</p>" * 200 + b"</body></html>"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+
+def fetches_per_second(get, url, total, threads):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for response in executor.map(lambda i: get(f"{url}/article/{i}", timeout=10), range(total)):
+            response.raise_for_status()
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    session = build_session(pool_maxsize=args.threads)
+    print(f"{'client':<16}{'fetches/s':>12}")
+    print(f"{'requests.get':<16}{fetches_per_second(requests.get, url, args.requests, args.threads):>12.1f}")
+    print(f"{'shared session':<16}{fetches_per_second(session.get, url, args.requests, args.threads):>12.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
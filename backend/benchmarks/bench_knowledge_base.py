@@ -0,0 +1,117 @@
+"""
+Measures knowledge-base relevance lookups per second for growing knowledge bases.
+
+Compares the KnowledgeBaseIndex used by BaseAgent against the previous linear
+scan, which ran `fuzz.partial_ratio` on every line. Each method is timed until
+its time budget runs out; the linear scan is skipped above `--linear-max-lines`
+since a single lookup on a million lines takes minutes.
+
+With `--memory`, each knowledge base is also written to a temporary file and the
+Python heap held by an index read with `readlines()` is compared with one built
+on the memory-mapped file (`KnowledgeBaseIndex.from_file`).
+
+Usage:
+    python benchmarks/bench_knowledge_base.py --sizes 1000 100000 1000000
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.noovox.knowledge_base import KnowledgeBaseIndex
+
+
+def make_vocabulary(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def make_lines(count, vocabulary, rng):
+    # Zipf-like word frequencies, roughly like natural text
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for _ in range(count):
+        yield " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(8, 20)))
+
+
+def queries_per_second(lookup, queries, budget):
+    started = time.perf_counter()
+    done = 0
+    for query in queries:
+        lookup(query)
+        done += 1
+        if time.perf_counter() - started > budget:
+            break
+    return done / (time.perf_counter() - started)
+
+
+def retained_mb(build):
+    """Python heap still allocated once `build()` returns, in MB; the result is kept alive while measuring."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1e6
+
+
+def compare_memory(lines):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "kb.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(lines))
+
+        def read_lines():
+            with open(path) as file:
+                return KnowledgeBaseIndex(file.readlines())
+
+        return retained_mb(read_lines), retained_mb(lambda: KnowledgeBaseIndex.from_file(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--budget', type=float, default=5.0, help="max seconds spent timing each method")
+    parser.add_argument('--linear-max-lines', type=int, default=100000,
+                        help="largest knowledge base on which to time the linear fuzzy scan")
+    parser.add_argument('--memory', action='store_true', help="compare heap use of readlines and mmap loading")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(50000, rng)
+    queries = [" ".join(rng.choices(vocabulary[:5000], k=rng.randint(2, 5))) for _ in range(args.queries)]
+
+    print(f"{'lines':>10}{'build s':>10}{'index q/s':>12}{'linear q/s':>12}")
+    for size in args.sizes:
+        lines = list(make_lines(size, vocabulary, rng))
+
+        started = time.perf_counter()
+        index = KnowledgeBaseIndex(lines)
+        build_time = time.perf_counter() - started
+        index_qps = queries_per_second(index.relevance, queries, args.budget)
+
+        linear_qps = "-"
+        if size <= args.linear_max_lines:
+            from fuzzywuzzy import fuzz
+
+            def linear(query):
+                return max((fuzz.partial_ratio(query.lower(), line.lower()) for line in lines), default=0)
+
+            linear_qps = f"{queries_per_second(linear, queries, args.budget):.2f}"
+
+        print(f"{size:>10}{build_time:>10.2f}{index_qps:>12.1f}{linear_qps:>12}")
+        if args.memory:
+            readlines_mb, mapped_mb = compare_memory(lines)
+            print(f"{'':>10}heap MB: readlines {readlines_mb:.1f}, mmap {mapped_mb:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Load-tests the Flask and ASGI servers and reports requests/sec and latency percentiles.
+
+Start the servers first, for example:
+    gunicorn -w 4 -b :5000 "noovox.server:app"
+    python noovox/asgi_server.py
+
+Then run:
+    python benchmarks/load_test.py --target flask=http://localhost:5000 \\
+        --target asgi=http://localhost:8000 --path "/api/users?limit=20" --concurrency 200 --requests 5000
+
+Use `--method POST --json '{"message": "hello"}' --path /chat` to load the chat endpoint
+(ASGI only, since the Flask server has no /chat route).
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_target(base_url, path, method, body, concurrency, total, timeout):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', required=True, help="name=base_url, may be repeated")
+    parser.add_argument('--path', default='/api/users?limit=20')
+    parser.add_argument('--method', default='GET')
+    parser.add_argument('--json', default=None, help="JSON request body")
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    body = json.loads(args.json) if args.json else None
+    print(f"{'target':<10}{'requests':>10}{'errors':>8}{'req/sec':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for target in args.target:
+        name, base_url = target.split('=', 1)
+        result = await run_target(base_url, args.path, args.method, body, args.concurrency, args.requests,
+                                  args.timeout)
+        print(f"{name:<10}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.1f}"
+              f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,12 @@
 class General:
     DEFAULT_MODEL = "gpt-4o-mini"  # "gpt-4o"  # "gpt-4o-mini", "gpt-3.5-turbo"
+    RETRIEVAL_TOP_K = 3  # Knowledge base passages added to each prompt
+    RETRIEVAL_TOKEN_BUDGET = 600  # Maximum tokens of knowledge base passages per prompt
+    HISTORY_TOKEN_BUDGET = 2000  # Maximum tokens of chat history per prompt
+    HISTORY_MAX_MESSAGES = 40  # Messages kept per agent before older ones are summarized
+    HISTORY_SUMMARY_WORDS = 150  # Target length of the rolling summary of older messages
+    MAX_SESSIONS = 1000  # Conversations an agent keeps in memory before evicting the least recently used
+    COMPLETION_TOKEN_ESTIMATE = 500  # Tokens reserved for a reply when rate limiting requests
 
 
 class Keys:
@@ -0,0 +1,174 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+ARTICLE_STORE_PATH = os.environ.get('ARTICLE_STORE_PATH')  # SQLite file; memory only if unset
+ARTICLE_STORE_TTL = float(os.environ.get('ARTICLE_STORE_TTL', str(24 * 3600)))
+ARTICLE_STORE_MAX_ARTICLES = int(os.environ.get('ARTICLE_STORE_MAX_ARTICLES', '10000'))
+ARTICLE_STORE_PURGE_EVERY = 100  # Writes between purges
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'ocid', 'cmpid', 'mc_cid', 'mc_eid')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_lock = threading.Lock()
+_store: Optional["ArticleStore"] = None
+
+
+def normalize_article_url(url: str) -> str:
+    """
+    Canonical form of an article URL, so links that differ only cosmetically share an entry.
+
+    Lowercases the scheme and host, drops default ports, fragments, trailing slashes and
+    tracking parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith(TRACKING_PARAMS))
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class StoredArticle(NamedTuple):
+    url: str
+    full_text: str
+    text_length: int
+    images: List[str]
+    fetched_at: float
+
+
+class ArticleStore:
+    """
+    Extracted article content keyed by normalized URL, so each page is parsed once.
+
+    Holds `full_text` (zlib-compressed), `text_length`, `images` and when the page was
+    fetched, in a SQLite file when `path` is given. Entries older than `ttl` seconds are
+    treated as missing, so the article is fetched and parsed again and the row replaced.
+    Every `purge_every` writes, expired entries are deleted and the store is cut back to
+    its newest `max_articles`, so it stays bounded between purges to about
+    `max_articles + purge_every` rows.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = ARTICLE_STORE_TTL,
+                 max_articles: Optional[int] = ARTICLE_STORE_MAX_ARTICLES,
+                 purge_every: int = ARTICLE_STORE_PURGE_EVERY):
+        """
+        Args:
+            path (Optional[str]): SQLite file that keeps articles across restarts; memory only if None.
+            ttl (float): Seconds before a stored article is refreshed.
+            max_articles (Optional[int]): Articles kept after a purge, newest first; unbounded if None.
+            purge_every (int): Writes between purges.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_articles = max_articles
+        self.purge_every = purge_every
+        self.__writes = 0
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path or ':memory:', check_same_thread=False, timeout=30)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("CREATE TABLE IF NOT EXISTS articles (url TEXT PRIMARY KEY, full_text BLOB NOT NULL, "
+                          "text_length INTEGER NOT NULL, images TEXT NOT NULL, fetched_at REAL NOT NULL)")
+        self.__db.execute("CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at)")
+        self.__db.commit()
+        self.__stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0}
+
+    def get(self, url: str) -> Optional[StoredArticle]:
+        """
+        Looks up an article.
+
+        Returns:
+            Optional[StoredArticle]: The stored content, or None if unknown or older than the TTL.
+        """
+        key = normalize_article_url(url)
+        with self.__lock:
+            row = self.__db.execute("SELECT full_text, text_length, images, fetched_at FROM articles WHERE url = ?",
+                                    (key,)).fetchone()
+            if row is None:
+                self.__stats["misses"] += 1
+                return None
+            if row[3] + self.ttl <= time.time():
+                self.__stats["expired"] += 1
+                return None
+            self.__stats["hits"] += 1
+        return StoredArticle(key, zlib.decompress(row[0]).decode(), row[1], json.loads(row[2]), row[3])
+
+    def put(self, article: Dict):
+        """Stores the extracted content of an article enriched by `parse_full_article`."""
+        key = normalize_article_url(article['url'])
+        with self.__lock, self.__db:
+            self.__db.execute("INSERT OR REPLACE INTO articles (url, full_text, text_length, images, fetched_at) "
+                              "VALUES (?, ?, ?, ?, ?)",
+                              (key, zlib.compress(article['full_text'].encode()), article['text_length'],
+                               json.dumps(article['images']), time.time()))
+            self.__stats["stored"] += 1
+            self.__writes += 1
+            if self.__writes % self.purge_every == 0:
+                self.__purge()
+
+    def restore(self, article: Dict) -> Optional[Dict]:
+        """
+        Enriches an article from the store, skipping the download and parse.
+
+        Returns:
+            Optional[Dict]: The article with 'full_text', 'text_length' and 'images' set,
+            or None if the store has no fresh copy.
+        """
+        stored = self.get(article['url'])
+        if stored is None:
+            return None
+        article['full_text'] = stored.full_text
+        article['text_length'] = stored.text_length
+        article['images'] = stored.images
+        return article
+
+    def purge(self) -> int:
+        """
+        Deletes the articles older than the TTL, then the oldest beyond `max_articles`.
+
+        Runs on its own every `purge_every` writes.
+
+        Returns:
+            int: The number of articles removed.
+        """
+        with self.__lock, self.__db:
+            return self.__purge()
+
+    def __purge(self) -> int:
+        """Caller holds the lock."""
+        removed = self.__db.execute("DELETE FROM articles WHERE fetched_at <= ?",
+                                    (time.time() - self.ttl,)).rowcount
+        if self.max_articles is not None:
+            removed += self.__db.execute("DELETE FROM articles WHERE url IN (SELECT url FROM articles "
+                                         "ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                                         (self.max_articles,)).rowcount
+        self.__stats["evicted"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Lookups answered, unknown and expired, articles stored and
+            evicted, and the number of rows held.
+        """
+        with self.__lock:
+            articles = self.__db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return dict(self.__stats, articles=articles)
+
+
+def get_article_store() -> ArticleStore:
+    """Returns the process-wide article store, opening it on first use."""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = ArticleStore(path=ARTICLE_STORE_PATH)
+        return _store
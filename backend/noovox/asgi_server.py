@@ -0,0 +1,454 @@
+import os
+import sys
+
+# Define paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Literal, Optional
+
+import aiomysql
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from backend.noovox.clients import aclose_clients
+from backend.noovox.completion_cache import CompletionCache
+from backend.noovox.core import BaseAgent
+from backend.noovox.scheduler import get_scheduler
+from backend.noovox.db import create_mysql_pool
+from backend.noovox.sessions import MySQLSessionStore, SQLiteSessionStore
+
+MYSQL_HOST = os.environ.get('MYSQL_HOST', 'localhost')
+MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
+MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', 'password')
+MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'noovox')
+MYSQL_POOL_SIZE = int(os.environ.get('MYSQL_POOL_SIZE', '10'))
+MYSQL_POOL_TIMEOUT = float(os.environ.get('MYSQL_POOL_TIMEOUT', '5'))
+MYSQL_POOL_MAX_LIFETIME = int(os.environ.get('MYSQL_POOL_MAX_LIFETIME', '3600'))
+CHAT_AGENT_ROLE = os.environ.get('CHAT_AGENT_ROLE', 'news and current affairs')
+CHAT_KNOWLEDGE_BASE = os.environ.get('CHAT_KNOWLEDGE_BASE', '')
+COMPLETION_CACHE_PATH = os.environ.get('COMPLETION_CACHE_PATH')
+COMPLETION_CACHE_TTL = float(os.environ.get('COMPLETION_CACHE_TTL', '3600'))
+COMPLETION_CACHE_SIMILARITY = os.environ.get('COMPLETION_CACHE_SIMILARITY')
+SESSION_STORE_PATH = os.environ.get('SESSION_STORE_PATH')
+# 'memory', 'sqlite' (at SESSION_STORE_PATH) or 'mysql' (the chat tables, shared by every host)
+SESSION_STORE = os.environ.get('SESSION_STORE', 'sqlite' if SESSION_STORE_PATH else 'memory')
+CHAT_MAX_SESSIONS = int(os.environ.get('CHAT_MAX_SESSIONS', '1000'))
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+
+class Database:
+    """
+    Lazily created aiomysql pool shared by every request on the event loop.
+
+    Checkouts wait at most `MYSQL_POOL_TIMEOUT` seconds and are timed so pool
+    saturation can be reported the same way as the Flask server's pool.
+    """
+
+    def __init__(self):
+        self.pool = None
+        self.__lock = asyncio.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def get_pool(self):
+        if self.pool is None:
+            async with self.__lock:
+                if self.pool is None:
+                    self.pool = await aiomysql.create_pool(
+                        host=MYSQL_HOST,
+                        user=MYSQL_USER,
+                        password=MYSQL_PASSWORD,
+                        db=MYSQL_DATABASE,
+                        minsize=1,
+                        maxsize=MYSQL_POOL_SIZE,
+                        pool_recycle=MYSQL_POOL_MAX_LIFETIME,
+                        # Every route runs a single statement; aiomysql also closes connections
+                        # released mid-transaction, which would defeat pooling for reads
+                        autocommit=True,
+                    )
+        return self.pool
+
+    async def acquire(self):
+        pool = await self.get_pool()
+        started = time.monotonic()
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), MYSQL_POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise HTTPException(status_code=503, detail="Database is busy, please retry")
+        wait_time = time.monotonic() - started
+        self.checkouts += 1
+        self.total_wait += wait_time
+        self.max_wait = max(self.max_wait, wait_time)
+        return conn
+
+    def release(self, conn, discard=False):
+        if discard:
+            conn.close()
+        self.pool.release(conn)
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    def stats(self):
+        size = self.pool.size if self.pool else 0
+        idle = self.pool.freesize if self.pool else 0
+        return {
+            "max_size": MYSQL_POOL_SIZE,
+            "open": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "saturation": (size - idle) / MYSQL_POOL_SIZE,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (self.total_wait / self.checkouts * 1000) if self.checkouts else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+db = Database()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await db.close()
+    await aclose_clients()
+
+
+app = FastAPI(title="Noovox API", lifespan=lifespan)
+
+
+class User(BaseModel):
+    username: str
+    email: str
+
+
+class Chat(BaseModel):
+    user_id: int
+
+
+class ChatMessage(BaseModel):
+    user_id: int
+    sender_type: Literal['user', 'system', 'assistant']
+    message_text: str
+
+
+class ContentTracking(BaseModel):
+    user_id: int
+    content_type: Literal['view', 'like', 'analysis']
+    content_id: int
+
+
+class ChatRequest(BaseModel):
+    message: str
+    # Conversation to continue; a request without one is answered on its own, with no history kept
+    chat_id: Optional[int] = None
+
+
+class ChatResponse(BaseModel):
+    response: str
+
+
+completion_cache = CompletionCache(
+    ttl=COMPLETION_CACHE_TTL,
+    path=COMPLETION_CACHE_PATH,
+    similarity_threshold=float(COMPLETION_CACHE_SIMILARITY) if COMPLETION_CACHE_SIMILARITY else None
+)
+
+
+def build_session_store():
+    """Returns the conversation store selected by `SESSION_STORE`, or None to keep history in memory."""
+    if SESSION_STORE == 'memory':
+        return None
+    if SESSION_STORE == 'sqlite':
+        if not SESSION_STORE_PATH:
+            raise ValueError("SESSION_STORE=sqlite needs SESSION_STORE_PATH")
+        return SQLiteSessionStore(SESSION_STORE_PATH)
+    if SESSION_STORE == 'mysql':
+        # The store's queries are blocking, and the agent runs them in worker threads
+        pool = create_mysql_pool(host=MYSQL_HOST, user=MYSQL_USER, password=MYSQL_PASSWORD, database=MYSQL_DATABASE,
+                                 max_size=MYSQL_POOL_SIZE, checkout_timeout=MYSQL_POOL_TIMEOUT,
+                                 max_lifetime=MYSQL_POOL_MAX_LIFETIME)
+        return MySQLSessionStore(pool)
+    raise ValueError(f"Unknown SESSION_STORE '{SESSION_STORE}', expected one of: memory, sqlite, mysql")
+
+
+@lru_cache(maxsize=None)
+def get_chat_agent() -> BaseAgent:
+    """Build the agent behind `/chat` on first use, so the app imports without OpenAI credentials."""
+    session_store = build_session_store()
+    return BaseAgent(name="Noovox", agent_role=CHAT_AGENT_ROLE, agent_knowledge_base=CHAT_KNOWLEDGE_BASE,
+                     cache=completion_cache, session_store=session_store, max_sessions=CHAT_MAX_SESSIONS)
+
+
+async def execute(sql, params=(), fetch=None):
+    """Run one statement on a pooled connection and return fetched rows if requested."""
+    async with db.connection() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, params)
+            if fetch == 'one':
+                return await cursor.fetchone()
+            if fetch == 'all':
+                return await cursor.fetchall()
+
+
+def int_arg(args, name, default=None, minimum=0):
+    """Reads an integer query parameter, raising values below `minimum` to it; ValueError if not an integer."""
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer") from None
+
+
+async def list_rows(request: Request, query, key, params=()):
+    """
+    Serve a list endpoint with keyset pagination, or as a streamed NDJSON body.
+
+    Mirrors `list_rows` in the Flask server: pages advertise the next cursor in the
+    `X-Next-Cursor` and `Link` headers, bad `after_id` and `limit` values are rejected
+    or clamped the same way, and `?format=ndjson` streams rows from an unbuffered
+    server-side cursor.
+    """
+    try:
+        after_id = int_arg(request.query_params, 'after_id', default=0)
+        limit = int_arg(request.query_params, 'limit', minimum=1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sql = f"{query} AND {key} > %s ORDER BY {key}"
+    params = tuple(params) + (after_id,)
+
+    # Negotiated with the parser behind Flask's `accept_mimetypes`, so both servers pick the same format
+    accept = parse_accept_header(request.headers.get('accept'), MIMEAccept)
+    if request.query_params.get('format') == 'ndjson' or accept.best == 'application/x-ndjson':
+        if limit is not None:
+            sql += " LIMIT %s"
+            params += (limit,)
+        return await stream_rows(sql, params)
+
+    limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    rows = await execute(sql + " LIMIT %s", params + (limit + 1,), fetch='all')
+
+    headers = {}
+    if len(rows) > limit:
+        next_cursor = rows[limit - 1][key]
+        headers['X-Next-Cursor'] = str(next_cursor)
+        next_url = request.url.include_query_params(after_id=next_cursor, limit=limit)
+        headers['Link'] = f'<{next_url}>; rel="next"'
+    return JSONResponse(jsonable_encoder(rows[:limit]), headers=headers)
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """A StreamingResponse that calls `on_close` once it has been sent or abandoned, like Flask's `call_on_close`."""
+
+    def __init__(self, content, on_close, **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
+
+
+async def stream_rows(sql, params):
+    """Stream query results as NDJSON, fetching from the server-side cursor in batches."""
+    conn = await db.acquire()
+    try:
+        cursor = await conn.cursor(aiomysql.SSDictCursor)
+        await cursor.execute(sql, params)
+    except BaseException:
+        db.release(conn, discard=True)
+        raise
+
+    released = []
+
+    def release(discard):
+        if not released:
+            released.append(True)
+            db.release(conn, discard=discard)
+
+    async def generate():
+        exhausted = False
+        try:
+            while True:
+                rows = await cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not rows:
+                    break
+                yield ''.join(json.dumps(jsonable_encoder(row)) + '\n' for row in rows)
+            exhausted = True
+            await cursor.close()
+        finally:
+            # A client that disconnects mid-stream leaves unread rows on the connection, so drop it
+            release(discard=not exhausted)
+
+    # Covers clients that disconnect before the body is ever iterated
+    return ClosingStreamingResponse(generate(), on_close=lambda: release(discard=True),
+                                    media_type='application/x-ndjson')
+
+
+@app.get('/api/db/pool')
+async def get_db_pool_stats():
+    return db.stats()
+
+
+@app.get('/api/completion_cache')
+async def get_completion_cache_stats():
+    return completion_cache.stats()
+
+
+@app.get('/api/openai/scheduler')
+async def get_scheduler_stats():
+    return get_scheduler().stats()
+
+
+@app.get('/api/users')
+async def get_users(request: Request):
+    return await list_rows(request, "SELECT * FROM users WHERE TRUE", 'user_id')
+
+
+@app.post('/api/users', status_code=201)
+async def create_user(user: User):
+    await execute("INSERT INTO users (username, email) VALUES (%s, %s)", (user.username, user.email))
+    return user
+
+
+@app.get('/api/users/{user_id}')
+async def get_user(user_id: int):
+    user = await execute("SELECT * FROM users WHERE user_id = %s", (user_id,), fetch='one')
+    if user:
+        return user
+    return JSONResponse({'error': 'User not found'}, status_code=404)
+
+
+@app.put('/api/users/{user_id}')
+async def update_user(user_id: int, user: User):
+    await execute("UPDATE users SET username = %s, email = %s WHERE user_id = %s",
+                  (user.username, user.email, user_id))
+    return user
+
+
+@app.delete('/api/users/{user_id}', status_code=204)
+async def delete_user(user_id: int):
+    await execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+    return Response(status_code=204)
+
+
+@app.get('/api/chats')
+async def get_chats(request: Request):
+    return await list_rows(request, "SELECT * FROM chats WHERE TRUE", 'chat_id')
+
+
+@app.post('/api/chats', status_code=201)
+async def create_chat(chat: Chat):
+    await execute("INSERT INTO chats (user_id) VALUES (%s)", (chat.user_id,))
+    return chat
+
+
+@app.get('/api/chats/{chat_id}')
+async def get_chat(chat_id: int):
+    chat = await execute("SELECT * FROM chats WHERE chat_id = %s", (chat_id,), fetch='one')
+    if chat:
+        return chat
+    return JSONResponse({'error': 'Chat not found'}, status_code=404)
+
+
+@app.delete('/api/chats/{chat_id}', status_code=204)
+async def delete_chat(chat_id: int):
+    await execute("DELETE FROM chats WHERE chat_id = %s", (chat_id,))
+    return Response(status_code=204)
+
+
+@app.get('/api/chats/{chat_id}/messages')
+async def get_chat_messages(chat_id: int, request: Request):
+    return await list_rows(request, "SELECT * FROM chat_messages WHERE chat_id = %s", 'message_id', (chat_id,))
+
+
+@app.post('/api/chats/{chat_id}/messages', status_code=201)
+async def send_chat_message(chat_id: int, message: ChatMessage):
+    await execute("INSERT INTO chat_messages (chat_id, user_id, sender_type, message_text) VALUES (%s, %s, %s, %s)",
+                  (chat_id, message.user_id, message.sender_type, message.message_text))
+    return message
+
+
+@app.get('/api/content_tracking')
+async def get_content_tracking(request: Request):
+    return await list_rows(request, "SELECT * FROM content_tracking WHERE TRUE", 'tracking_id')
+
+
+@app.post('/api/content_tracking', status_code=201)
+async def track_content(tracking: ContentTracking):
+    # Awaiting the insert does not hold a thread, so no write-behind buffer is needed here
+    await execute("INSERT INTO content_tracking (user_id, content_type, content_id) VALUES (%s, %s, %s)",
+                  (tracking.user_id, tracking.content_type, tracking.content_id))
+    return tracking
+
+
+@app.post('/chat', response_model=ChatResponse)
+async def chat(chat_request: ChatRequest, agent: BaseAgent = Depends(get_chat_agent)):
+    return {"response": await agent.ask_openai_async(chat_request.message, session_id=chat_request.chat_id,
+                                                      stateless=chat_request.chat_id is None)}
+
+
+@app.post('/chat/stream')
+async def chat_stream(chat_request: ChatRequest, agent: BaseAgent = Depends(get_chat_agent)):
+    """
+    Stream the chat response as server-sent events.
+
+    Each `message` event carries a `{"delta": ...}` chunk as soon as the model emits it;
+    a final `done` event carries the complete `{"response": ...}`.
+    """
+    async def events():
+        parts = []
+        async for delta in agent.stream_openai_async(chat_request.message, session_id=chat_request.chat_id,
+                                                     stateless=chat_request.chat_id is None):
+            parts.append(delta)
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+        yield f"event: done\ndata: {json.dumps({'response': ''.join(parts)})}\n\n"
+
+    return StreamingResponse(events(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.get("/")
+async def home():
+    return Response("Noovox Backend is Running!", media_type="text/plain")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    print("API docs URL: http://localhost:8000/docs")
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get('PORT', '8000')))
@@ -0,0 +1,56 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List
+
+
+class BatchCheckpoint:
+    """
+    Append-only JSONL record of finished batch prompts, so an interrupted batch can resume.
+
+    Each line holds the prompt's position, a hash of the prompt and its response. On
+    resume, a recorded response is reused only if the prompt at that position is
+    unchanged, so editing the input list never returns stale answers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+    def load(self, prompts: List[str]) -> Dict[int, str]:
+        """
+        Reads the responses already recorded for these prompts.
+
+        Returns:
+            Dict[int, str]: Responses keyed by position in `prompts`.
+        """
+        done = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash mid-write; that prompt simply runs again
+                    self.logger.warning(f"Skipping unreadable checkpoint line in {self.path}")
+                    continue
+                index = record.get("index")
+                if isinstance(index, int) and 0 <= index < len(prompts) and \
+                        record.get("prompt") == self.fingerprint(prompts[index]):
+                    done[index] = record["response"]
+        return done
+
+    def record(self, index: int, prompt: str, response: str):
+        line = json.dumps({"index": index, "prompt": self.fingerprint(prompt), "response": response})
+        with self.__lock:
+            with open(self.path, "a") as file:
+                file.write(line + "\n")
+                file.flush()
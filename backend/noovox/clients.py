@@ -0,0 +1,87 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from backend.constants import Keys
+
+# Outbound connection limits, shared by every agent in the process
+OPENAI_MAX_CONNECTIONS = int(os.environ.get('OPENAI_MAX_CONNECTIONS', '100'))
+OPENAI_MAX_KEEPALIVE = int(os.environ.get('OPENAI_MAX_KEEPALIVE', '20'))
+OPENAI_KEEPALIVE_EXPIRY = float(os.environ.get('OPENAI_KEEPALIVE_EXPIRY', '60'))
+OPENAI_TIMEOUT = float(os.environ.get('OPENAI_TIMEOUT', '600'))
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[Optional[str], Optional[str]], OpenAI] = {}
+# httpx async connections belong to the event loop that opened them, so async clients are kept per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, AsyncOpenAI]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def resolve_api_key(api_key: Optional[str] = None) -> Optional[str]:
+    """Returns `api_key`, or the key from the environment at call time rather than at import time."""
+    return api_key or os.getenv(Keys.OPEN_AI_KEY)
+
+
+def connection_limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+                        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY)
+
+
+def get_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> OpenAI:
+    """
+    Returns the process-wide OpenAI client for an API key and base URL, creating it on first use.
+
+    Every agent using the same credentials shares one keep-alive connection pool, so
+    creating agents costs no connections or TLS handshakes. The client does not retry
+    on its own; retries are left to the RequestScheduler.
+    """
+    key = (resolve_api_key(api_key), base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = OpenAI(
+                api_key=key[0], base_url=base_url, timeout=OPENAI_TIMEOUT, max_retries=0,
+                http_client=httpx.Client(limits=connection_limits(), timeout=OPENAI_TIMEOUT)
+            )
+        return client
+
+
+def get_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Returns the AsyncOpenAI client for an API key and base URL on the running event loop.
+
+    Clients are shared by all agents on a loop and dropped together with the loop.
+    """
+    key = (resolve_api_key(api_key), base_url)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = AsyncOpenAI(
+                api_key=key[0], base_url=base_url, timeout=OPENAI_TIMEOUT, max_retries=0,
+                http_client=httpx.AsyncClient(limits=connection_limits(), timeout=OPENAI_TIMEOUT)
+            )
+        return client
+
+
+def close_clients():
+    """Closes the shared synchronous clients; see `aclose_clients` for the async ones."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_clients():
+    """Closes the async clients opened on the running event loop."""
+    with _lock:
+        clients = list(_async_clients.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        await client.close()
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from backend.noovox.knowledge_base import tokenize
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Casefold and collapse whitespace so trivially different prompts share a cache entry."""
+    return WHITESPACE_PATTERN.sub(" ", text or "").strip().casefold()
+
+
+class CompletionCache:
+    """
+    Cache of chat completion responses keyed on model, temperature and the normalized messages.
+
+    Entries live in an in-memory LRU with a TTL and, when `path` is given, in a SQLite
+    file that survives restarts and is shared by worker processes. Requests with a
+    temperature above `max_temperature` are not deterministic enough to reuse and bypass
+    the cache. With `similarity_threshold` set, a miss falls back to near-duplicate
+    matching: an entry with the same model, temperature and earlier messages whose final
+    user message has a word-set Jaccard similarity of at least the threshold is reused.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, path: Optional[str] = None,
+                 max_temperature: float = 0.2, similarity_threshold: Optional[float] = None):
+        """
+        Args:
+            max_entries (int): Maximum entries held in memory.
+            ttl (float): Seconds an entry stays valid.
+            path (Optional[str]): SQLite file for the persistent tier; memory only if None.
+            max_temperature (float): Requests above this temperature are never cached.
+            similarity_threshold (Optional[float]): Jaccard similarity (0-1) for near-duplicate hits.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.similarity_threshold = similarity_threshold
+
+        self.__lock = threading.Lock()
+        self.__memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, content)
+        self.__similar: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (context_key, query terms)
+
+        self.__db = None
+        if path:
+            self.__db = sqlite3.connect(path, check_same_thread=False)
+            self.__db.execute("CREATE TABLE IF NOT EXISTS completions "
+                              "(key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self.__db.commit()
+
+        self.__stats = {"memory_hits": 0, "disk_hits": 0, "similar_hits": 0, "misses": 0, "bypassed": 0}
+
+    def cacheable(self, temperature: float) -> bool:
+        return temperature <= self.max_temperature
+
+    @staticmethod
+    def __normalize(messages: List[Dict[str, str]]) -> List[List[str]]:
+        return [[message["role"], normalize_text(message["content"])] for message in messages]
+
+    @staticmethod
+    def __hash(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, separators=(",", ":")).encode()).hexdigest()
+
+    def key(self, model: str, temperature: float, messages: List[Dict[str, str]]) -> str:
+        return self.__hash(model, temperature, self.__normalize(messages))
+
+    def get(self, model: str, temperature: float, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Looks up a cached completion.
+
+        Returns:
+            Optional[str]: The cached response content, or None on a miss or bypass.
+        """
+        if not self.cacheable(temperature):
+            with self.__lock:
+                self.__stats["bypassed"] += 1
+            return None
+
+        key = self.key(model, temperature, messages)
+        content = self.__lookup(key)
+        if content is not None:
+            return content
+
+        if self.similarity_threshold is not None and messages:
+            similar_key = self.__find_similar(model, temperature, messages)
+            if similar_key is not None:
+                content = self.__lookup(similar_key, tier="similar_hits")
+                if content is not None:
+                    return content
+
+        with self.__lock:
+            self.__stats["misses"] += 1
+        return None
+
+    def set(self, model: str, temperature: float, messages: List[Dict[str, str]], content: str):
+        """Stores a completion, unless the temperature makes it uncacheable."""
+        if not self.cacheable(temperature) or content is None:
+            return
+
+        key = self.key(model, temperature, messages)
+        expires_at = time.time() + self.ttl
+        with self.__lock:
+            self.__store_memory(key, expires_at, content)
+            if self.similarity_threshold is not None and messages:
+                self.__similar[key] = (self.__context_key(model, temperature, messages),
+                                       frozenset(tokenize(messages[-1]["content"])))
+                self.__similar.move_to_end(key)
+                while len(self.__similar) > self.max_entries:
+                    self.__similar.popitem(last=False)
+            if self.__db is not None:
+                self.__db.execute("INSERT OR REPLACE INTO completions (key, content, expires_at) VALUES (?, ?, ?)",
+                                  (key, content, expires_at))
+                self.__db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Reports hit and miss counters.
+
+        Returns:
+            Dict[str, float]: Hits per tier, misses, bypassed requests, `hit_rate` over
+            cacheable lookups and the number of entries held in memory.
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["entries"] = len(self.__memory)
+        hits = stats["memory_hits"] + stats["disk_hits"] + stats["similar_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def __lookup(self, key: str, tier: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+        with self.__lock:
+            entry = self.__memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.__memory.move_to_end(key)
+                    self.__stats[tier or "memory_hits"] += 1
+                    return entry[1]
+                del self.__memory[key]
+
+            if self.__db is not None:
+                row = self.__db.execute("SELECT content, expires_at FROM completions WHERE key = ?",
+                                        (key,)).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        # Promote to memory so the next lookup skips SQLite
+                        self.__store_memory(key, row[1], row[0])
+                        self.__stats[tier or "disk_hits"] += 1
+                        return row[0]
+                    self.__db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self.__db.commit()
+        return None
+
+    def __store_memory(self, key: str, expires_at: float, content: str):
+        """Caller holds the lock."""
+        self.__memory[key] = (expires_at, content)
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.max_entries:
+            self.__memory.popitem(last=False)
+
+    def __context_key(self, model: str, temperature: float, messages: List[Dict[str, str]]) -> str:
+        """Hash of everything but the final message, which is what near-duplicate matching varies."""
+        return self.__hash(model, temperature, self.__normalize(messages[:-1]))
+
+    def __find_similar(self, model: str, temperature: float, messages: List[Dict[str, str]]) -> Optional[str]:
+        context_key = self.__context_key(model, temperature, messages)
+        terms = frozenset(tokenize(messages[-1]["content"]))
+        if not terms:
+            return None
+
+        best_key, best_similarity = None, 0.0
+        with self.__lock:
+            candidates = list(self.__similar.items())
+        for key, (candidate_context, candidate_terms) in candidates:
+            if candidate_context != context_key or not candidate_terms:
+                continue
+            similarity = len(terms & candidate_terms) / len(terms | candidate_terms)
+            if similarity > best_similarity:
+                best_key, best_similarity = key, similarity
+        if best_similarity >= self.similarity_threshold:
+            return best_key
+        return None
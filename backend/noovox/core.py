@@ -1,105 +1,512 @@
+import asyncio
 import requests
 from bs4 import BeautifulSoup
 import time
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import re
 from urllib.parse import urlparse, quote
 import random
+from collections import OrderedDict
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 import json
 import sys
 import os
-from openai import OpenAI
-from fuzzywuzzy import fuzz
-from backend.constants import General, Keys
+import threading
+from backend.constants import General
+from backend.noovox.article_store import get_article_store
+from backend.noovox.batch import BatchCheckpoint
+from backend.noovox.clients import get_async_client, get_client
+from backend.noovox.fetcher import AsyncFetcher
+from backend.noovox.history import ConversationHistory, summary_request
+from backend.noovox.html_parsing import HTML_PARSER_ENGINE, LISTING_STRAINERS, make_soup, resolve_engine
+from backend.noovox.http_cache import get_http_cache
+from backend.noovox.http_session import HTTP_MAX_RETRIES, get_session
+from backend.noovox.knowledge_base import shared_index
+from backend.noovox.pipeline import StagedExecutor
+from backend.noovox.scheduler import Priority, get_scheduler
+from backend.noovox.tokens import count_tokens
 import logging
 
 
 class BaseAgent:
     def __init__(self, name, agent_role, agent_knowledge_base, model=General.DEFAULT_MODEL,
-                 api_key=os.getenv(Keys.OPEN_AI_KEY)):
+                 api_key=None, base_url=None, retrieval_top_k=General.RETRIEVAL_TOP_K,
+                 retrieval_token_budget=General.RETRIEVAL_TOKEN_BUDGET,
+                 history_token_budget=General.HISTORY_TOKEN_BUDGET, history_max_messages=General.HISTORY_MAX_MESSAGES,
+                 cache=None, scheduler=None, session_store=None, session_id=None, max_sessions=General.MAX_SESSIONS):
         self.__name = name
         self.__agent_role = agent_role
-        self.__knowledge_base = self.load_knowledge_base(agent_knowledge_base)
-        self.__client = OpenAI(api_key=api_key)  # Initialize OpenAI client
+        self.__knowledge_base_path = agent_knowledge_base  # Indexed on first use and shared by every agent
+        # OpenAI clients come from the process-wide registry on first use; None means the OPEN_AI_KEY variable
+        self.__api_key = api_key
+        self.__base_url = base_url
         self.__model = model  # Set the OpenAI model
-        self.__history = []  # To store chat history
+        self.__cache = cache  # Optional CompletionCache, usually shared between agents
+        self.__scheduler = scheduler or get_scheduler()  # Applies rate limits and retries to every request
+        # Chat history per session, bounded by tokens sent and messages kept, optionally persisted in a SessionStore.
+        # Only the `max_sessions` most recently used sessions stay in memory.
+        self.__history_token_budget = history_token_budget
+        self.__history_max_messages = history_max_messages
+        self.__session_store = session_store
+        self.__default_session_id = session_id  # Used by calls that do not name a session
+        self.__max_sessions = max_sessions
+        self.__sessions = OrderedDict()
+        self.__sessions_lock = threading.Lock()
+        self.retrieval_top_k = retrieval_top_k  # Knowledge base passages added to each prompt; 0 disables
+        self.retrieval_token_budget = retrieval_token_budget  # Token cap for those passages
 
-    @staticmethod
-    def load_knowledge_base(path):
-        """Load knowledge base content as text."""
-        if not os.path.exists(path):
-            return []
-        with open(path, "r") as file:
-            return file.readlines()
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def __client(self):
+        return get_client(self.__api_key, self.__base_url)
+
+    @property
+    def __async_client(self):
+        """Async client for the running event loop, used by the asyncio server."""
+        return get_async_client(self.__api_key, self.__base_url)
+
+    @property
+    def __index(self):
+        """Knowledge base index, built the first time any agent in the process needs this file."""
+        return shared_index(self.__knowledge_base_path)
+
+    def __session(self, session_id):
+        """History of a session, created (or loaded from the session store) on first use."""
+        if session_id is None:
+            session_id = self.__default_session_id
+        with self.__sessions_lock:
+            history = self.__sessions.get(session_id)
+            if history is None:
+                history = self.__sessions[session_id] = ConversationHistory(
+                    token_budget=self.__history_token_budget, max_messages=self.__history_max_messages,
+                    model=self.__model, store=self.__session_store, session_id=session_id)
+                # Without a session store an evicted session starts over; with one it is reloaded
+                while len(self.__sessions) > self.__max_sessions:
+                    self.__sessions.popitem(last=False)
+            else:
+                self.__sessions.move_to_end(session_id)
+            return history
+
+    @property
+    def active_sessions(self):
+        """Number of sessions whose history is held in memory."""
+        return len(self.__sessions)
 
     def __calculate_relevance(self, query):
-        """Use fuzzy matching to calculate relevance score with the knowledge base."""
-        scores = [fuzz.partial_ratio(query.lower(), kb.lower()) for kb in self.__knowledge_base]
-        return max(scores, default=0)
+        """Look up the query in the knowledge base index to calculate a 0-100 relevance score."""
+        return self.__index.relevance(query)
 
-    def ask_openai(self, prompt, temperature=0.2):
+    def retrieve_context(self, query):
         """
-        Query OpenAI with a prompt, including filtered history for context.
+        Pick the knowledge base passages most relevant to a query that fit in the retrieval token budget.
+
+        Passages are taken best first; one that would overflow the budget is skipped in favour of
+        shorter, lower-ranked passages.
+        """
+        if not self.retrieval_top_k:
+            return []
+        passages = []
+        budget = self.retrieval_token_budget
+        # Over-fetch so passages skipped for length can be replaced by shorter ones
+        for passage, _ in self.__index.top_passages(query, k=self.retrieval_top_k * 3):
+            tokens = count_tokens(passage, self.__model)
+            if tokens > budget:
+                continue
+            passages.append(passage)
+            budget -= tokens
+            if len(passages) == self.retrieval_top_k:
+                break
+        return passages
+
+    def __build_messages(self, prompt, context=None, history=None):
+        """
+        Build the message list for a completion: system context, retrieved knowledge, recent history and the prompt.
+
+        If `context` is None, knowledge base passages are retrieved for the prompt itself.
+        Without a `history` the prompt is sent without any earlier conversation.
         """
         # Add the system message for context
         system_message = {"role": "system", "content": f"You are an expert in {self.__agent_role}."}
+        messages = [system_message]
 
-        # Filter chat history to include the most recent messages
-        filtered_chat_history = [system_message] + self.__history[-10:]  # Limit to last 10 exchanges
+        if context is None:
+            context = self.retrieve_context(prompt)
+        if context:
+            excerpts = "\n".join(f"- {passage}" for passage in context)
+            messages.append({"role": "system",
+                             "content": f"Use these excerpts from your knowledge base when relevant:\n{excerpts}"})
+
+        # Include the summary and the most recent messages that fit in the history token budget
+        filtered_chat_history = messages + (history.window() if history is not None else [])
         filtered_chat_history.append({"role": "user", "content": prompt})
+        return filtered_chat_history
+
+    @staticmethod
+    def __remember(history, prompt, response_content):
+        """Update the history with the prompt and the assistant's response."""
+        history.append("user", prompt)
+        history.append("assistant", response_content)
+
+    def __estimate_tokens(self, messages):
+        """Tokens a request is expected to use: its messages plus an allowance for the reply."""
+        return sum(count_tokens(message["content"], self.__model) for message in messages) + \
+            General.COMPLETION_TOKEN_ESTIMATE
+
+    def __complete(self, messages, temperature, priority=Priority.INTERACTIVE, stream=False):
+        """Request a chat completion (or a stream of chunks) through the rate-limit scheduler."""
+        return self.__scheduler.run(
+            self.__model,
+            lambda: self.__client.chat.completions.create(
+                model=self.__model,
+                messages=messages,
+                temperature=temperature,
+                stream=stream,
+            ),
+            tokens=self.__estimate_tokens(messages),
+            priority=priority,
+        )
 
-        # Use the OpenAI client to get a response
-        response = self.__client.chat.completions.create(
-            model=self.__model,
-            messages=filtered_chat_history,
-            temperature=temperature,
+    async def __complete_async(self, messages, temperature, priority=Priority.INTERACTIVE, stream=False):
+        """Asyncio variant of `__complete`."""
+        return await self.__scheduler.run_async(
+            self.__model,
+            lambda: self.__async_client.chat.completions.create(
+                model=self.__model,
+                messages=messages,
+                temperature=temperature,
+                stream=stream,
+            ),
+            tokens=self.__estimate_tokens(messages),
+            priority=priority,
         )
-        response_content = response.choices[0].message.content
 
-        # Update the history with the assistant's response
-        self.__history.append({"role": "user", "content": prompt})
-        self.__history.append({"role": "assistant", "content": response_content})
+    def __summarize(self, summary, messages):
+        """Fold older messages into the rolling history summary, keeping the old summary on failure."""
+        try:
+            response = self.__complete(summary_request(summary, messages), temperature=0,
+                                       priority=Priority.BACKGROUND)
+            return response.choices[0].message.content
+        except Exception as e:
+            logging.error(f"Failed to summarize history for {self.__name}: {str(e)}")
+            return summary
+
+    async def __compact_history_async(self, history):
+        """Asyncio variant of `ConversationHistory.compact` using the async client."""
+        while history.needs_compaction():
+            folded = history.take_oldest()
+            try:
+                response = await self.__complete_async(summary_request(history.summary, folded),
+                                                       temperature=0, priority=Priority.BACKGROUND)
+                await asyncio.to_thread(history.fold, response.choices[0].message.content)
+            except Exception as e:
+                logging.error(f"Failed to summarize history for {self.__name}: {str(e)}")
+
+    def __cached(self, messages, temperature):
+        """Look up a cached completion for these messages, if the agent has a cache."""
+        if self.__cache is None:
+            return None
+        return self.__cache.get(self.__model, temperature, messages)
+
+    def __store(self, messages, temperature, response_content):
+        if self.__cache is not None:
+            self.__cache.set(self.__model, temperature, messages, response_content)
+
+    def ask_openai(self, prompt, temperature=0.2, context=None, priority=Priority.INTERACTIVE,
+                   session_id=None, stateless=False):
+        """
+        Query OpenAI with a prompt, including retrieved knowledge and filtered history for context.
 
+        `context` is a list of knowledge base passages; by default they are retrieved for the prompt.
+        `priority` orders the request in the rate-limit queue; see `Priority`.
+        `session_id` selects whose conversation the prompt continues; None is the agent's default session.
+        With `stateless`, the prompt is answered without any history and is not remembered.
+        """
+        history = None if stateless else self.__session(session_id)
+        messages = self.__build_messages(prompt, context, history)
+        response_content = self.__cached(messages, temperature)
+        if response_content is None:
+            # Use the OpenAI client to get a response
+            response = self.__complete(messages, temperature, priority)
+            response_content = response.choices[0].message.content
+            self.__store(messages, temperature, response_content)
+        if history is not None:
+            self.__remember(history, prompt, response_content)
+            history.compact(self.__summarize)
         return response_content
 
-    def __process_query(self, query):
+    async def ask_openai_async(self, prompt, temperature=0.2, context=None, priority=Priority.INTERACTIVE,
+                               session_id=None, stateless=False):
+        """
+        Asyncio variant of `ask_openai` that awaits the completion without blocking a thread.
+
+        Knowledge base retrieval, completion cache lookups and session store reads and writes
+        run in worker threads, so a slow disk does not stall the event loop.
+        """
+        history = None if stateless else self.__session(session_id)
+        messages = await asyncio.to_thread(self.__build_messages, prompt, context, history)
+        response_content = await asyncio.to_thread(self.__cached, messages, temperature)
+        if response_content is None:
+            response = await self.__complete_async(messages, temperature, priority)
+            response_content = response.choices[0].message.content
+            await asyncio.to_thread(self.__store, messages, temperature, response_content)
+        if history is not None:
+            await asyncio.to_thread(self.__remember, history, prompt, response_content)
+            await self.__compact_history_async(history)
+        return response_content
+
+    def ask_batch(self, prompts, concurrency=8, checkpoint_path=None, temperature=0.2,
+                  priority=Priority.BACKGROUND):
+        """
+        Answer many independent prompts with up to `concurrency` requests in flight.
+
+        Each prompt gets its own knowledge base context but no conversation history, and the
+        answers are not added to the history. With `checkpoint_path`, finished answers are
+        appended to that JSONL file as they arrive; running the same batch again skips them.
+
+        Returns the answers in the order of `prompts`. A prompt that still fails after the
+        scheduler's retries is logged and left as None, and is retried on the next run.
+        """
+        prompts = list(prompts)
+        checkpoint = BatchCheckpoint(checkpoint_path) if checkpoint_path else None
+        results = checkpoint.load(prompts) if checkpoint else {}
+        pending = [index for index in range(len(prompts)) if index not in results]
+        if results:
+            logging.info(f"{self.__name}: resuming batch, {len(results)} of {len(prompts)} prompts already done")
+
+        def answer(prompt):
+            messages = self.__build_messages(prompt)
+            response_content = self.__cached(messages, temperature)
+            if response_content is None:
+                response = self.__complete(messages, temperature, priority)
+                response_content = response.choices[0].message.content
+                self.__store(messages, temperature, response_content)
+            return response_content
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {executor.submit(answer, prompts[index]): index for index in pending}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logging.error(f"{self.__name}: batch prompt {index} failed: {str(e)}")
+                    continue
+                if checkpoint:
+                    checkpoint.record(index, prompts[index], results[index])
+
+        return [results.get(index) for index in range(len(prompts))]
+
+    def stream_openai(self, prompt, temperature=0.2, context=None, priority=Priority.INTERACTIVE,
+                      session_id=None, stateless=False):
+        """
+        Stream a response from OpenAI, yielding content deltas as they arrive.
+
+        The complete assistant message is added to the history once the stream ends.
+        A cached response is yielded as a single delta.
+        """
+        history = None if stateless else self.__session(session_id)
+        messages = self.__build_messages(prompt, context, history)
+        response_content = self.__cached(messages, temperature)
+        if response_content is not None:
+            yield response_content
+        else:
+            stream = self.__complete(messages, temperature, priority, stream=True)
+            parts = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            response_content = "".join(parts)
+            self.__store(messages, temperature, response_content)
+        if history is not None:
+            self.__remember(history, prompt, response_content)
+            history.compact(self.__summarize)
+
+    async def stream_openai_async(self, prompt, temperature=0.2, context=None, priority=Priority.INTERACTIVE,
+                                  session_id=None, stateless=False):
+        """
+        Asyncio variant of `stream_openai`, yielding content deltas from an async iterator.
+
+        Like `ask_openai_async`, retrieval, cache and session store I/O run in worker threads.
+        """
+        history = None if stateless else self.__session(session_id)
+        messages = await asyncio.to_thread(self.__build_messages, prompt, context, history)
+        response_content = await asyncio.to_thread(self.__cached, messages, temperature)
+        if response_content is not None:
+            yield response_content
+        else:
+            stream = await self.__complete_async(messages, temperature, priority, stream=True)
+            parts = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            response_content = "".join(parts)
+            await asyncio.to_thread(self.__store, messages, temperature, response_content)
+        if history is not None:
+            await asyncio.to_thread(self.__remember, history, prompt, response_content)
+            await self.__compact_history_async(history)
+
+    def score_query(self, query):
+        """
+        Score how relevant this agent's knowledge base is to a query, without calling OpenAI.
+        """
+        return self.__calculate_relevance(query)
+
+    def process_query(self, query, relevance_score=None, session_id=None):
         """
         Process a query by calculating relevance and using OpenAI for a response.
+
+        A `relevance_score` already computed with `score_query` is reused instead of recalculated.
         """
-        relevance_score = self.__calculate_relevance(query)
+        if relevance_score is None:
+            relevance_score = self.__calculate_relevance(query)
         prompt = f"Answer as an expert in {self.__agent_role} with a relevance score of {relevance_score}: {query}"
         return {
-            "response": self.ask_openai(prompt),
+            # Retrieve with the bare query so the prompt's boilerplate does not skew the ranking
+            "response": self.ask_openai(prompt, context=self.retrieve_context(query), session_id=session_id),
             "relevance_score": relevance_score
         }
 
 
 class ManagerAgent:
-    def __init__(self, employees):
+    def __init__(self, employees, max_workers=None, agent_timeout=30.0, deadline=60.0, relevance_threshold=None,
+                 top_k=1, min_relevance=None):
         self.employees = employees
         self.feedback_log = {}  # Store feedback from users
 
+        # Routing settings: agents are scored locally first and only the best candidates call OpenAI
+        self.top_k = top_k  # Maximum number of agents asked per query; None asks every candidate
+        self.min_relevance = min_relevance  # Agents scoring below this are skipped
+
+        # Fan-out settings: every agent runs concurrently, so latency is the slowest agent, not the sum
+        self.agent_timeout = agent_timeout  # Seconds a single agent may take once it starts
+        self.deadline = deadline  # Seconds the whole routing may take
+        self.relevance_threshold = relevance_threshold  # Return early once an answer scores this high
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or max(len(employees), 1),
+                                           thread_name_prefix="agent")
+
         # Configure logging
         logging.basicConfig(filename="agent_log.log", level=logging.INFO)
 
-    def route_query(self, query):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stops the agent threads, dropping queries that have not started."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def select_agents(self, query, top_k=None, min_relevance=None):
+        """
+        Score every employee's knowledge base locally and pick the agents worth an OpenAI call.
+
+        Agents are ranked by relevance score; those below `min_relevance` are dropped and at
+        most `top_k` are kept. The best-scoring agent is always kept so every query is answered.
+
+        Returns:
+            Tuple of the selected (agent, relevance_score) pairs and the scores of every agent by name.
+        """
+        top_k = self.top_k if top_k is None else top_k
+        min_relevance = self.min_relevance if min_relevance is None else min_relevance
+
+        scored = sorted(((employee, employee.score_query(query)) for employee in self.employees),
+                        key=lambda pair: pair[1], reverse=True)
+        selected = [pair for pair in scored if min_relevance is None or pair[1] >= min_relevance]
+        if top_k is not None:
+            selected = selected[:top_k]
+        if not selected and scored:
+            selected = scored[:1]
+        return selected, {employee.name: score for employee, score in scored}
+
+    def route_query(self, query, agent_timeout=None, deadline=None, relevance_threshold=None, top_k=None,
+                    min_relevance=None, session_id=None):
+        """
+        Send the query to the most relevant employees concurrently and rank the answers that arrive in time.
+
+        Only agents chosen by `select_agents` call OpenAI, so token spend scales with `top_k`
+        rather than with the number of employees. Agents still running when their
+        `agent_timeout` or the global `deadline` passes are reported in `timed_out` and their
+        answers are discarded. If `relevance_threshold` is set, routing returns as soon as one
+        answer reaches it. `session_id` is passed on so each agent continues that conversation.
+        """
+        agent_timeout = self.agent_timeout if agent_timeout is None else agent_timeout
+        deadline = self.deadline if deadline is None else deadline
+        relevance_threshold = self.relevance_threshold if relevance_threshold is None else relevance_threshold
+
+        selected, relevance_scores = self.select_agents(query, top_k=top_k, min_relevance=min_relevance)
+        started_at = {}
+
+        def run(employee, relevance_score):
+            started_at[employee] = time.monotonic()
+            return employee.process_query(query, relevance_score=relevance_score, session_id=session_id)
+
+        global_deadline = time.monotonic() + deadline
+        futures = {}
+        for employee, relevance_score in selected:
+            logging.info(f"Routing query to {employee.name} (relevance {relevance_score})")
+            futures[self.executor.submit(run, employee, relevance_score)] = employee
+
         responses = []
-        for employee in self.employees:
-            logging.info(f"Routing query to {employee.name}")
-            result = employee.__process_query(query)
-            responses.append({
-                "agent": employee.name,
-                "response": result["response"],
-                "relevance_score": result["relevance_score"]
-            })
+        timed_out = []
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            # Wake up at the global deadline or when the earliest running agent times out
+            wake_at = global_deadline
+            for future in pending:
+                agent_started = started_at.get(futures[future])
+                if agent_started is not None:
+                    wake_at = min(wake_at, agent_started + agent_timeout)
+            if wake_at <= now:
+                expired = {f for f in pending
+                           if now >= global_deadline or now >= started_at.get(futures[f], now) + agent_timeout}
+                for future in expired:
+                    future.cancel()
+                    timed_out.append(futures[future].name)
+                pending -= expired
+                continue
+
+            done, pending = wait(pending, timeout=wake_at - now, return_when=FIRST_COMPLETED)
+            threshold_met = False
+            for future in done:
+                employee = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.error(f"Agent {employee.name} failed: {str(e)}")
+                    continue
+                responses.append({
+                    "agent": employee.name,
+                    "response": result["response"],
+                    "relevance_score": result["relevance_score"]
+                })
+                if relevance_threshold is not None and result["relevance_score"] >= relevance_threshold:
+                    threshold_met = True
+            if threshold_met:
+                # Keep every answer that finished alongside it, stop waiting for the rest
+                for other in pending:
+                    other.cancel()
+                pending = set()
+
+        if timed_out:
+            logging.warning(f"No answer in time from: {', '.join(timed_out)}")
 
         # Rank responses by relevance score
-        best_response = max(responses, key=lambda x: x["relevance_score"])
+        best_response = max(responses, key=lambda x: x["relevance_score"], default=None)
         return {
             "best_response": best_response,
-            "all_responses": responses
+            "all_responses": responses,
+            "timed_out": timed_out,
+            "relevance_scores": relevance_scores
         }
 
     def log_feedback(self, agent_name, feedback):
@@ -156,9 +563,20 @@ class NoovoxSearcher:
         ]
 
         # Content extraction settings
-        self.max_retries = 3
+        self.max_retries = HTTP_MAX_RETRIES  # Applied by the shared session's transport
         self.timeout = 10
         self.max_threads = 5  # Limit concurrent requests
+        self.parser_engine = resolve_engine(HTML_PARSER_ENGINE)  # See noovox.html_parsing
+        self.pipeline_stats: Dict[str, Dict] = {}  # Per-stage metrics of the last search
+
+        # Keep-alive connections and transport-level retries, shared by every searcher in the process
+        self.session = get_session()
+
+        # Fresh responses are reused and stale ones revalidated; set to None to always download
+        self.http_cache = get_http_cache()
+
+        # Extracted article content by normalized URL; set to None to parse every time
+        self.article_store = get_article_store()
 
         # Define news sources
         self.sources = self.initialize_sources()
@@ -300,60 +718,103 @@ class NoovoxSearcher:
         """
         Initiates the search for news articles based on a query and category.
 
-        This method orchestrates the fetching of articles from multiple sources
-        concurrently, filters the results for relevance, and extracts full content.
+        Source listings and full-content extraction run as one pipeline (see `iter_news`):
+        each source's relevant articles are fetched as soon as its listing arrives, on a
+        worker budget shared with the listings still in flight, so the search takes about
+        as long as its slowest listing-then-article chain. Per-stage metrics of the last
+        search are kept in `pipeline_stats`.
 
         Args:
             query (str): The search query string.
             category (str): The category of news to search within.
 
         Returns:
-            List[Dict]: A list of dictionaries containing article data.
+            List[Dict]: A list of dictionaries containing article data, most relevant first.
         """
-        self.logger.info(f"Starting search for: '{query}' in category: '{category}'")
-        all_results = []
-
-        # Validate category
-        if category not in self.sources:
-            self.logger.warning(f"Unknown category '{category}', defaulting to 'general'.")
-            category = 'general'
+        stream = self.iter_news(query, category)
 
         # Use tqdm for progress indication if available
-        executor = ThreadPoolExecutor(max_workers=self.max_threads)
-        futures = {
-            executor.submit(self.fetch_articles_from_source, source, query): source
-            for source in self.sources[category]
-        }
-
         if self.__tqdm:
-            progress = self.__tqdm(as_completed(futures), total=len(futures), desc="Fetching articles")
-        else:
-            progress = as_completed(futures)
+            stream = self.__tqdm(stream, desc="Searching", unit="article")
 
-        for future in progress:
-            source = futures[future]
-            try:
-                articles = future.result()
-                if articles:
-                    all_results.extend(articles)
-                    self.logger.info(f"Found {len(articles)} articles from '{source.name}'")
-            except Exception as e:
-                self.logger.error(f"Error fetching articles from '{source.name}': {str(e)}")
+        articles = sorted(stream, key=lambda x: x.get('relevance_score', 0), reverse=True)
+        self.logger.info(f"Search finished with {len(articles)} articles, pipeline stats: {self.pipeline_stats}")
+        return articles
 
-        executor.shutdown(wait=True)
+    def iter_news(self, query: str, category: str = 'general', limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Streaming variant of `search_news` that yields each article as soon as it is ready.
 
-        # Filter and sort results
-        filtered_results = self.filter_results(all_results, query)
-        self.logger.info(f"Total relevant articles after filtering: {len(filtered_results)}")
+        Each source listing is scored and deduplicated by URL the moment it arrives, and its
+        relevant articles go straight to content extraction, so the first result waits only
+        for the fastest source and article page. Articles therefore come in completion
+        order, not sorted by relevance. Listings and article pages share `max_threads`
+        workers. Stopping early (after `limit` results, or by closing the generator)
+        cancels the fetches that have not started yet.
 
-        # Extract full content
-        if filtered_results:
-            self.logger.info("Extracting full content from articles...")
-            filtered_results = self.extract_full_content(filtered_results)
-        else:
-            self.logger.info("No articles to extract content from.")
+        Args:
+            query (str): The search query string.
+            category (str): The category of news to search within.
+            limit (Optional[int]): Stop after this many enriched articles.
+
+        Yields:
+            Dict: Article data with 'relevance_score', 'full_text', 'text_length' and 'images'.
+        """
+        self.logger.info(f"Starting streaming search for: '{query}' in category: '{category}'")
+        if category not in self.sources:
+            self.logger.warning(f"Unknown category '{category}', defaulting to 'general'.")
+            category = 'general'
+        if limit is not None and limit <= 0:
+            return
 
-        return filtered_results
+        query_terms = query.lower().split()
+        seen_urls = set()
+        yielded = 0
+        executor = StagedExecutor(self.max_threads, stages=("listing", "extraction"))
+        try:
+            sources = {executor.submit("listing", self.fetch_articles_from_source, source, query): source
+                       for source in self.sources[category]}
+            articles = {}
+            pending = set(sources)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in sources:
+                        source = sources[future]
+                        try:
+                            results = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Error fetching articles from '{source.name}': {str(e)}")
+                            continue
+                        self.logger.info(f"Found {len(results)} articles from '{source.name}'")
+                        for article in results:
+                            url = article.get('url', '')
+                            if not url or url in seen_urls:
+                                continue
+                            relevance = self.score_article(article, query_terms)
+                            if relevance > 0:
+                                seen_urls.add(url)
+                                article['relevance_score'] = relevance
+                                extraction = executor.submit("extraction", self.fetch_full_article_content, article)
+                                articles[extraction] = article
+                                pending.add(extraction)
+                        continue
+
+                    try:
+                        full_article = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error extracting full content for '{articles[future]['title']}': {str(e)}")
+                        continue
+                    if full_article:
+                        yield full_article
+                        yielded += 1
+                        if limit is not None and yielded >= limit:
+                            self.logger.info(f"Stopping streaming search after {yielded} articles")
+                            return
+        finally:
+            # Runs on exhaustion, early stop and generator close alike
+            executor.shutdown(cancel=True)
+            self.pipeline_stats = executor.stats()
 
     def fetch_articles_from_source(self, source: ContentSource, query: str) -> List[Dict]:
         """
@@ -379,38 +840,171 @@ class NoovoxSearcher:
             self.logger.error(f"Exception occurred while fetching articles from '{source.name}': {str(e)}")
         return []
 
-    def make_request(self, url: str, retry_count: int = 0) -> Optional[requests.Response]:
+    async def search_news_async(self, query: str, category: str = 'general') -> List[Dict]:
         """
-        Makes an HTTP GET request to the specified URL with retry logic.
+        Asyncio variant of `search_news` that returns articles in the same shape.
 
-        This method attempts to fetch the content from the URL, handling retries
-        with exponential backoff in case of failures.
+        Source pages and article pages are fetched concurrently through an AsyncFetcher,
+        within its global and per-host limits, instead of five threads at a time. As in
+        `iter_news`, each source's relevant articles are fetched as soon as its listing
+        arrives. Pages are served from and stored in `http_cache` like `make_request`
+        does, and HTML is parsed in worker threads so the event loop keeps serving fetches.
+        Cancelling the calling task cancels every fetch still in flight.
+
+        Args:
+            query (str): The search query string.
+            category (str): The category of news to search within.
+
+        Returns:
+            List[Dict]: A list of dictionaries containing article data, most relevant first.
+        """
+        self.logger.info(f"Starting async search for: '{query}' in category: '{category}'")
+        if category not in self.sources:
+            self.logger.warning(f"Unknown category '{category}', defaulting to 'general'.")
+            category = 'general'
+
+        query_terms = query.lower().split()
+        seen_urls = set()
+        extractions = []
+
+        async with AsyncFetcher(timeout=self.timeout, headers=self.get_headers) as fetcher:
+            async def search_source(source):
+                for article in await self.fetch_articles_from_source_async(fetcher, source, query):
+                    url = article.get('url', '')
+                    if not url or url in seen_urls:
+                        continue
+                    relevance = self.score_article(article, query_terms)
+                    if relevance > 0:
+                        seen_urls.add(url)
+                        article['relevance_score'] = relevance
+                        extractions.append(asyncio.create_task(
+                            self.fetch_full_article_content_async(fetcher, article)))
+
+            try:
+                await asyncio.gather(*(search_source(source) for source in self.sources[category]))
+                self.logger.info(f"Total relevant articles after filtering: {len(extractions)}")
+                enriched = await asyncio.gather(*extractions)
+            finally:
+                # Article fetches are not children of the gathers, so cancel them on the way out
+                for extraction in extractions:
+                    extraction.cancel()
+            self.logger.info(f"Async search finished, fetcher stats: {fetcher.stats()}")
+        articles = [article for article in enriched if article]
+        return sorted(articles, key=lambda x: x.get('relevance_score', 0), reverse=True)
+
+    async def fetch_articles_from_source_async(self, fetcher: AsyncFetcher, source: ContentSource,
+                                               query: str) -> List[Dict]:
+        """
+        Asyncio variant of `fetch_articles_from_source`.
+        """
+        url = source.url.format(query=quote(query))
+        try:
+            html = await self.fetch_page_async(fetcher, url)
+            if html is None:
+                return []
+            articles = await asyncio.to_thread(self.extract_articles, html, url, source)
+            self.logger.info(f"Found {len(articles)} articles from '{source.name}'")
+            return articles
+        except Exception as e:
+            self.logger.error(f"Exception occurred while fetching articles from '{source.name}': {str(e)}")
+            return []
+
+    async def fetch_full_article_content_async(self, fetcher: AsyncFetcher, article: Dict) -> Optional[Dict]:
+        """
+        Asyncio variant of `fetch_full_article_content`.
+        """
+        if self.article_store is not None:
+            known = await asyncio.to_thread(self.article_store.restore, article)
+            if known:
+                return known
+        html = await self.fetch_page_async(fetcher, article['url'])
+        if html is None:
+            return None
+        full_article = await asyncio.to_thread(self.parse_full_article, article, html)
+        if full_article and self.article_store is not None:
+            await asyncio.to_thread(self.article_store.put, full_article)
+        return full_article
+
+    async def fetch_page_async(self, fetcher: AsyncFetcher, url: str) -> Optional[str]:
+        """
+        Asyncio variant of `make_request` that returns the page's text.
+
+        Fresh `http_cache` entries are served without a request, stale ones are revalidated
+        with a conditional GET, and successful responses are stored for the next search.
+
+        Returns:
+            Optional[str]: The page, or None if the request failed.
+        """
+        if self.http_cache is None:
+            response = await fetcher.fetch(url)
+            return response.text if response is not None else None
+
+        cached = await asyncio.to_thread(self.http_cache.get, url)
+        if cached is not None and cached.fresh:
+            self.logger.debug(f"Serving URL from cache: {url}")
+            return self.http_cache.response(cached).text
+
+        response = await fetcher.fetch(url, headers=self.http_cache.validators(cached))
+        if response is None:
+            return None
+        if response.status_code == 304 and cached is not None:
+            self.logger.debug(f"Cached copy still valid: {url}")
+            entry = await asyncio.to_thread(self.http_cache.revalidate, url, cached, response)
+            return self.http_cache.response(entry).text
+        await asyncio.to_thread(self.http_cache.store, url, response)
+        return response.text
+
+    def make_request(self, url: str) -> Optional[requests.Response]:
+        """
+        Makes an HTTP GET request to the specified URL over the shared session.
+
+        Responses are served from `http_cache` while fresh; stale ones are revalidated
+        with a conditional GET and reused on a 304 (see `noovox.http_cache`). Connections
+        are reused across requests to the same host. Connection errors, read errors and
+        429/5xx responses are retried by the session's transport with exponential backoff
+        (see `noovox.http_session`).
 
         Args:
             url (str): The URL to fetch.
-            retry_count (int): The current retry attempt count.
 
         Returns:
             Optional[requests.Response]: The HTTP response object if successful, else None.
         """
+        cached = self.http_cache.get(url) if self.http_cache is not None else None
+        if cached is not None and cached.fresh:
+            self.logger.debug(f"Serving URL from cache: {url}")
+            return self.http_cache.response(cached)
+
         try:
-            response = requests.get(
+            headers = self.get_headers()
+            if cached is not None:
+                headers.update(self.http_cache.validators(cached))
+            response = self.session.get(
                 url,
-                headers=self.get_headers(),
+                headers=headers,
                 timeout=self.timeout,
                 allow_redirects=True
             )
+            if response.status_code == 304 and cached is not None:
+                self.logger.debug(f"Cached copy still valid: {url}")
+                return self.http_cache.response(self.http_cache.revalidate(url, cached, response))
             response.raise_for_status()
             self.logger.debug(f"Successfully fetched URL: {url}")
+            if self.http_cache is not None:
+                self.http_cache.store(url, response)
             return response
+        except requests.HTTPError as e:
+            # The transport records the retries it made on the final response
+            retries = getattr(getattr(e.response.raw, 'retries', None), 'history', None) or ()
+            self.logger.error(f"Request failed with HTTP {e.response.status_code} after {len(retries) + 1} "
+                              f"attempt(s): {url}")
+            return None
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self.logger.error(f"Request failed after {self.max_retries} retries: {url} | Error: {str(e)}")
+            return None
         except requests.RequestException as e:
-            if retry_count < self.max_retries:
-                self.logger.warning(f"Request failed ({retry_count + 1}/{self.max_retries}): {url} | Error: {str(e)}")
-                time.sleep(2 ** retry_count)  # Exponential backoff
-                return self.make_request(url, retry_count + 1)
-            else:
-                self.logger.error(f"Request failed after {self.max_retries} retries: {url}")
-                return None
+            self.logger.error(f"Request failed: {url} | Error: {str(e)}")
+            return None
 
     def extract_articles(self, html: str, url: str, source: ContentSource) -> List[Dict]:
         """
@@ -428,10 +1022,11 @@ class NoovoxSearcher:
             List[Dict]: A list of dictionaries containing extracted article data.
         """
         articles = []
-        soup = BeautifulSoup(html, 'html.parser')
 
-        # Choose parsing method based on source
+        # Choose parsing method based on source, and parse only what it reads
         parser_method = self.get_parser_method(url)
+        strainer = LISTING_STRAINERS.get(parser_method.__name__) if parser_method else None
+        soup = make_soup(html, self.parser_engine, strainer)
         if parser_method:
             articles = parser_method(soup)
             self.logger.debug(f"Parsed {len(articles)} articles using {parser_method.__name__}")
@@ -726,6 +1321,27 @@ class NoovoxSearcher:
             return f"https://{url}"
         return url
 
+    def score_article(self, article: Dict, query_terms: List[str]) -> int:
+        """
+        Scores an article by the query terms found in its title and description.
+
+        Args:
+            article (Dict): The article to score.
+            query_terms (List[str]): The lowercased terms of the search query.
+
+        Returns:
+            int: Two points per term in the title plus one per term in the description.
+        """
+        title = article.get('title', '').lower()
+        description = article.get('description', '').lower()
+        relevance = 0
+        for term in query_terms:
+            if term in title:
+                relevance += 2  # Title matches are weighted more
+            if term in description:
+                relevance += 1
+        return relevance
+
     def filter_results(self, results: List[Dict], query: str) -> List[Dict]:
         """
         Filters and sorts the list of articles based on their relevance to the query.
@@ -746,18 +1362,8 @@ class NoovoxSearcher:
 
         for result in results:
             url = result.get('url', '')
-            title = result.get('title', '').lower()
-            description = result.get('description', '').lower()
-
             if url and url not in seen_urls:
-                # Calculate relevance score
-                relevance = 0
-                for term in query_terms:
-                    if term in title:
-                        relevance += 2  # Title matches are weighted more
-                    if term in description:
-                        relevance += 1
-
+                relevance = self.score_article(result, query_terms)
                 if relevance > 0:
                     seen_urls.add(url)
                     result['relevance_score'] = relevance
@@ -773,7 +1379,8 @@ class NoovoxSearcher:
         Extracts the full textual content and images from each article.
 
         This method fetches the full article pages concurrently and parses
-        the main content, extracting paragraphs and image URLs.
+        the main content, extracting paragraphs and image URLs. Articles found
+        in `article_store` are enriched from it without any download or parse.
 
         Args:
             articles (List[Dict]): The list of articles to extract content from.
@@ -784,19 +1391,30 @@ class NoovoxSearcher:
         articles_with_content = []
         self.logger.info("Starting extraction of full content from articles.")
 
+        # Articles already in the store never reach the thread pool
+        unknown = []
+        for article in articles:
+            known = self.article_store.restore(article) if self.article_store is not None else None
+            if known:
+                articles_with_content.append(known)
+            else:
+                unknown.append(article)
+        if articles_with_content:
+            self.logger.info(f"{len(articles_with_content)} articles restored from the article store.")
+
         # Use tqdm for progress indication if available
         if self.__tqdm:
             executor = ThreadPoolExecutor(max_workers=self.max_threads)
             futures = {
-                executor.submit(self.fetch_full_article_content, article): article
-                for article in articles
+                executor.submit(self.fetch_full_article_content, article, False): article
+                for article in unknown
             }
             progress = self.__tqdm(as_completed(futures), total=len(futures), desc="Extracting content")
         else:
             executor = ThreadPoolExecutor(max_workers=self.max_threads)
             futures = {
-                executor.submit(self.fetch_full_article_content, article): article
-                for article in articles
+                executor.submit(self.fetch_full_article_content, article, False): article
+                for article in unknown
             }
             progress = as_completed(futures)
 
@@ -813,27 +1431,57 @@ class NoovoxSearcher:
         self.logger.info(f"Completed extraction of content. {len(articles_with_content)} articles enriched.")
         return articles_with_content
 
-    def fetch_full_article_content(self, article: Dict) -> Optional[Dict]:
+    def fetch_full_article_content(self, article: Dict, use_store: bool = True) -> Optional[Dict]:
         """
         Fetches and extracts the full content from a specific article URL.
 
         This method retrieves the article's webpage, removes unwanted elements,
-        and extracts the main text and image URLs.
+        and extracts the main text and image URLs. Content still fresh in
+        `article_store` is reused, and newly extracted content is saved there.
 
         Args:
             article (Dict): The article dictionary containing at least the 'url'.
+            use_store (bool): Look the article up in the store first; pass False
+                              when the caller already has.
 
         Returns:
             Optional[Dict]: The article dictionary enriched with 'full_text',
                             'text_length', and 'images' if successful, else None.
         """
         try:
+            if use_store and self.article_store is not None:
+                known = self.article_store.restore(article)
+                if known:
+                    return known
             self.logger.debug(f"Fetching full content from URL: {article['url']}")
             response = self.make_request(article['url'])
             if not response:
                 return None
+            full_article = self.parse_full_article(article, response.text)
+            if full_article and self.article_store is not None:
+                self.article_store.put(full_article)
+            return full_article
+        except Exception as e:
+            self.logger.error(f"Exception occurred while extracting content from '{article['url']}': {str(e)}")
+            return None
+
+    def parse_full_article(self, article: Dict, html: str) -> Optional[Dict]:
+        """
+        Extracts the main text and image URLs of an article from its downloaded page.
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+        This method removes unwanted elements, finds the main content block and
+        keeps its substantial paragraphs and first images.
+
+        Args:
+            article (Dict): The article dictionary containing at least the 'url'.
+            html (str): The HTML of the article page.
+
+        Returns:
+            Optional[Dict]: The article dictionary enriched with 'full_text',
+                            'text_length', and 'images' if successful, else None.
+        """
+        try:
+            soup = make_soup(html, self.parser_engine)
 
             # Remove unwanted elements
             for elem in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside']):
@@ -879,7 +1527,7 @@ class NoovoxSearcher:
             return article
 
         except Exception as e:
-            self.logger.error(f"Exception occurred while extracting content from '{article['url']}': {str(e)}")
+            self.logger.error(f"Exception occurred while parsing content from '{article['url']}': {str(e)}")
             return None
 
     def return_results(self, articles: List[Dict], query: str, export_format: Optional[str] = None,
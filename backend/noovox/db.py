@@ -0,0 +1,352 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import mysql.connector
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+class _PooledConnection:
+    """
+    Bookkeeping wrapper around a raw DB-API connection held by the pool.
+
+    Attributes:
+        raw: The underlying driver connection.
+        created_at (float): Monotonic time the connection was opened.
+        last_used_at (float): Monotonic time the connection was last returned to the pool.
+    """
+
+    __slots__ = ('raw', 'created_at', 'last_used_at')
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used_at = now
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of MySQL connections.
+
+    Connections are opened lazily up to `max_size`. On checkout, a connection is
+    recycled if it has outlived `max_lifetime`, evicted if it sat idle for longer
+    than `idle_timeout`, and pinged before being handed out when it has been idle
+    for longer than `health_check_interval`. Callers that find the pool saturated
+    wait up to `checkout_timeout` seconds before a PoolTimeoutError is raised.
+
+    The pool keeps counters for checkout wait time and saturation, exposed through
+    `stats()`, so it can be sized against real traffic.
+    """
+
+    def __init__(self, connect: Callable[[], object], max_size: int = 10, checkout_timeout: float = 5.0,
+                 idle_timeout: float = 300.0, max_lifetime: float = 3600.0, health_check_interval: float = 30.0,
+                 reap_interval: Optional[float] = None):
+        """
+        Initializes the pool without opening any connections.
+
+        Args:
+            connect (Callable[[], object]): Factory returning a new DB-API connection.
+            max_size (int): Maximum number of connections open at once.
+            checkout_timeout (float): Seconds to wait for a free connection before giving up.
+            idle_timeout (float): Seconds a connection may sit unused before it is closed.
+            max_lifetime (float): Seconds after which a connection is closed and replaced.
+            health_check_interval (float): Idle seconds after which a connection is pinged on checkout.
+            reap_interval (Optional[float]): If set, a daemon thread calls `evict_idle` this often.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.__connect = connect
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+
+        self.__lock = threading.Condition()
+        self.__idle = deque()  # LIFO: most recently used connection is reused first
+        self.__open_count = 0
+        self.__in_use = 0
+        self.__closed = False
+
+        # Metrics
+        self.__checkouts = 0
+        self.__waits = 0
+        self.__timeouts = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+        self.__peak_in_use = 0
+        self.__opened = 0
+        self.__discarded = 0
+
+        if reap_interval:
+            reaper = threading.Thread(target=self.__reap, args=(reap_interval,), name="db-pool-reaper", daemon=True)
+            reaper.start()
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks out a connection for the duration of a `with` block.
+
+        The connection is returned to the pool afterwards, rolling back whatever the
+        block did not commit (see `release`).
+
+        Yields:
+            The raw DB-API connection.
+        """
+        pooled = self.acquire()
+        try:
+            yield pooled.raw
+        finally:
+            self.release(pooled)
+
+    def acquire(self) -> _PooledConnection:
+        """
+        Checks out a healthy connection, opening a new one if the pool has capacity.
+
+        Returns:
+            _PooledConnection: The checked-out connection wrapper.
+
+        Raises:
+            PoolTimeoutError: If the pool stays saturated for `checkout_timeout` seconds.
+        """
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        waited = False
+        stale = []
+
+        with self.__lock:
+            while True:
+                if self.__closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                pooled = self.__take_idle(stale)
+                if pooled is not None:
+                    break
+
+                if self.__open_count < self.max_size:
+                    # Reserve the slot, then connect outside the lock
+                    self.__open_count += 1
+                    pooled = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.__timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.checkout_timeout}s waiting for a connection "
+                        f"({self.__in_use}/{self.max_size} in use)"
+                    )
+                waited = True
+                self.__lock.wait(remaining)
+
+            self.__in_use += 1
+            self.__peak_in_use = max(self.__peak_in_use, self.__in_use)
+
+        for expired in stale:
+            self.__close_raw(expired)
+
+        if pooled is None or not self.__is_healthy(pooled):
+            if pooled is not None:
+                self.__close_raw(pooled)
+            try:
+                pooled = _PooledConnection(self.__connect())
+            except Exception:
+                with self.__lock:
+                    self.__open_count -= 1
+                    self.__in_use -= 1
+                    self.__lock.notify()
+                raise
+            with self.__lock:
+                self.__opened += 1
+
+        wait_time = time.monotonic() - started
+        with self.__lock:
+            self.__checkouts += 1
+            self.__total_wait += wait_time
+            self.__max_wait = max(self.__max_wait, wait_time)
+            if waited:
+                self.__waits += 1
+
+        return pooled
+
+    def release(self, pooled: _PooledConnection, discard: bool = False):
+        """
+        Returns a connection to the pool, or closes it if it should not be reused.
+
+        A connection going back to the pool is rolled back first: MySQL connections do
+        not autocommit, so even a read leaves a transaction open, and the next borrower
+        would read its stale snapshot. Connections that fail to roll back are closed.
+
+        Args:
+            pooled (_PooledConnection): The connection wrapper obtained from `acquire`.
+            discard (bool): Close the connection instead of returning it to the pool.
+        """
+        now = time.monotonic()
+        expired = now - pooled.created_at >= self.max_lifetime
+        if not (discard or expired or self.__closed):
+            try:
+                pooled.raw.rollback()
+            except Exception as e:
+                self.logger.warning(f"Discarding pooled connection that failed to roll back: {str(e)}")
+                discard = True
+
+        with self.__lock:
+            self.__in_use -= 1
+            if discard or expired or self.__closed:
+                self.__open_count -= 1
+                self.__discarded += 1
+                close = True
+            else:
+                pooled.last_used_at = now
+                self.__idle.append(pooled)
+                close = False
+            self.__lock.notify()
+
+        if close:
+            self.__close_raw(pooled)
+
+    def evict_idle(self) -> int:
+        """
+        Closes every pooled connection that has been idle longer than `idle_timeout`.
+
+        Returns:
+            int: The number of connections closed.
+        """
+        now = time.monotonic()
+        with self.__lock:
+            keep, stale = deque(), []
+            for pooled in self.__idle:
+                if now - pooled.last_used_at >= self.idle_timeout:
+                    stale.append(pooled)
+                else:
+                    keep.append(pooled)
+            self.__idle = keep
+            self.__open_count -= len(stale)
+            self.__discarded += len(stale)
+            if stale:
+                self.__lock.notify(len(stale))
+
+        for pooled in stale:
+            self.__close_raw(pooled)
+        return len(stale)
+
+    def close(self):
+        """
+        Closes all idle connections and rejects further checkouts.
+
+        Connections still in use are closed as they are released.
+        """
+        with self.__lock:
+            self.__closed = True
+            idle, self.__idle = list(self.__idle), deque()
+            self.__open_count -= len(idle)
+            self.__lock.notify_all()
+
+        for pooled in idle:
+            self.__close_raw(pooled)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Reports pool sizing and checkout wait metrics.
+
+        Returns:
+            Dict[str, float]: Current and cumulative pool counters. `saturation` is the
+            fraction of `max_size` currently checked out.
+        """
+        with self.__lock:
+            return {
+                "max_size": self.max_size,
+                "open": self.__open_count,
+                "idle": len(self.__idle),
+                "in_use": self.__in_use,
+                "peak_in_use": self.__peak_in_use,
+                "saturation": self.__in_use / self.max_size,
+                "checkouts": self.__checkouts,
+                "waits": self.__waits,
+                "timeouts": self.__timeouts,
+                "avg_wait_ms": (self.__total_wait / self.__checkouts * 1000) if self.__checkouts else 0.0,
+                "max_wait_ms": self.__max_wait * 1000,
+                "opened": self.__opened,
+                "discarded": self.__discarded,
+            }
+
+    def __reap(self, interval: float):
+        while True:
+            with self.__lock:
+                self.__lock.wait_for(lambda: self.__closed, timeout=interval)
+                if self.__closed:
+                    return
+            evicted = self.evict_idle()
+            if evicted:
+                self.logger.debug(f"Evicted {evicted} idle connections")
+
+    def __take_idle(self, stale: list) -> Optional[_PooledConnection]:
+        """
+        Pops the most recently used idle connection. Caller holds the lock.
+
+        Connections that went stale are moved to `stale` so they can be closed outside the lock.
+        """
+        now = time.monotonic()
+        while self.__idle:
+            pooled = self.__idle.pop()
+            if (now - pooled.last_used_at >= self.idle_timeout
+                    or now - pooled.created_at >= self.max_lifetime):
+                self.__open_count -= 1
+                self.__discarded += 1
+                stale.append(pooled)
+                continue
+            return pooled
+        return None
+
+    def __is_healthy(self, pooled: _PooledConnection) -> bool:
+        """Pings connections that have been idle long enough to have been dropped by the server."""
+        if time.monotonic() - pooled.last_used_at < self.health_check_interval:
+            return True
+        try:
+            pooled.raw.ping(reconnect=False)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Discarding unhealthy pooled connection: {str(e)}")
+            with self.__lock:
+                self.__discarded += 1
+            return False
+
+    def __close_raw(self, pooled: _PooledConnection):
+        try:
+            pooled.raw.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing pooled connection: {str(e)}")
+
+
+def create_mysql_pool(host: str, user: str, password: str, database: str, **pool_options) -> ConnectionPool:
+    """
+    Builds a ConnectionPool that opens MySQL connections with the given credentials.
+
+    Args:
+        host (str): MySQL server host.
+        user (str): MySQL user.
+        password (str): MySQL password.
+        database (str): Database name.
+        **pool_options: Keyword arguments forwarded to ConnectionPool.
+
+    Returns:
+        ConnectionPool: A pool that has not opened any connections yet.
+    """
+    def connect():
+        return mysql.connector.connect(
+            host=host,
+            user=user,
+            password=password,
+            database=database
+        )
+
+    return ConnectionPool(connect, **pool_options)
@@ -24,4 +24,10 @@ CREATE DATABASE IF NOT EXISTS `noovox`; USE `noovox`; CREATE TABLE IF NOT EXISTS
     `content_id` INT NOT NULL,
     `tracked_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (`user_id`) REFERENCES `users`(`user_id`) ON DELETE CASCADE
+); CREATE TABLE IF NOT EXISTS `chat_summaries` (
+    `chat_id` INT PRIMARY KEY,
+    `summary_text` TEXT NOT NULL,
+    `through_message_id` INT NOT NULL,
+    `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (`chat_id`) REFERENCES `chats`(`chat_id`) ON DELETE CASCADE
 );
\ No newline at end of file
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import os
+import random
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from backend.noovox.http_session import HTTP_BACKOFF_FACTOR, HTTP_MAX_RETRIES, RETRY_STATUSES
+
+HTTP_ASYNC_CONCURRENCY = int(os.environ.get('HTTP_ASYNC_CONCURRENCY', '100'))  # Fetches in flight overall
+HTTP_ASYNC_PER_HOST = int(os.environ.get('HTTP_ASYNC_PER_HOST', '8'))  # Fetches in flight per host
+
+
+class AsyncFetcher:
+    """
+    Asyncio HTTP fetcher with a global and a per-host concurrency limit.
+
+    Every fetch holds one global slot and one slot for its host, so a single search can
+    keep hundreds of requests in flight without hammering any one site. Connection
+    errors and 429/5xx responses are retried after a jittered exponential backoff (or
+    the server's Retry-After), capped at `max_delay`, that sleeps without blocking the
+    event loop. Cancelling
+    the calling task cancels its fetches and frees their slots.
+
+    Use as an async context manager, or call `aclose` when done.
+    """
+
+    def __init__(self, max_concurrency: int = HTTP_ASYNC_CONCURRENCY, per_host: int = HTTP_ASYNC_PER_HOST,
+                 timeout: float = 10.0, max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR, headers: Optional[Callable[[], Dict[str, str]]] = None,
+                 max_delay: float = 30.0):
+        """
+        Args:
+            max_concurrency (int): Maximum fetches in flight across all hosts.
+            per_host (int): Maximum fetches in flight to one host.
+            timeout (float): Timeout of each attempt, in seconds.
+            max_retries (int): Retries after a retryable failure.
+            backoff_factor (float): Base of the exponential backoff between retries, in seconds.
+            headers (Optional[Callable[[], Dict[str, str]]]): Called for the headers of every request.
+            max_delay (float): Upper bound on a single backoff, Retry-After included, in seconds.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.per_host = per_host
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.headers = headers or dict
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self.__slots = asyncio.Semaphore(max_concurrency)
+        self.__host_slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self.__in_flight = 0
+        self.__stats = {"requests": 0, "retries": 0, "failures": 0, "peak_in_flight": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def __backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.backoff_factor * 2 ** attempt))
+        if response is not None:
+            try:
+                delay = max(delay, min(float(response.headers.get("retry-after")), self.max_delay))
+            except (TypeError, ValueError):
+                pass
+        return delay
+
+    async def __attempt(self, url: str, host: str, headers: Optional[Dict[str, str]]) -> httpx.Response:
+        async with self.__slots, self.__host_slots[host]:
+            self.__in_flight += 1
+            self.__stats["requests"] += 1
+            self.__stats["peak_in_flight"] = max(self.__stats["peak_in_flight"], self.__in_flight)
+            try:
+                return await self.client.get(url, headers={**self.headers(), **(headers or {})})
+            finally:
+                self.__in_flight -= 1
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        Fetches a URL, retrying transient failures.
+
+        Args:
+            url (str): The URL to fetch.
+            headers (Optional[Dict[str, str]]): Extra request headers, such as cache validators.
+
+        Returns:
+            Optional[httpx.Response]: The successful response (or a 304 answering conditional
+            `headers`), or None if the request failed.
+        """
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await self.__attempt(url, host, headers)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPStatusError as e:
+                self.logger.error(f"Request failed: {url} | Error: {str(e)}")
+                break
+            except httpx.TransportError as e:
+                error = str(e) or e.__class__.__name__
+            if attempt < self.max_retries:
+                self.__stats["retries"] += 1
+                delay = self.__backoff(attempt, response)
+                self.logger.warning(f"Request failed ({attempt + 1}/{self.max_retries}): {url} | Error: {error}")
+                await asyncio.sleep(delay)
+            else:
+                self.logger.error(f"Request failed after {self.max_retries} retries: {url} | Error: {error}")
+        self.__stats["failures"] += 1
+        return None
+
+    async def fetch_all(self, urls: Iterable[str]) -> List[Optional[httpx.Response]]:
+        """Fetches URLs concurrently, within the limits, returning responses in the order of `urls`."""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Requests sent (retries included), retries, failed fetches, and the
+            current and peak number of requests in flight.
+        """
+        return dict(self.__stats, in_flight=self.__in_flight)
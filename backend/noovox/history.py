@@ -0,0 +1,195 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+from backend.constants import General
+from backend.noovox.sessions import SessionStore
+from backend.noovox.tokens import CHARS_PER_TOKEN, count_tokens
+
+
+class ConversationHistory:
+    """
+    Token-aware chat history for an agent.
+
+    `window` returns the newest messages that fit in `token_budget` tokens, preceded by a
+    rolling summary of older turns. At most `max_messages` are kept in memory: once
+    `needs_compaction` reports more, `compact` folds the oldest half into the summary
+    using a summarizer supplied by the agent, so memory and prompt size stay bounded
+    over long sessions.
+
+    With a `store`, the messages in memory are a hot cache of a persistent session. The
+    session is loaded on first use (only the summary and the newest `max_messages`),
+    every message is appended to the store, and each `window` first picks up messages
+    other workers appended since the last look, so any process can serve the session.
+    Methods are thread-safe, so the asyncio agent can run store I/O in worker threads.
+    """
+
+    # One instance per active session, so keep instances small
+    __slots__ = ("token_budget", "max_messages", "model", "store", "session_id", "messages", "summary", "__tokens",
+                 "__ids", "__next_id", "__loaded", "__synced_through", "__summary_through", "__folded_through",
+                 "__lock")
+
+    def __init__(self, token_budget: int = General.HISTORY_TOKEN_BUDGET,
+                 max_messages: int = General.HISTORY_MAX_MESSAGES, model: str = General.DEFAULT_MODEL,
+                 store: Optional[SessionStore] = None, session_id=None):
+        """
+        Args:
+            token_budget (int): Maximum tokens of history (summary included) sent with a prompt.
+            max_messages (int): Maximum messages kept before older ones are folded into the summary.
+            model (str): Model whose tokenizer is used to count tokens.
+            store (Optional[SessionStore]): Persistent storage for the session; memory only if None.
+            session_id: Key of the session in `store`.
+        """
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+        self.model = model
+        self.store = store
+        self.session_id = session_id
+        self.messages: List[Dict[str, str]] = []
+        self.summary = ""
+        self.__tokens: List[int] = []  # Token count of each message, computed once
+        self.__ids: List[int] = []  # Store id of each message
+        self.__next_id = 1  # Ids for messages when there is no store
+        self.__loaded = store is None
+        self.__synced_through = 0  # Largest id read from the store
+        self.__summary_through = 0  # Id of the last message covered by the summary
+        self.__folded_through = 0  # Id of the last message handed out by take_oldest
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __add(self, message_id: int, role: str, content: str):
+        self.messages.append({"role": role, "content": content})
+        self.__tokens.append(count_tokens(content, self.model))
+        self.__ids.append(message_id)
+
+    def sync(self):
+        """
+        Loads the session from the store on first use, then picks up newer messages and summaries.
+        """
+        if self.store is None:
+            return
+        with self.__lock:
+            self.__sync()
+
+    def __sync(self):
+        first_load = not self.__loaded
+        # Messages already folded or dropped locally are not read back
+        after = max(self.__synced_through, self.__summary_through, self.__folded_through)
+        snapshot = self.store.load(self.session_id, after=after, limit=self.max_messages if first_load else None)
+        self.__loaded = True
+
+        if snapshot.summary_through > self.__summary_through:
+            # Another worker folded part of the session; drop what its summary now covers
+            self.summary = snapshot.summary
+            self.__summary_through = snapshot.summary_through
+            keep = [i for i, message_id in enumerate(self.__ids) if message_id > snapshot.summary_through]
+            self.messages = [self.messages[i] for i in keep]
+            self.__tokens = [self.__tokens[i] for i in keep]
+            self.__ids = [self.__ids[i] for i in keep]
+
+        known = set(self.__ids)
+        new = [message for message in snapshot.messages if message.id not in known]
+        if snapshot.messages:
+            self.__synced_through = max(self.__synced_through, snapshot.messages[-1].id)
+        if not new:
+            return
+        for message in new:
+            self.__add(message.id, message.role, message.content)
+        if self.__ids != sorted(self.__ids):
+            order = sorted(range(len(self.__ids)), key=self.__ids.__getitem__)
+            self.messages = [self.messages[i] for i in order]
+            self.__tokens = [self.__tokens[i] for i in order]
+            self.__ids = [self.__ids[i] for i in order]
+
+    def append(self, role: str, content: str):
+        with self.__lock:
+            if self.store is None:
+                message_id = self.__next_id
+                self.__next_id += 1
+            else:
+                if not self.__loaded:
+                    self.__sync()
+                message_id = self.store.append(self.session_id, role, content)
+            self.__add(message_id, role, content)
+
+    def window(self) -> List[Dict[str, str]]:
+        """
+        Returns the summary and the newest messages that fit in the token budget, oldest first.
+
+        If even the newest message does not fit, it is truncated rather than dropped.
+        """
+        with self.__lock:
+            self.sync()
+            return self.__window()
+
+    def __window(self) -> List[Dict[str, str]]:
+        window = []
+        budget = self.token_budget
+        if self.summary:
+            summary = {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+            budget -= count_tokens(summary["content"], self.model)
+        for message, tokens in zip(reversed(self.messages), reversed(self.__tokens)):
+            if tokens > budget:
+                if not window and budget > 0:
+                    window.append({"role": message["role"],
+                                   "content": message["content"][:budget * CHARS_PER_TOKEN] + " [truncated]"})
+                break
+            window.append(message)
+            budget -= tokens
+        window.reverse()
+        if self.summary:
+            window.insert(0, summary)
+        return window
+
+    def needs_compaction(self) -> bool:
+        return len(self.messages) > self.max_messages
+
+    def take_oldest(self) -> List[Dict[str, str]]:
+        """
+        Removes and returns the oldest half of the messages, to be folded into the summary with `fold`.
+        """
+        with self.__lock:
+            # Fold an even number of messages so user/assistant pairs stay together
+            count = max(2, (len(self.messages) // 2) & ~1)
+            folded = self.messages[:count]
+            self.__folded_through = self.__ids[:count][-1]
+            del self.messages[:count]
+            del self.__tokens[:count]
+            del self.__ids[:count]
+            return folded
+
+    def fold(self, summary: str):
+        """Replaces the summary with one that covers the messages last returned by `take_oldest`."""
+        with self.__lock:
+            self.summary = summary
+            self.__summary_through = self.__folded_through
+            if self.store is not None:
+                self.store.save_summary(self.session_id, summary, self.__folded_through)
+
+    def compact(self, summarize: Optional[Callable[[str, List[Dict[str, str]]], str]]):
+        """
+        Folds the oldest messages into the rolling summary while over `max_messages`.
+
+        Args:
+            summarize: Called with the current summary and the folded messages, returns the
+                new summary. Without a summarizer the oldest messages are simply dropped.
+        """
+        while self.needs_compaction():
+            folded = self.take_oldest()
+            if summarize:
+                self.fold(summarize(self.summary, folded))
+
+
+def summary_request(summary: str, messages: List[Dict[str, str]],
+                    max_words: int = General.HISTORY_SUMMARY_WORDS) -> List[Dict[str, str]]:
+    """Builds the messages asking the model to fold older turns into the running summary."""
+    transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+    return [
+        {"role": "system",
+         "content": f"You maintain a running summary of a conversation. Keep the facts, decisions and "
+                    f"open questions a future reply would need, in at most {max_words} words."},
+        {"role": "user",
+         "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns to fold in:\n{transcript}\n\n"
+                    f"Reply with the updated summary only."},
+    ]
@@ -0,0 +1,77 @@
+import logging
+import os
+import re
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+HTML_PARSER_ENGINE = os.environ.get('HTML_PARSER_ENGINE', 'strained')
+
+# Engine name -> (BeautifulSoup tree builder, parse only the elements the page's parser reads)
+ENGINES = {
+    'html.parser': ('html.parser', False),
+    'strained': ('html.parser', True),
+    'lxml': ('lxml', False),
+    'lxml-strained': ('lxml', True),
+}
+
+# The containers each listing parser iterates over. Everything outside them is skipped while
+# parsing, which gives the parser the same elements to work on; keep these in step with the
+# find_all calls of the parse_* methods. The generic parser matches tags by name or class, which
+# a SoupStrainer cannot express, so its pages are always parsed in full.
+LISTING_STRAINERS = {
+    'parse_google_news': SoupStrainer('article'),
+    'parse_bing_news': SoupStrainer('div', class_=re.compile(r'news-card', re.I)),
+    'parse_yahoo_news': SoupStrainer(['div', 'article'], class_=re.compile(r'NewsArticle|stream-item', re.I)),
+    'parse_reuters': SoupStrainer('div', class_=re.compile(r'search-result-content', re.I)),
+    'parse_ft': SoupStrainer('div', class_=re.compile(r'o-teaser__content', re.I)),
+}
+
+logger = logging.getLogger(__name__)
+
+
+def lxml_available() -> bool:
+    # Optional: a C parser, several times faster than html.parser
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def available_engines() -> List[str]:
+    """Returns the engines that can run here."""
+    return [name for name, (builder, _) in ENGINES.items() if builder != 'lxml' or lxml_available()]
+
+
+def resolve_engine(name: str) -> str:
+    """
+    Validates an engine name, falling back to the html.parser equivalent if lxml is not installed.
+
+    Raises:
+        ValueError: If the name is not one of `ENGINES`.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown HTML parser engine '{name}', expected one of: {', '.join(ENGINES)}")
+    if ENGINES[name][0] == 'lxml' and not lxml_available():
+        fallback = 'strained' if ENGINES[name][1] else 'html.parser'
+        logger.warning(f"lxml is not installed, using the '{fallback}' HTML parser engine instead of '{name}'")
+        return fallback
+    return name
+
+
+def make_soup(html: str, engine: str = 'html.parser', strainer: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parses a page with the given engine.
+
+    Args:
+        html (str): The page to parse.
+        engine (str): One of `ENGINES`, as returned by `resolve_engine`.
+        strainer (Optional[SoupStrainer]): The elements the caller reads; with a strained
+            engine only these (and their descendants) are built.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    builder, strained = ENGINES[engine]
+    return BeautifulSoup(html, builder, parse_only=strainer if strained else None)
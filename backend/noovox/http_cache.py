@@ -0,0 +1,302 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+HTTP_CACHE_PATH = os.environ.get('HTTP_CACHE_PATH')  # SQLite file for the disk tier; memory only if unset
+HTTP_CACHE_MAX_BYTES = int(os.environ.get('HTTP_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+HTTP_CACHE_DISK_MAX_BYTES = int(os.environ.get('HTTP_CACHE_DISK_MAX_BYTES', str(512 * 1024 * 1024)))
+HTTP_CACHE_TTL = float(os.environ.get('HTTP_CACHE_TTL', '300'))  # For responses that do not say
+
+_lock = threading.Lock()
+_cache: Optional["HTTPCache"] = None
+
+
+class CachedEntry(NamedTuple):
+    url: str  # Final URL after redirects
+    body: bytes
+    headers: Dict[str, str]
+    encoding: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.url) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class HTTPCache:
+    """
+    Private HTTP cache of successful GET responses, keyed by requested URL.
+
+    Responses live in an in-memory LRU bounded by `max_bytes` and, when `path` is given,
+    in a SQLite file bounded by `max_disk_bytes` that survives restarts. Freshness comes
+    from Cache-Control (`max-age`, `no-cache`, `no-store`) or Expires, and responses that
+    give neither stay fresh for `default_ttl` seconds. A stale entry with an ETag or
+    Last-Modified is revalidated with a conditional GET, and a 304 answer reuses the
+    stored body. `Vary` is not honoured: entries are shared across request headers.
+    """
+
+    def __init__(self, max_bytes: int = HTTP_CACHE_MAX_BYTES, path: Optional[str] = None,
+                 max_disk_bytes: int = HTTP_CACHE_DISK_MAX_BYTES, default_ttl: float = HTTP_CACHE_TTL):
+        """
+        Args:
+            max_bytes (int): Size of the in-memory tier, in bytes.
+            path (Optional[str]): SQLite file for the disk tier; memory only if None.
+            max_disk_bytes (int): Size of the disk tier, in bytes.
+            default_ttl (float): Seconds a response without freshness headers is reused.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.default_ttl = default_ttl
+
+        self.__lock = threading.Lock()
+        self.__memory: "OrderedDict[str, CachedEntry]" = OrderedDict()
+        self.__memory_bytes = 0
+
+        self.__db = None
+        self.__disk_bytes = 0
+        if path:
+            self.__db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self.__db.execute("PRAGMA journal_mode=WAL")
+            self.__db.execute("CREATE TABLE IF NOT EXISTS http_cache (key TEXT PRIMARY KEY, url TEXT NOT NULL, "
+                              "body BLOB NOT NULL, headers TEXT NOT NULL, encoding TEXT, expires_at REAL NOT NULL, "
+                              "size INTEGER NOT NULL, used_at REAL NOT NULL)")
+            self.__db.execute("CREATE INDEX IF NOT EXISTS http_cache_used_at ON http_cache (used_at)")
+            self.__db.commit()
+            # Kept up to date on every write, so storing a page never sums the table. Only this
+            # process's writes are counted after opening, so processes sharing a file may overshoot.
+            self.__disk_bytes = self.__db.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+        self.__stats = {"memory_hits": 0, "disk_hits": 0, "revalidated": 0, "stale": 0, "misses": 0,
+                        "stored": 0, "uncacheable": 0, "evictions": 0}
+
+    def get(self, url: str) -> Optional[CachedEntry]:
+        """
+        Looks up the entry for a URL.
+
+        Returns:
+            Optional[CachedEntry]: A fresh entry to serve as is, a stale one to revalidate
+            (see `validators`), or None on a miss.
+        """
+        now = time.time()
+        with self.__lock:
+            entry, tier = self.__memory.get(url), "memory_hits"
+            if entry is not None:
+                self.__memory.move_to_end(url)
+            elif self.__db is not None:
+                row = self.__db.execute("SELECT url, body, headers, encoding, expires_at FROM http_cache WHERE key = ?",
+                                        (url,)).fetchone()
+                if row is not None:
+                    entry, tier = CachedEntry(row[0], row[1], json.loads(row[2]), row[3], row[4]), "disk_hits"
+                    self.__db.execute("UPDATE http_cache SET used_at = ? WHERE key = ?", (now, url))
+                    self.__db.commit()
+                    self.__store_memory(url, entry)  # Promote so the next lookup skips SQLite
+
+            if entry is None:
+                self.__stats["misses"] += 1
+            elif entry.expires_at > now:
+                self.__stats[tier] += 1
+            elif self.validators(entry):
+                self.__stats["stale"] += 1
+            else:
+                # Stale and nothing to revalidate with
+                self.__delete(url)
+                self.__stats["misses"] += 1
+                entry = None
+        return entry
+
+    @staticmethod
+    def validators(entry: Optional[CachedEntry]) -> Dict[str, str]:
+        """Returns the conditional request headers that revalidate `entry`."""
+        if entry is None or entry.fresh:
+            return {}
+        headers = CaseInsensitiveDict(entry.headers)
+        validators = {}
+        if headers.get('etag'):
+            validators['If-None-Match'] = headers['etag']
+        if headers.get('last-modified'):
+            validators['If-Modified-Since'] = headers['last-modified']
+        return validators
+
+    def revalidate(self, request_url: str, entry: CachedEntry, response) -> CachedEntry:
+        """
+        Refreshes a stale entry after the server answered its conditional GET with 304.
+
+        `response` is a requests or httpx response.
+
+        Returns:
+            CachedEntry: The entry with the 304's headers merged in and a new expiry.
+        """
+        headers = dict(entry.headers)
+        headers.update(response.headers)
+        entry = entry._replace(headers=headers, expires_at=self.__expires_at(CaseInsensitiveDict(headers)))
+        with self.__lock:
+            self.__stats["revalidated"] += 1
+            self.__put(request_url, entry)
+        return entry
+
+    def store(self, request_url: str, response) -> Optional[CachedEntry]:
+        """
+        Caches a 200 response (from requests or httpx) unless its Cache-Control forbids it.
+
+        Returns:
+            Optional[CachedEntry]: The stored entry, or None if the response is not cacheable.
+        """
+        expires_at = self.__expires_at(response.headers)
+        if response.status_code != 200 or expires_at is None:
+            with self.__lock:
+                self.__stats["uncacheable"] += 1
+            return None
+        entry = CachedEntry(str(response.url or request_url), response.content, dict(response.headers),
+                            response.encoding, expires_at)
+        with self.__lock:
+            self.__stats["stored"] += 1
+            self.__put(request_url, entry)
+        return entry
+
+    @staticmethod
+    def response(entry: CachedEntry) -> requests.Response:
+        """Builds a requests.Response from a cached entry, for callers of `make_request`."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = entry.url
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = entry.encoding
+        response._content = entry.body
+        return response
+
+    def clear(self):
+        with self.__lock:
+            self.__memory.clear()
+            self.__memory_bytes = 0
+            if self.__db is not None:
+                self.__db.execute("DELETE FROM http_cache")
+                self.__db.commit()
+                self.__disk_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Reports hit and miss counters.
+
+        Returns:
+            Dict[str, float]: Fresh hits per tier, 304 revalidations, stale lookups, misses,
+            stored and uncacheable responses, evictions, the entries and bytes held in
+            memory, the bytes held on disk, and `hit_rate`: lookups answered without
+            downloading the body.
+        """
+        with self.__lock:
+            stats = dict(self.__stats, entries=len(self.__memory), bytes=self.__memory_bytes,
+                         disk_bytes=self.__disk_bytes)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["stale"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"] + stats["revalidated"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def __expires_at(self, headers) -> Optional[float]:
+        """Absolute expiry from the response headers, or None if it must not be stored."""
+        now = time.time()
+        directives = {}
+        for directive in headers.get('cache-control', '').lower().split(','):
+            name, _, value = directive.strip().partition('=')
+            if name:
+                directives[name] = value.strip('"')
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return now  # Stored, but revalidated before every use
+        if 'max-age' in directives:
+            try:
+                age = float(headers.get('age') or 0)
+                return now + max(float(directives['max-age']) - age, 0)
+            except ValueError:
+                return now
+        if 'expires' in headers:
+            expires = _http_date(headers['expires'])
+            if expires is None:
+                return now  # An invalid Expires means already expired
+            date = _http_date(headers.get('date')) or now
+            return now + max(expires - date, 0)
+        return now + self.default_ttl
+
+    def __put(self, key: str, entry: CachedEntry):
+        """Caller holds the lock."""
+        self.__store_memory(key, entry)
+        if self.__db is None:
+            return
+        if entry.size > self.max_disk_bytes:
+            return
+        now = time.time()
+        old = self.__db.execute("SELECT size FROM http_cache WHERE key = ?", (key,)).fetchone()
+        self.__db.execute("INSERT OR REPLACE INTO http_cache (key, url, body, headers, encoding, expires_at, size, "
+                          "used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                          (key, entry.url, entry.body, json.dumps(entry.headers), entry.encoding, entry.expires_at,
+                           entry.size, now))
+        self.__disk_bytes += entry.size - (old[0] if old else 0)
+        while self.__disk_bytes > self.max_disk_bytes:
+            # Walks the used_at index from the oldest entry, a few rows at a time
+            victims = self.__db.execute("SELECT key, size FROM http_cache ORDER BY used_at LIMIT 16").fetchall()
+            if not victims:
+                break
+            for old_key, size in victims:
+                if self.__disk_bytes <= self.max_disk_bytes:
+                    break
+                self.__db.execute("DELETE FROM http_cache WHERE key = ?", (old_key,))
+                self.__disk_bytes -= size
+                self.__stats["evictions"] += 1
+        self.__db.commit()
+
+    def __store_memory(self, key: str, entry: CachedEntry):
+        """Caller holds the lock."""
+        old = self.__memory.pop(key, None)
+        if old is not None:
+            self.__memory_bytes -= old.size
+        if entry.size > self.max_bytes:
+            return
+        self.__memory[key] = entry
+        self.__memory_bytes += entry.size
+        while self.__memory_bytes > self.max_bytes:
+            _, evicted = self.__memory.popitem(last=False)
+            self.__memory_bytes -= evicted.size
+            self.__stats["evictions"] += 1
+
+    def __delete(self, key: str):
+        """Caller holds the lock."""
+        old = self.__memory.pop(key, None)
+        if old is not None:
+            self.__memory_bytes -= old.size
+        if self.__db is not None:
+            old = self.__db.execute("SELECT size FROM http_cache WHERE key = ?", (key,)).fetchone()
+            if old:
+                self.__db.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+                self.__db.commit()
+                self.__disk_bytes -= old[0]
+
+
+def get_http_cache() -> HTTPCache:
+    """Returns the process-wide scraping cache, building it on first use."""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = HTTPCache(path=HTTP_CACHE_PATH)
+        return _cache
@@ -0,0 +1,63 @@
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Outbound HTTP settings for scraping, shared by every NoovoxSearcher in the process
+HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', '32'))  # Hosts with a pool kept open
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '10'))  # Keep-alive connections per host
+HTTP_MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', '3'))
+HTTP_BACKOFF_FACTOR = float(os.environ.get('HTTP_BACKOFF_FACTOR', '0.5'))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+
+def build_session(pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                  max_retries: int = HTTP_MAX_RETRIES, backoff_factor: float = HTTP_BACKOFF_FACTOR
+                  ) -> requests.Session:
+    """
+    Builds a requests.Session with keep-alive connection pools and transport-level retries.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Connections kept open per host; set it to at least the number
+            of threads fetching from one host, or extra connections are opened and dropped.
+        max_retries (int): Retries on connection errors, read errors and 429/5xx responses.
+        backoff_factor (float): Exponential backoff between retries, in seconds. A
+            Retry-After header from the server takes precedence.
+
+    Returns:
+        requests.Session: A session safe to share between threads as long as callers pass
+        per-request headers instead of changing the session's own.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand back the last response so callers see the final status
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide scraping session, building it on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = build_session()
+        return _session
@@ -0,0 +1,238 @@
+import heapq
+import logging
+import math
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Function words carry no topical signal but would otherwise match almost every passage
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i in is it its of on or our so that the their
+there these they this to was we were what when where which who why will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase a string and split it into word tokens, dropping stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class MappedPassages(Sequence):
+    """
+    Read-only, memory-mapped view of a knowledge base file with one passage per non-blank line.
+
+    Passages are decoded only when accessed, so a large file costs page cache rather than
+    Python strings. The byte offsets of the passages are kept in an index file next to
+    the knowledge base (`<path>.offsets`), which is reused while the knowledge base is
+    unchanged and memory-mapped as well, so processes on the same host share both.
+    """
+
+    HEADER_FIELDS = 3  # Knowledge base size, modification time (ns) and passage count
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__mapping = None
+        self.__offsets = ()  # Start and end byte offset of each passage, interleaved
+        self.__count = 0
+        size = os.path.getsize(path)
+        if size == 0:
+            return  # Empty files cannot be mapped
+        with open(path, "rb") as file:
+            self.__mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__offsets = self.__load_offsets(os.stat(path))
+        self.__count = len(self.__offsets) // 2
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__count))]
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("passage index out of range")
+        start, end = self.__offsets[2 * index], self.__offsets[2 * index + 1]
+        return self.__mapping[start:end].decode("utf-8", errors="replace")
+
+    def __load_offsets(self, stat) -> Sequence[int]:
+        index_path = self.path + ".offsets"
+        header = [stat.st_size, stat.st_mtime_ns]
+        try:
+            with open(index_path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            # A truncated or corrupt index is rebuilt rather than trusted
+            item_size = array("Q").itemsize
+            if len(mapped) % item_size == 0 and len(mapped) >= self.HEADER_FIELDS * item_size:
+                offsets = memoryview(mapped).cast("Q")
+                passages = offsets[self.HEADER_FIELDS:]
+                if list(offsets[:2]) == header and len(passages) == 2 * offsets[2] and \
+                        (not passages or passages[-1] <= stat.st_size):
+                    return passages
+            logging.getLogger(self.__class__.__name__).warning(f"Rebuilding invalid passage index {index_path}")
+        except (OSError, ValueError, TypeError, IndexError):
+            pass  # Missing, empty or unreadable index; rebuild it
+
+        offsets = self.__scan()
+        try:
+            with open(index_path + ".tmp", "wb") as file:
+                array("Q", header + [len(offsets) // 2]).tofile(file)
+                offsets.tofile(file)
+            os.replace(index_path + ".tmp", index_path)
+        except OSError as e:
+            logging.getLogger(self.__class__.__name__).warning(
+                f"Could not write passage index {index_path}, keeping it in memory: {str(e)}")
+        return offsets
+
+    def __scan(self) -> array:
+        """Finds the byte range of every non-blank line, without surrounding whitespace."""
+        offsets = array("Q")
+        mapping = self.__mapping
+        size = len(mapping)
+        start = 0
+        while start < size:
+            end = mapping.find(b"\n", start)
+            if end == -1:
+                end = size
+            line = mapping[start:end]
+            stripped = line.strip()
+            if stripped:
+                left = start + len(line) - len(line.lstrip())
+                offsets.append(left)
+                offsets.append(left + len(stripped))
+            start = end + 1
+        return offsets
+
+
+class KnowledgeBaseIndex:
+    """
+    BM25 inverted index over the lines (passages) of an agent's knowledge base.
+
+    Text is normalized and tokenized once when the index is built. Queries only
+    touch the postings of their own terms, so lookups cost time proportional to
+    how often the query terms occur instead of to the size of the knowledge base.
+    Built with `from_file`, passages stay in the memory-mapped file and only the
+    ones a lookup returns are decoded.
+    """
+
+    def __init__(self, passages: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Builds the index.
+
+        Args:
+            passages (Iterable[str]): Knowledge base passages, typically one per line, or MappedPassages.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 document-length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.__lengths = array('I')
+        self.__postings: Dict[str, Tuple[array, array]] = {}
+
+        if isinstance(passages, MappedPassages):
+            # Already stripped and non-blank; each passage is decoded for tokenizing and then dropped
+            self.passages: Sequence[str] = passages
+            documents = enumerate(passages)
+        else:
+            self.passages = [passage for passage in (passage.strip() for passage in passages) if passage]
+            documents = enumerate(self.passages)
+
+        for doc_id, passage in documents:
+            tokens = tokenize(passage)
+            self.__lengths.append(len(tokens))
+
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings = self.__postings.get(token)
+                if postings is None:
+                    postings = self.__postings[token] = (array('I'), array('H'))
+                postings[0].append(doc_id)
+                postings[1].append(min(count, 65535))
+
+        self.__avg_length = (sum(self.__lengths) / len(self.__lengths)) if self.__lengths else 0.0
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "KnowledgeBaseIndex":
+        """Indexes a knowledge base file through MappedPassages; a missing file gives an empty index."""
+        if not path or not os.path.exists(path):
+            return cls([], **kwargs)
+        return cls(MappedPassages(path), **kwargs)
+
+    def __len__(self):
+        return len(self.passages)
+
+    def __idf(self, document_frequency: int) -> float:
+        n = len(self.passages)
+        return math.log(1 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def __score(self, query: str):
+        """Accumulates BM25 scores and matched-term weight per passage for the query's terms."""
+        terms = set(tokenize(query))
+        bm25: Dict[int, float] = {}
+        coverage: Dict[int, float] = {}
+        total_weight = 0.0
+
+        for term in terms:
+            postings = self.__postings.get(term)
+            # Unknown terms still count against coverage, weighted like the rarest possible term
+            idf = self.__idf(len(postings[0]) if postings else 0)
+            total_weight += idf
+            if not postings:
+                continue
+            for doc_id, tf in zip(*postings):
+                norm = self.k1 * (1 - self.b + self.b * self.__lengths[doc_id] / self.__avg_length)
+                bm25[doc_id] = bm25.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                coverage[doc_id] = coverage.get(doc_id, 0.0) + idf
+
+        return bm25, coverage, total_weight
+
+    def relevance(self, query: str) -> int:
+        """
+        Scores how well the best single passage covers the query, from 0 to 100.
+
+        The score is the IDF-weighted share of query terms found in the passage that
+        contains the most of them, so rare, specific terms count more than common ones.
+        """
+        _, coverage, total_weight = self.__score(query)
+        if not coverage or total_weight <= 0:
+            return 0
+        return round(100 * max(coverage.values()) / total_weight)
+
+    def top_passages(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Returns the `k` passages ranked highest by BM25 for the query.
+
+        Returns:
+            List[Tuple[str, float]]: (passage, score) pairs, best first.
+        """
+        bm25, _, _ = self.__score(query)
+        best = heapq.nlargest(k, bm25.items(), key=lambda item: item[1])
+        return [(self.passages[doc_id], score) for doc_id, score in best]
+
+
+_shared_indexes: Dict[str, KnowledgeBaseIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_index(path: str) -> KnowledgeBaseIndex:
+    """
+    Returns the process-wide index of a knowledge base file, building it on first use.
+
+    Agents that share a knowledge base file share one index and one mapping of the file.
+    """
+    key = os.path.abspath(path) if path else ""
+    index = _shared_indexes.get(key)
+    if index is None:
+        with _shared_lock:
+            index = _shared_indexes.get(key)
+            if index is None:
+                index = _shared_indexes[key] = KnowledgeBaseIndex.from_file(path)
+    return index
@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable
+
+
+class _StageStats:
+    __slots__ = ("submitted", "started", "completed", "failed", "cancelled", "max_queue_depth", "wait", "run")
+
+    def __init__(self):
+        self.submitted = self.started = self.completed = self.failed = self.cancelled = 0
+        self.max_queue_depth = 0
+        self.wait = self.run = 0.0
+
+    @property
+    def queued(self) -> int:
+        return self.submitted - self.started - self.cancelled
+
+    def as_dict(self) -> Dict:
+        finished = self.completed + self.failed
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "queued": self.queued,
+            "running": self.started - finished,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_wait_ms": round(self.wait / self.started * 1000, 1) if self.started else 0.0,
+            "avg_run_ms": round(self.run / finished * 1000, 1) if finished else 0.0,
+        }
+
+
+class StagedExecutor:
+    """
+    One pool of worker threads shared by the stages of a pipeline.
+
+    Tasks of every stage draw from the same `max_workers` budget in submission order,
+    so a task can start as soon as its input is ready instead of waiting for the whole
+    previous stage to finish. Per stage it counts tasks submitted, queued, running and
+    finished, the deepest queue seen and the average wait and run times.
+    """
+
+    def __init__(self, max_workers: int, stages: Iterable[str] = ()):
+        """
+        Args:
+            max_workers (int): Worker threads shared by all stages.
+            stages (Iterable[str]): Stage names to report even before they get a task.
+        """
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__lock = threading.Lock()
+        self.__stages: Dict[str, _StageStats] = {stage: _StageStats() for stage in stages}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(cancel=True)
+
+    def submit(self, stage: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queues `fn(*args, **kwargs)` as a task of `stage`."""
+        queued_at = time.monotonic()
+        with self.__lock:
+            stats = self.__stages.setdefault(stage, _StageStats())
+            stats.submitted += 1
+            stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+
+        def task():
+            started_at = time.monotonic()
+            with self.__lock:
+                stats.started += 1
+                stats.wait += started_at - queued_at
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                with self.__lock:
+                    stats.run += time.monotonic() - started_at
+                    if failed:
+                        stats.failed += 1
+                    else:
+                        stats.completed += 1
+
+        future = self.__executor.submit(task)
+        future.add_done_callback(lambda f: self.__cancelled(stats) if f.cancelled() else None)
+        return future
+
+    def __cancelled(self, stats: _StageStats):
+        with self.__lock:
+            stats.cancelled += 1
+
+    def shutdown(self, cancel: bool = False):
+        """
+        Stops accepting tasks without waiting for the running ones.
+
+        Args:
+            cancel (bool): Also drop the queued tasks that have not started.
+        """
+        self.__executor.shutdown(wait=False, cancel_futures=cancel)
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            Dict[str, Dict]: Per stage: tasks submitted, completed, failed, cancelled, queued
+            and running, the deepest queue seen, and the average queue wait and run time.
+        """
+        with self.__lock:
+            return {stage: stats.as_dict() for stage, stats in self.__stages.items()}
@@ -0,0 +1,327 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import openai
+
+# Process-wide defaults; 0 disables the corresponding limit
+OPENAI_REQUESTS_PER_MINUTE = int(os.environ.get('OPENAI_REQUESTS_PER_MINUTE', '0'))
+OPENAI_TOKENS_PER_MINUTE = int(os.environ.get('OPENAI_TOKENS_PER_MINUTE', '0'))
+OPENAI_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES', '5'))
+
+
+class Priority:
+    INTERACTIVE = 0  # A user is waiting for the answer
+    BACKGROUND = 10  # Summaries, batch jobs and other work nobody is waiting on
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `per_minute` tokens per minute, holding at most one minute's worth.
+
+    Not thread-safe on its own; RequestScheduler guards it with its lock.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def __refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available, 0 if they are available now."""
+        self.__refill()
+        # A request larger than the whole bucket is admitted once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        """Takes tokens; the balance may go negative when actual usage exceeds an estimate."""
+        self.__refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        self.__refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Request:
+    __slots__ = ("priority", "sequence", "cost", "grant", "cancelled", "enqueued_at")
+
+    def __init__(self, priority: int, sequence: int, cost: int, grant: Callable[[], None]):
+        self.priority = priority
+        self.sequence = sequence
+        self.cost = cost
+        self.grant = grant
+        self.cancelled = False
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class _ModelState:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.queue = []
+        self.timer: Optional[threading.Timer] = None
+        self.stats = {"granted": 0, "retries": 0, "rate_limited": 0, "server_errors": 0, "failed": 0,
+                      "wait_seconds": 0.0, "max_queue_depth": 0}
+
+    def wait_time(self, cost: int) -> float:
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens:
+            waits.append(self.tokens.wait_time(cost))
+        return max(waits)
+
+    def consume(self, cost: int):
+        if self.requests:
+            self.requests.consume(1)
+        if self.tokens:
+            self.tokens.consume(cost)
+
+
+class RequestScheduler:
+    """
+    Admits LLM requests under per-model requests-per-minute and tokens-per-minute limits.
+
+    Each model has a request bucket and a token bucket. Waiting requests are admitted
+    in priority order (lower values first, FIFO within a priority), so interactive chat
+    overtakes queued background work. A request that fails with a 429, a 5xx or a
+    connection error is retried after a jittered exponential backoff (or the server's
+    Retry-After) and then queued again. Threads and asyncio tasks share the same queues.
+    """
+
+    RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+    def __init__(self, requests_per_minute: int = OPENAI_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = OPENAI_TOKENS_PER_MINUTE,
+                 limits: Optional[Dict[str, Tuple[int, int]]] = None, max_retries: int = OPENAI_MAX_RETRIES,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        """
+        Args:
+            requests_per_minute (int): Default request limit per model; 0 for no limit.
+            tokens_per_minute (int): Default token limit per model; 0 for no limit.
+            limits (Optional[Dict[str, Tuple[int, int]]]): (requests, tokens) per minute for specific models.
+            max_retries (int): Retries after a retryable error before it is raised.
+            base_delay (float): Backoff before the first retry, doubled on each attempt.
+            max_delay (float): Upper bound on a single backoff.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.limits = dict(limits or {})
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.__lock = threading.Lock()
+        self.__models: Dict[str, _ModelState] = {}
+        self.__sequence = itertools.count()
+
+    def __state(self, model: str) -> _ModelState:
+        """Caller holds the lock."""
+        state = self.__models.get(model)
+        if state is None:
+            requests_per_minute, tokens_per_minute = self.limits.get(
+                model, (self.requests_per_minute, self.tokens_per_minute))
+            state = self.__models[model] = _ModelState(requests_per_minute, tokens_per_minute)
+        return state
+
+    def __enqueue(self, model: str, cost: int, priority: int, grant: Callable[[], None]) -> _Request:
+        with self.__lock:
+            state = self.__state(model)
+            request = _Request(priority, next(self.__sequence), cost, grant)
+            heapq.heappush(state.queue, request)
+            state.stats["max_queue_depth"] = max(state.stats["max_queue_depth"], len(state.queue))
+            self.__dispatch(model, state)
+        return request
+
+    def __dispatch(self, model: str, state: _ModelState):
+        """Admits queued requests while the buckets allow. Caller holds the lock."""
+        while state.queue:
+            request = state.queue[0]
+            if request.cancelled:
+                heapq.heappop(state.queue)
+                continue
+            wait = state.wait_time(request.cost)
+            if wait > 0:
+                # Wake up when the head of the queue can be admitted
+                if state.timer is None:
+                    state.timer = threading.Timer(wait, self.__on_timer, args=(model,))
+                    state.timer.daemon = True
+                    state.timer.start()
+                return
+            heapq.heappop(state.queue)
+            state.consume(request.cost)
+            state.stats["granted"] += 1
+            state.stats["wait_seconds"] += time.monotonic() - request.enqueued_at
+            request.grant()
+
+    def __on_timer(self, model: str):
+        with self.__lock:
+            state = self.__models[model]
+            state.timer = None
+            self.__dispatch(model, state)
+
+    def __cancel(self, model: str, request: _Request):
+        with self.__lock:
+            request.cancelled = True
+            self.__dispatch(model, self.__models[model])
+
+    def __backoff(self, model: str, attempt: int, error: Exception) -> Optional[float]:
+        """Records a failed attempt and returns the delay before retrying, or None to give up."""
+        retryable = isinstance(error, self.RETRYABLE_ERRORS)
+        with self.__lock:
+            stats = self.__models[model].stats
+            if isinstance(error, openai.RateLimitError):
+                stats["rate_limited"] += 1
+            elif retryable:
+                stats["server_errors"] += 1
+            if not retryable or attempt >= self.max_retries:
+                stats["failed"] += 1
+                return None
+            stats["retries"] += 1
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))  # Full jitter
+        retry_after = self.__retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        self.logger.warning(f"{model} request failed ({error.__class__.__name__}), retry {attempt + 1} "
+                            f"in {delay:.2f}s")
+        return delay
+
+    @staticmethod
+    def __retry_after(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        try:
+            return float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def __settle(self, model: str, cost: int, response):
+        """Corrects the token bucket once the actual token usage of a response is known."""
+        usage = getattr(response, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", None)
+        if not isinstance(total_tokens, int):
+            return
+        with self.__lock:
+            bucket = self.__models[model].tokens
+            if bucket is None:
+                return
+            if total_tokens > cost:
+                bucket.consume(total_tokens - cost)
+            else:
+                bucket.refund(cost - total_tokens)
+
+    def run(self, model: str, call: Callable, tokens: int = 0, priority: int = Priority.INTERACTIVE):
+        """
+        Runs `call` once the model's limits admit it, retrying retryable errors.
+
+        Args:
+            model (str): Model whose limits apply.
+            call (Callable): Makes the request and returns the response.
+            tokens (int): Estimated tokens (prompt plus completion) the request will use.
+            priority (int): Queue priority; lower values are admitted first.
+
+        Returns:
+            The response returned by `call`.
+        """
+        attempt = 0
+        while True:
+            admitted = threading.Event()
+            self.__enqueue(model, tokens, priority, admitted.set)
+            admitted.wait()
+            try:
+                response = call()
+            except Exception as e:
+                delay = self.__backoff(model, attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.__settle(model, tokens, response)
+            return response
+
+    async def run_async(self, model: str, call: Callable, tokens: int = 0, priority: int = Priority.INTERACTIVE):
+        """
+        Asyncio variant of `run`; `call` returns an awaitable and waiting never blocks the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            admitted = loop.create_future()
+
+            def grant(future=admitted):
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+            request = self.__enqueue(model, tokens, priority, grant)
+            try:
+                await admitted
+            except asyncio.CancelledError:
+                self.__cancel(model, request)
+                raise
+            try:
+                response = await call()
+            except Exception as e:
+                delay = self.__backoff(model, attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.__settle(model, tokens, response)
+            return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Reports queue depth and counters per model.
+
+        Returns:
+            Dict[str, Dict[str, float]]: For each model, the current `queue_depth` (also split
+            into `interactive` and `background`), admitted requests, retries, 429s, server
+            errors, failures, the average queue wait and the peak queue depth.
+        """
+        report = {}
+        with self.__lock:
+            for model, state in self.__models.items():
+                waiting = [request for request in state.queue if not request.cancelled]
+                stats = dict(state.stats)
+                stats["queue_depth"] = len(waiting)
+                stats["interactive"] = sum(1 for request in waiting if request.priority <= Priority.INTERACTIVE)
+                stats["background"] = stats["queue_depth"] - stats["interactive"]
+                wait_seconds = stats.pop("wait_seconds")
+                stats["avg_wait_ms"] = 1000 * wait_seconds / stats["granted"] if stats["granted"] else 0.0
+                report[model] = stats
+        return report
+
+
+_default_scheduler: Optional[RequestScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Returns the process-wide scheduler shared by every agent, configured from OPENAI_* variables."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+        return _default_scheduler
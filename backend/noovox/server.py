@@ -1,5 +1,7 @@
+import atexit
 import os
 import sys
+from urllib.parse import urlencode
 
 # Define paths
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -7,16 +9,34 @@ project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_swagger_ui import get_swaggerui_blueprint
 import mysql.connector
 import os
+from backend.noovox.db import PoolTimeoutError, create_mysql_pool
+from backend.noovox.write_behind import BufferFullError, WriteBehindBuffer
 
 app = Flask(__name__)
 MYSQL_HOST = os.environ.get('MYSQL_HOST', 'localhost')
 MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
 MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', 'password')
 MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'noovox')
+MYSQL_POOL_SIZE = int(os.environ.get('MYSQL_POOL_SIZE', '10'))
+MYSQL_POOL_TIMEOUT = float(os.environ.get('MYSQL_POOL_TIMEOUT', '5'))
+MYSQL_POOL_IDLE_TIMEOUT = float(os.environ.get('MYSQL_POOL_IDLE_TIMEOUT', '300'))
+MYSQL_POOL_MAX_LIFETIME = float(os.environ.get('MYSQL_POOL_MAX_LIFETIME', '3600'))
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+MAX_BULK_ITEMS = 1000
+
+SENDER_TYPES = ('user', 'system', 'assistant')
+CONTENT_TYPES = ('view', 'like', 'analysis')
+
+TRACKING_BUFFER_SIZE = int(os.environ.get('TRACKING_BUFFER_SIZE', '10000'))
+TRACKING_BATCH_SIZE = int(os.environ.get('TRACKING_BATCH_SIZE', '500'))
+TRACKING_FLUSH_INTERVAL = float(os.environ.get('TRACKING_FLUSH_INTERVAL', '1'))
 
 swagger_url = '/swagger'
 swagger_ui_blueprint = get_swaggerui_blueprint(
@@ -27,46 +47,264 @@ swagger_ui_blueprint = get_swaggerui_blueprint(
 app.register_blueprint(swagger_ui_blueprint, url_prefix=swagger_url)
 
 
+db_pool = create_mysql_pool(
+    host=MYSQL_HOST,
+    user=MYSQL_USER,
+    password=MYSQL_PASSWORD,
+    database=MYSQL_DATABASE,
+    max_size=MYSQL_POOL_SIZE,
+    checkout_timeout=MYSQL_POOL_TIMEOUT,
+    idle_timeout=MYSQL_POOL_IDLE_TIMEOUT,
+    max_lifetime=MYSQL_POOL_MAX_LIFETIME,
+    reap_interval=MYSQL_POOL_IDLE_TIMEOUT / 2
+)
+
+
 def get_db_connection():
-    return mysql.connector.connect(
-        host=MYSQL_HOST,
-        user=MYSQL_USER,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE
-    )
+    """Check out a pooled connection; use as a context manager so it is returned to the pool."""
+    return db_pool.connection()
+
+
+@app.errorhandler(PoolTimeoutError)
+def handle_pool_timeout(error):
+    return jsonify({'error': 'Database is busy, please retry'}), 503
+
+
+def flush_tracking_events(rows):
+    # Rows the database refuses are dropped on their own; retrying them would fail the same way
+    with get_db_connection() as conn:
+        rejected = insert_rows(conn, "INSERT INTO content_tracking (user_id, content_type, content_id) "
+                                     "VALUES (%s, %s, %s)", dict(enumerate(rows)))
+    for index, error in rejected.items():
+        app.logger.warning(f"Dropping tracking event {rows[index]}: {error}")
+
+
+tracking_buffer = WriteBehindBuffer(
+    flush_tracking_events,
+    max_size=TRACKING_BUFFER_SIZE,
+    batch_size=TRACKING_BATCH_SIZE,
+    flush_interval=TRACKING_FLUSH_INTERVAL,
+    name="content-tracking-writer"
+)
+atexit.register(tracking_buffer.close)
+
+
+@app.errorhandler(BufferFullError)
+def handle_buffer_full(error):
+    return jsonify({'error': 'Too many pending tracking events, please retry'}), 503, {'Retry-After': '1'}
+
+
+@app.route('/api/db/pool', methods=['GET'])
+def get_db_pool_stats():
+    return jsonify(db_pool.stats())
+
+
+def int_arg(args, name, default=None, minimum=0):
+    """Reads an integer query parameter, raising values below `minimum` to it; ValueError if not an integer."""
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer") from None
+
+
+def list_rows(query, key, params=()):
+    """
+    Serve a list endpoint with keyset pagination, or as a streamed NDJSON body.
+
+    `query` must end with a `WHERE` condition so `{key} > %s` can be appended.
+    Paged responses hold at most `limit` rows (clamped to 1..MAX_PAGE_SIZE) and
+    advertise the next page through the `X-Next-Cursor` and `Link` headers; a
+    non-integer `after_id` or `limit` is answered with 400. With `?format=ndjson` (or an
+    `Accept: application/x-ndjson` header) rows are written to the socket as the
+    unbuffered cursor yields them, so memory stays flat regardless of table size.
+    """
+    try:
+        after_id = int_arg(request.args, 'after_id', default=0)
+        limit = int_arg(request.args, 'limit', minimum=1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    sql = f"{query} AND {key} > %s ORDER BY {key}"
+    params = tuple(params) + (after_id,)
+
+    if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+        if limit is not None:
+            sql += " LIMIT %s"
+            params += (limit,)
+        return stream_rows(sql, params)
+
+    limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql + " LIMIT %s", params + (limit + 1,))
+        rows = cursor.fetchall()
+        cursor.close()
+
+    response = jsonify(rows[:limit])
+    if len(rows) > limit:
+        next_cursor = rows[limit - 1][key]
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+        query_args = request.args.to_dict(flat=False)
+        query_args.update(after_id=[str(next_cursor)], limit=[str(limit)])
+        next_url = request.base_url + '?' + urlencode(query_args, doseq=True)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+def stream_rows(sql, params):
+    """Stream query results as NDJSON, fetching from the server-side cursor in batches."""
+    # Execute before streaming starts so pool and query errors still produce a normal error response
+    pooled = db_pool.acquire()
+    try:
+        cursor = pooled.raw.cursor(dictionary=True, buffered=False)
+        cursor.execute(sql, params)
+    except Exception:
+        db_pool.release(pooled, discard=True)
+        raise
+
+    released = []
+
+    def release(discard):
+        if not released:
+            released.append(True)
+            db_pool.release(pooled, discard=discard)
+
+    def generate():
+        exhausted = False
+        try:
+            while True:
+                rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not rows:
+                    break
+                yield ''.join(app.json.dumps(row) + '\n' for row in rows)
+            exhausted = True
+            cursor.close()
+        finally:
+            # A client that disconnects mid-stream leaves unread rows on the connection, so drop it
+            release(discard=not exhausted)
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    # Covers responses that are closed before the body is ever iterated
+    response.call_on_close(lambda: release(discard=True))
+    return response
+
+
+def bulk_insert(sql, items, to_row):
+    """
+    Validate a batch of items and insert the valid ones in a single transaction.
+
+    `to_row` turns an item into the row tuple for `sql`, raising ValueError for invalid items.
+    The valid rows go in with one `executemany`; if the database rejects one of them (a
+    duplicate key, a missing foreign row, a value out of range) they are inserted one by one
+    in the same transaction instead, so each item's result says whether it was stored.
+    Returns a JSON response with a per-item result: 201 when every item was created,
+    207 when some were rejected, and 400 when none were. If the database fails otherwise,
+    nothing is inserted and the response is a 503 with the error.
+    """
+    if not isinstance(items, list):
+        return jsonify({'error': 'Request body must be a JSON array'}), 400
+    if len(items) > MAX_BULK_ITEMS:
+        return jsonify({'error': f'At most {MAX_BULK_ITEMS} items per request'}), 413
+
+    results = []
+    rows = {}
+    for index, item in enumerate(items):
+        try:
+            rows[index] = to_row(item)
+            results.append({'index': index, 'status': 'created'})
+        except (ValueError, TypeError, KeyError) as e:
+            results.append({'index': index, 'status': 'error', 'error': str(e)})
+
+    if rows:
+        try:
+            with get_db_connection() as conn:
+                rejected = insert_rows(conn, sql, rows)
+        except mysql.connector.Error as e:
+            return jsonify({'error': f'Database error, no items were inserted: {e.msg}'}), 503
+        for index, error in rejected.items():
+            results[index] = {'index': index, 'status': 'error', 'error': error}
+
+    created = sum(result['status'] == 'created' for result in results)
+    body = {'created': created, 'failed': len(items) - created, 'results': results}
+    if created == len(items):
+        return jsonify(body), 201
+    return jsonify(body), 207 if created else 400
+
+
+def insert_rows(conn, sql, rows):
+    """
+    Inserts rows (keyed by item index) and commits, returning the database error of each row it refused.
+
+    Only errors caused by a row's data are caught; anything else propagates and the caller's
+    connection block rolls the transaction back.
+    """
+    cursor = conn.cursor()
+    rejected = {}
+    try:
+        cursor.executemany(sql, list(rows.values()))
+    except (mysql.connector.IntegrityError, mysql.connector.DataError):
+        conn.rollback()
+        for index, row in rows.items():
+            try:
+                cursor.execute(sql, row)
+            except (mysql.connector.IntegrityError, mysql.connector.DataError) as e:
+                # MySQL undoes just the failed statement, so the rest of the transaction stands
+                rejected[index] = e.msg
+    conn.commit()
+    cursor.close()
+    return rejected
+
+
+def require_int(item, field):
+    value = item[field] if isinstance(item, dict) and field in item else None
+    # Numeric strings were always stored by MySQL, so keep accepting them
+    if isinstance(value, str):
+        try:
+            value = int(value)
+        except ValueError:
+            pass
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"'{field}' must be an integer")
+    return value
+
+
+def require_choice(item, field, choices):
+    value = item.get(field) if isinstance(item, dict) else None
+    if value not in choices:
+        raise ValueError(f"'{field}' must be one of {', '.join(choices)}")
+    return value
+
+
+def content_tracking_row(item):
+    return (require_int(item, 'user_id'), require_choice(item, 'content_type', CONTENT_TYPES),
+            require_int(item, 'content_id'))
 
 
 @app.route('/api/users', methods=['GET'])
 def get_users():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users")
-    users = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return jsonify(users)
+    return list_rows("SELECT * FROM users WHERE TRUE", 'user_id')
 
 
 @app.route('/api/users', methods=['POST'])
 def create_user():
     data = request.json
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO users (username, email) VALUES (%s, %s)", (data['username'], data['email']))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO users (username, email) VALUES (%s, %s)", (data['username'], data['email']))
+        conn.commit()
+        cursor.close()
     return jsonify(data), 201
 
 
 @app.route('/api/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
-    user = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
+        user = cursor.fetchone()
+        cursor.close()
     if user:
         return jsonify(user)
     return jsonify({'error': 'User not found'}), 404
@@ -75,58 +313,48 @@ def get_user(user_id):
 @app.route('/api/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
     data = request.json
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET username = %s, email = %s WHERE user_id = %s",
-                   (data['username'], data['email'], user_id))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET username = %s, email = %s WHERE user_id = %s",
+                       (data['username'], data['email'], user_id))
+        conn.commit()
+        cursor.close()
     return jsonify(data)
 
 
 @app.route('/api/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+        conn.commit()
+        cursor.close()
     return '', 204
 
 
 @app.route('/api/chats', methods=['GET'])
 def get_chats():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM chats")
-    chats = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return jsonify(chats)
+    return list_rows("SELECT * FROM chats WHERE TRUE", 'chat_id')
 
 
 @app.route('/api/chats', methods=['POST'])
 def create_chat():
     data = request.json
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO chats (user_id) VALUES (%s)", (data['user_id'],))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO chats (user_id) VALUES (%s)", (data['user_id'],))
+        conn.commit()
+        cursor.close()
     return jsonify(data), 201
 
 
 @app.route('/api/chats/<int:chat_id>', methods=['GET'])
 def get_chat(chat_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM chats WHERE chat_id = %s", (chat_id,))
-    chat = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM chats WHERE chat_id = %s", (chat_id,))
+        chat = cursor.fetchone()
+        cursor.close()
     if chat:
         return jsonify(chat)
     return jsonify({'error': 'Chat not found'}), 404
@@ -134,61 +362,73 @@ def get_chat(chat_id):
 
 @app.route('/api/chats/<int:chat_id>', methods=['DELETE'])
 def delete_chat(chat_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM chats WHERE chat_id = %s", (chat_id,))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM chats WHERE chat_id = %s", (chat_id,))
+        conn.commit()
+        cursor.close()
     return '', 204
 
 
 @app.route('/api/chats/<int:chat_id>/messages', methods=['GET'])
 def get_chat_messages(chat_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM chat_messages WHERE chat_id = %s", (chat_id,))
-    messages = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return jsonify(messages)
+    return list_rows("SELECT * FROM chat_messages WHERE chat_id = %s", 'message_id', (chat_id,))
 
 
 @app.route('/api/chats/<int:chat_id>/messages', methods=['POST'])
 def send_chat_message(chat_id):
     data = request.json
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO chat_messages (chat_id, user_id, sender_type, message_text) VALUES (%s, %s, %s, %s)",
-                   (chat_id, data['user_id'], data['sender_type'], data['message_text']))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO chat_messages (chat_id, user_id, sender_type, message_text) VALUES (%s, %s, %s, %s)",
+                       (chat_id, data['user_id'], data['sender_type'], data['message_text']))
+        conn.commit()
+        cursor.close()
     return jsonify(data), 201
 
 
+@app.route('/api/chats/<int:chat_id>/messages/batch', methods=['POST'])
+def send_chat_messages(chat_id):
+    def to_row(item):
+        message_text = item.get('message_text') if isinstance(item, dict) else None
+        if not isinstance(message_text, str) or not message_text:
+            raise ValueError("'message_text' must be a non-empty string")
+        return chat_id, require_int(item, 'user_id'), require_choice(item, 'sender_type', SENDER_TYPES), message_text
+
+    return bulk_insert(
+        "INSERT INTO chat_messages (chat_id, user_id, sender_type, message_text) VALUES (%s, %s, %s, %s)",
+        request.json, to_row
+    )
+
+
 @app.route('/api/content_tracking', methods=['GET'])
 def get_content_tracking():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM content_tracking")
-    tracking_records = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return jsonify(tracking_records)
+    return list_rows("SELECT * FROM content_tracking WHERE TRUE", 'tracking_id')
 
 
 @app.route('/api/content_tracking', methods=['POST'])
 def track_content():
     data = request.json
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO content_tracking (user_id, content_type, content_id) VALUES (%s, %s, %s)",
-                   (data['user_id'], data['content_type'], data['content_id']))
-    conn.commit()
-    cursor.close()
-    conn.close()
-    return jsonify(data), 201
+    try:
+        row = content_tracking_row(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    # Tracking is fire-and-forget: the event is written by the buffer's flush thread
+    tracking_buffer.submit(row)
+    return jsonify(data), 202
+
+
+@app.route('/api/content_tracking/buffer', methods=['GET'])
+def get_content_tracking_buffer_stats():
+    return jsonify(tracking_buffer.stats())
+
+
+@app.route('/api/content_tracking/batch', methods=['POST'])
+def track_content_batch():
+    return bulk_insert(
+        "INSERT INTO content_tracking (user_id, content_type, content_id) VALUES (%s, %s, %s)",
+        request.json, content_tracking_row
+    )
 
 
 @app.route("/")
@@ -0,0 +1,200 @@
+import itertools
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class StoredMessage(NamedTuple):
+    id: int
+    role: str
+    content: str
+
+
+class SessionSnapshot(NamedTuple):
+    """
+    What a store returns for a session.
+
+    Attributes:
+        summary (str): The latest rolling summary, empty if there is none.
+        summary_through (int): Id of the last message folded into the summary, 0 if none.
+        messages (List[StoredMessage]): Messages after the summary, oldest first.
+    """
+    summary: str
+    summary_through: int
+    messages: List[StoredMessage]
+
+
+class SessionStore(ABC):
+    """
+    Append-only storage for agent conversation history, keyed by session id.
+
+    Messages get increasing ids when they are appended and are never rewritten. Older
+    turns are not deleted when they are folded into a summary; the summary is saved
+    with the id of the last message it covers, and later loads start after that id.
+    Subclasses must implement the three methods below before they can be created.
+    """
+
+    @abstractmethod
+    def append(self, session_id, role: str, content: str) -> int:
+        """Stores a message and returns its id."""
+
+    @abstractmethod
+    def save_summary(self, session_id, summary: str, through: int):
+        """Stores the summary covering every message up to and including id `through`."""
+
+    @abstractmethod
+    def load(self, session_id, after: int = 0, limit: Optional[int] = None) -> SessionSnapshot:
+        """
+        Loads the latest summary and the messages newer than both it and `after`.
+
+        Args:
+            session_id: The session (chat) to load.
+            after (int): Only messages with a larger id are returned.
+            limit (Optional[int]): Return only the newest `limit` of those messages.
+        """
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store, for tests and single-process deployments."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__ids = itertools.count(1)
+        self.__messages: Dict[object, List[StoredMessage]] = defaultdict(list)
+        self.__summaries: Dict[object, Tuple[str, int]] = {}
+
+    def append(self, session_id, role: str, content: str) -> int:
+        with self.__lock:
+            message = StoredMessage(next(self.__ids), role, content)
+            self.__messages[session_id].append(message)
+            return message.id
+
+    def save_summary(self, session_id, summary: str, through: int):
+        with self.__lock:
+            if through >= self.__summaries.get(session_id, ("", 0))[1]:
+                self.__summaries[session_id] = (summary, through)
+
+    def load(self, session_id, after: int = 0, limit: Optional[int] = None) -> SessionSnapshot:
+        with self.__lock:
+            summary, through = self.__summaries.get(session_id, ("", 0))
+            after = max(after, through)
+            messages = [message for message in self.__messages.get(session_id, []) if message.id > after]
+        if limit is not None:
+            messages = messages[-limit:] if limit else []
+        return SessionSnapshot(summary, through, messages)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store in a SQLite file, shared by the worker processes of one host.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.__db.execute("PRAGMA journal_mode=WAL")  # readers do not block the writing worker
+        self.__db.executescript("""
+            CREATE TABLE IF NOT EXISTS session_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS session_messages_session ON session_messages (session_id, id);
+            CREATE TABLE IF NOT EXISTS session_summaries (
+                session_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                through INTEGER NOT NULL
+            );
+        """)
+
+    def append(self, session_id, role: str, content: str) -> int:
+        with self.__lock, self.__db:
+            cursor = self.__db.execute("INSERT INTO session_messages (session_id, role, content) VALUES (?, ?, ?)",
+                                       (str(session_id), role, content))
+            return cursor.lastrowid
+
+    def save_summary(self, session_id, summary: str, through: int):
+        with self.__lock, self.__db:
+            self.__db.execute("INSERT INTO session_summaries (session_id, summary, through) VALUES (?, ?, ?) "
+                              "ON CONFLICT (session_id) DO UPDATE SET summary = excluded.summary, "
+                              "through = excluded.through WHERE excluded.through >= session_summaries.through",
+                              (str(session_id), summary, through))
+
+    def load(self, session_id, after: int = 0, limit: Optional[int] = None) -> SessionSnapshot:
+        session_id = str(session_id)
+        with self.__lock:
+            row = self.__db.execute("SELECT summary, through FROM session_summaries WHERE session_id = ?",
+                                    (session_id,)).fetchone()
+            summary, through = row if row else ("", 0)
+            rows = self.__db.execute("SELECT id, role, content FROM session_messages "
+                                     "WHERE session_id = ? AND id > ? ORDER BY id DESC LIMIT ?",
+                                     (session_id, max(after, through), -1 if limit is None else limit)).fetchall()
+        return SessionSnapshot(summary, through, [StoredMessage(*row) for row in reversed(rows)])
+
+
+class MySQLSessionStore(SessionStore):
+    """
+    Store on the `chat_messages` table, so any API worker can serve any chat.
+
+    Session ids are chat ids. Messages are appended with the user of the chat they belong
+    to; summaries live in `chat_summaries`. Requires MySQL 8.0.19 or later, for the
+    row alias in the summary upsert.
+    """
+
+    def __init__(self, pool):
+        """
+        Args:
+            pool (ConnectionPool): The pool from `noovox.db` used for every query.
+        """
+        self.pool = pool
+
+    def append(self, session_id, role: str, content: str) -> int:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO chat_messages (chat_id, user_id, sender_type, message_text) "
+                           "SELECT chat_id, user_id, %s, %s FROM chats WHERE chat_id = %s",
+                           (role, content, session_id))
+            if cursor.rowcount != 1:
+                cursor.close()
+                raise KeyError(f"Chat {session_id} does not exist")
+            message_id = cursor.lastrowid
+            conn.commit()
+            cursor.close()
+        return message_id
+
+    def save_summary(self, session_id, summary: str, through: int):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO chat_summaries (chat_id, summary_text, through_message_id) "
+                           "VALUES (%s, %s, %s) AS new ON DUPLICATE KEY UPDATE "
+                           "summary_text = IF(new.through_message_id >= chat_summaries.through_message_id, "
+                           "new.summary_text, chat_summaries.summary_text), "
+                           "through_message_id = GREATEST(chat_summaries.through_message_id, new.through_message_id)",
+                           (session_id, summary, through))
+            conn.commit()
+            cursor.close()
+
+    def load(self, session_id, after: int = 0, limit: Optional[int] = None) -> SessionSnapshot:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT summary_text, through_message_id FROM chat_summaries WHERE chat_id = %s",
+                           (session_id,))
+            row = cursor.fetchone()
+            summary, through = row if row else ("", 0)
+
+            query = ("SELECT message_id, sender_type, message_text FROM chat_messages "
+                     "WHERE chat_id = %s AND message_id > %s ORDER BY message_id DESC")
+            params = [session_id, max(after, through)]
+            if limit is not None:
+                query += " LIMIT %s"
+                params.append(limit)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            # End the read's transaction, so the connection's next use sees newer messages
+            conn.rollback()
+        return SessionSnapshot(summary, through, [StoredMessage(*row) for row in reversed(rows)])
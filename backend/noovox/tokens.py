@@ -0,0 +1,35 @@
+import logging
+from functools import lru_cache
+
+from backend.constants import General
+
+# Rough average for English text with OpenAI tokenizers, used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    # Optional: exact counts when tiktoken is available
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken downloads its vocabularies on first use, which fails offline
+        logging.warning(f"Falling back to estimated token counts: {str(e)}")
+        return None
+
+
+def count_tokens(text, model=General.DEFAULT_MODEL):
+    """Count the tokens in a string, estimating from its length if tiktoken is unavailable."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return max(1, -(-len(text) // CHARS_PER_TOKEN))
+    return len(encoding.encode(text))
@@ -0,0 +1,189 @@
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class BufferFullError(Exception):
+    """Raised when the write-behind buffer cannot accept another item in time."""
+
+
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    """
+    An in-process write-behind queue that persists items in batches on a background thread.
+
+    Items are accepted immediately by `submit` and handed to `flush` in batches of up
+    to `batch_size`, or after `flush_interval` seconds, whichever comes first. When
+    `max_size` items are waiting, `submit` blocks for at most `submit_timeout` seconds
+    and then raises BufferFullError so callers can shed load; blocked callers wait
+    their turn behind one another. `close` stops intake and drains everything still
+    queued before returning.
+    """
+
+    def __init__(self, flush: Callable[[List[object]], None], max_size: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0, submit_timeout: float = 0.0, max_retries: int = 3,
+                 name: str = "write-behind"):
+        """
+        Initializes the buffer and starts its flush thread.
+
+        Args:
+            flush (Callable[[List[object]], None]): Persists one batch; raising triggers a retry.
+            max_size (int): Maximum number of items waiting to be flushed.
+            batch_size (int): Maximum number of items per flush.
+            flush_interval (float): Seconds the oldest waiting item may wait before a flush.
+            submit_timeout (float): Seconds `submit` waits for room before raising BufferFullError.
+            max_retries (int): Flush attempts after the first before a batch is dropped.
+            name (str): Name of the flush thread, used in logs.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.__flush = flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.submit_timeout = submit_timeout
+        self.max_retries = max_retries
+
+        self.__queue = queue.Queue(maxsize=max_size)
+        self.__lock = threading.Lock()
+        # Held across the closed check and the put, so nothing is queued after `close`
+        self.__intake = threading.Lock()
+        self.__closed = False
+        self.__stopping = threading.Event()
+
+        # Metrics
+        self.__accepted = 0
+        self.__rejected = 0
+        self.__flushed = 0
+        self.__dropped = 0
+        self.__batches = 0
+
+        self.__worker = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__worker.start()
+
+    def submit(self, item: object, timeout: Optional[float] = None):
+        """
+        Queues an item to be written in a later batch.
+
+        Args:
+            item (object): The item passed to `flush`.
+            timeout (Optional[float]): Overrides `submit_timeout` for this call.
+
+        Raises:
+            BufferFullError: If the buffer is full or closed.
+        """
+        timeout = self.submit_timeout if timeout is None else timeout
+        try:
+            with self.__intake:
+                if self.__closed:
+                    raise BufferFullError("Write-behind buffer is closed")
+                if timeout > 0:
+                    self.__queue.put(item, timeout=timeout)
+                else:
+                    self.__queue.put_nowait(item)
+        except queue.Full:
+            with self.__lock:
+                self.__rejected += 1
+            raise BufferFullError(f"Write-behind buffer is full ({self.__queue.maxsize} items waiting)")
+
+        with self.__lock:
+            self.__accepted += 1
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stops accepting items and waits for everything already queued to be flushed.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait for the drain.
+        """
+        with self.__intake:
+            if self.__closed:
+                return
+            self.__closed = True
+        self.__stopping.set()
+        try:
+            # Wakes the flush thread if it is waiting for items
+            self.__queue.put_nowait(_STOP)
+        except queue.Full:
+            pass  # It is busy with the backlog and sees the stop flag after the current batch
+        self.__worker.join(timeout)
+        if self.__worker.is_alive():
+            self.logger.warning(f"Write-behind buffer did not drain within {timeout}s")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Reports queue depth and throughput counters.
+
+        Returns:
+            Dict[str, int]: Items waiting, accepted, rejected, flushed and dropped, and batches written.
+        """
+        with self.__lock:
+            return {
+                "pending": self.__queue.qsize(),
+                "capacity": self.__queue.maxsize,
+                "accepted": self.__accepted,
+                "rejected": self.__rejected,
+                "flushed": self.__flushed,
+                "dropped": self.__dropped,
+                "batches": self.__batches,
+            }
+
+    def __run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self.__queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self.__stopping.is_set():
+                    break
+                continue
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.__queue.get(timeout=remaining) if remaining > 0 else self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self.__write(batch)
+            stopping = stopping or self.__stopping.is_set()
+
+        # Drain anything that was queued alongside the stop sentinel
+        remaining = []
+        while True:
+            try:
+                item = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            self.__write(remaining[start:start + self.batch_size])
+
+    def __write(self, batch: List[object]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.__flush(batch)
+                with self.__lock:
+                    self.__flushed += len(batch)
+                    self.__batches += 1
+                return
+            except Exception as e:
+                if attempt < self.max_retries:
+                    self.logger.warning(f"Flush of {len(batch)} items failed ({attempt + 1}/{self.max_retries}): "
+                                        f"{str(e)}")
+                    time.sleep(min(2 ** attempt * 0.1, 5))
+                else:
+                    self.logger.error(f"Dropping {len(batch)} items after {self.max_retries} retries: {str(e)}")
+                    with self.__lock:
+                        self.__dropped += len(batch)
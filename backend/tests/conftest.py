@@ -1,8 +1,231 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
 import pytest
-from app.main import app
+from backend.noovox.asgi_server import app, get_chat_agent
 from fastapi.testclient import TestClient
 
 
+class EchoAgent:
+    """Stands in for the OpenAI-backed chat agent so tests run offline."""
+
+    async def ask_openai_async(self, prompt, temperature=0.2, session_id=None, stateless=False):
+        return f"echo: {prompt}"
+
+    async def stream_openai_async(self, prompt, temperature=0.2, session_id=None, stateless=False):
+        for word in f"echo: {prompt}".split(" "):
+            yield word + " "
+
+
 @pytest.fixture
 def client():
-    return TestClient(app)
+    app.dependency_overrides[get_chat_agent] = EchoAgent
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """
+    Minimal OpenAI-compatible chat completions endpoint.
+
+    Replies with `reply` (streamed word by word when the request asks for a stream),
+    or with `reply(body)` if it is callable, and records every request body in
+    `requests`. While `failures` holds status codes, each request pops one and fails
+    with that status instead.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeOpenAIHandler)
+        self.reply = "Hello from the fake model"
+        self.requests = []
+        self.failures = []
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        reply = self.server.reply(body) if callable(self.server.reply) else self.server.reply
+
+        if self.server.failures:
+            payload = json.dumps({"error": {"message": "Simulated failure", "type": "server_error"}}).encode()
+            self.send_response(self.server.failures.pop(0))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            words = reply.split(" ")
+            for i, word in enumerate(words):
+                delta = word if i == len(words) - 1 else word + " "
+                chunk = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0,
+                         "model": body["model"],
+                         "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        payload = json.dumps({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": reply}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def fake_openai():
+    server = FakeOpenAIServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class HTTPStub(ThreadingHTTPServer):
+    """
+    Local keep-alive web server standing in for news sites in scraper tests.
+
+    Serves `pages` (path -> HTML, 404 for anything else) after `delay` seconds, or after
+    `delays[path]` for the paths listed there, adding any `headers[path]` to the response.
+    A request whose If-None-Match equals that ETag gets a 304. While `statuses` holds
+    status codes, each request pops one and is answered with it instead. Requested paths
+    are recorded in `hits`, client ports (one per TCP connection) in `connections`, and
+    the most concurrent requests in `peak_in_flight`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), HTTPStubHandler)
+        self.pages = {}
+        self.statuses = []
+        self.delay = 0.0
+        self.delays = {}
+        self.headers = {}
+        self.hits = []
+        self.connections = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class HTTPStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        path = urlparse(self.path).path
+        with server.lock:
+            server.hits.append(path)
+            server.connections.add(self.client_address[1])
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            status = server.statuses.pop(0) if server.statuses else None
+        try:
+            time.sleep(server.delays.get(path, server.delay))
+            extra_headers = server.headers.get(path, {})
+            if status is None:
+                status = 200 if path in server.pages else 404
+                if status == 200 and self.headers.get("If-None-Match") == extra_headers.get("ETag", object()):
+                    status = 304
+            body = server.pages.get(path, "").encode() if status == 200 else b"" if status == 304 else b"error"
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in extra_headers.items():
+                self.send_header(name, value)
+            if status in (429, 503) and "Retry-After" not in extra_headers:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+@pytest.fixture
+def http_stub():
+    server = HTTPStub()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def searcher(tmp_path, monkeypatch):
+    """A NoovoxSearcher with its own caches that retries without backoff and logs in a temporary directory."""
+    from backend.noovox.core import NoovoxSearcher
+    from backend.noovox.article_store import ArticleStore
+    from backend.noovox.http_cache import HTTPCache
+    from backend.noovox.http_session import build_session
+
+    monkeypatch.chdir(tmp_path)  # NoovoxSearcher logs to news_scraper.log in the working directory
+    searcher = NoovoxSearcher()
+    searcher.session = build_session(backoff_factor=0)
+    searcher.http_cache = HTTPCache()
+    searcher.article_store = ArticleStore()
+    return searcher
+
+
+@pytest.fixture
+def news_site(http_stub, searcher):
+    """
+    Points `searcher` at two stub sources listing articles about inflation.
+
+    Each source lists four inflation articles of its own, one shared with the other
+    source and one football article that filtering drops. Every listed article has a
+    page with a substantial paragraph, so a search yields nine enriched articles.
+    """
+    sources = []
+    for name in ("a", "b"):
+        items = [(f"/{name}/articles/{i}", f"Inflation update {name}{i}") for i in range(4)]
+        items.append(("/shared/article", "Inflation explained"))
+        items.append((f"/{name}/articles/football", "Football results"))
+        http_stub.pages[f"/{name}/search"] = "<html><body>" + "".join(
+            f'<article><h2>{title}</h2><a href="{http_stub.url}{path}">Read</a><p>{title} summary</p></article>'
+            for path, title in items) + "</body></html>"
+        for path, title in items:
+            http_stub.pages[path] = (f"<html><body><nav>Menu</nav><article><h1>{title}</h1>"
+                                     f"<p>{title}: prices rose again this month according to the latest figures.</p>"
+                                     f'<img src="/img/{name}.png"></article></body></html>')
+        sources.append(searcher.ContentSource(name=f"Source {name.upper()}",
+                                              url=f"{http_stub.url}/{name}/search?q={{query}}",
+                                              type='search', category='general'))
+    searcher.sources = {'general': sources}
+    return http_stub
@@ -0,0 +1,38 @@
+import asyncio
+
+from backend.noovox.core import BaseAgent
+
+
+def make_agent(fake_openai):
+    return BaseAgent("Tester", "testing", "", api_key="test-key", base_url=fake_openai.base_url)
+
+
+def test_stream_openai_yields_deltas_and_records_history(fake_openai):
+    agent = make_agent(fake_openai)
+    deltas = list(agent.stream_openai("hi"))
+    assert len(deltas) > 1
+    assert "".join(deltas) == fake_openai.reply
+
+    agent.ask_openai("again")
+    history = fake_openai.requests[-1]["messages"]
+    assert history[-2] == {"role": "assistant", "content": fake_openai.reply}
+
+
+def test_stream_openai_async(fake_openai):
+    agent = make_agent(fake_openai)
+
+    async def collect():
+        return [delta async for delta in agent.stream_openai_async("hi")]
+
+    assert "".join(asyncio.run(collect())) == fake_openai.reply
+    assert fake_openai.requests[0]["stream"] is True
+
+
+def test_chat_stream_endpoint_sends_events(client):
+    response = client.post("/chat/stream", json={"message": "test"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in response.text.split("\n\n") if e]
+    assert events[0].startswith("data: ")
+    assert events[-1].startswith("event: done")
+    assert '"response": "echo: test "' in events[-1]
@@ -0,0 +1,72 @@
+import sqlite3
+
+from backend.noovox.article_store import ArticleStore, normalize_article_url
+
+
+def article(url, text="Prices rose again this month. " * 20):
+    return {"title": "Inflation", "url": url, "full_text": text, "text_length": len(text),
+            "images": ["https://example.com/a.png"]}
+
+
+def test_normalize_article_url():
+    assert normalize_article_url("HTTPS://News.Example.com:443/world/story/?utm_source=x&b=2&a=1#comments") == \
+        "https://news.example.com/world/story?a=1&b=2"
+    assert normalize_article_url("http://example.com:8080") == "http://example.com:8080/"
+    assert normalize_article_url("https://example.com/a?id=1") != normalize_article_url("https://example.com/a?id=2")
+
+
+def test_articles_are_stored_compressed_and_survive_restarts(tmp_path):
+    path = str(tmp_path / "articles.db")
+    ArticleStore(path).put(article("https://example.com/story?fbclid=abc"))
+
+    store = ArticleStore(path)
+    stored = store.get("https://EXAMPLE.com/story/")
+    assert stored.full_text == article("x")["full_text"]
+    assert (stored.text_length, stored.images) == (600, ["https://example.com/a.png"])
+    assert store.stats() == {"hits": 1, "misses": 0, "expired": 0, "stored": 0, "evicted": 0,
+                             "articles": 1}
+
+    blob = sqlite3.connect(path).execute("SELECT full_text FROM articles").fetchone()[0]
+    assert len(blob) < stored.text_length / 4
+
+
+def test_expired_articles_are_refreshed():
+    store = ArticleStore(ttl=0)
+    store.put(article("https://example.com/story"))
+    assert store.get("https://example.com/story") is None
+    assert store.stats()["expired"] == 1
+    assert store.purge() == 1
+
+
+def test_store_is_purged_and_bounded_as_articles_are_written():
+    store = ArticleStore(max_articles=3, purge_every=5)
+    for i in range(10):
+        store.put(article(f"https://example.com/story/{i}"))
+    assert store.stats()["articles"] == 3
+    assert store.stats()["evicted"] == 7
+    assert [store.get(f"https://example.com/story/{i}") is not None for i in (6, 7, 8, 9)] == [False, True, True, True]
+
+    expiring = ArticleStore(ttl=0, purge_every=2)
+    expiring.put(article("https://example.com/a"))
+    expiring.put(article("https://example.com/b"))
+    assert expiring.stats()["articles"] == 0
+
+
+def test_extract_full_content_skips_known_articles(news_site, searcher):
+    first = searcher.search_news("inflation")
+    news_site.hits.clear()
+    searcher.http_cache = None
+
+    again = [{key: value for key, value in a.items() if key not in ("full_text", "text_length", "images")}
+             for a in first]
+    for a in again:
+        a["url"] += "?utm_source=newsletter"
+    enriched = searcher.extract_full_content(again)
+
+    assert news_site.hits == []
+    assert sorted(a["full_text"] for a in enriched) == sorted(a["full_text"] for a in first)
+    assert searcher.article_store.stats()["hits"] == 9
+
+    searcher.article_store.ttl = 0
+    assert len(searcher.extract_full_content(again)) == 9
+    assert len(news_site.hits) == 9
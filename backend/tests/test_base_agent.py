@@ -0,0 +1,94 @@
+from backend.noovox.core import BaseAgent
+from backend.noovox.knowledge_base import KnowledgeBaseIndex
+from backend.noovox.sessions import InMemorySessionStore
+
+
+def make_agent(fake_openai, tmp_path, lines, **kwargs):
+    knowledge_base = tmp_path / "kb.txt"
+    knowledge_base.write_text("\n".join(lines))
+    return BaseAgent("Tester", "economics", str(knowledge_base), api_key="test-key",
+                     base_url=fake_openai.base_url, **kwargs)
+
+
+def test_relevant_passages_are_added_to_the_prompt(fake_openai, tmp_path):
+    agent = make_agent(fake_openai, tmp_path, [
+        "Inflation is measured with the consumer price index.",
+        "The central bank sets interest rates.",
+        "Football is popular in Europe.",
+    ], retrieval_top_k=2)
+    agent.ask_openai("How is inflation measured?")
+
+    messages = fake_openai.requests[0]["messages"]
+    excerpts = messages[1]["content"]
+    assert messages[1]["role"] == "system"
+    assert "consumer price index" in excerpts
+    assert "Football" not in excerpts
+    assert messages[-1] == {"role": "user", "content": "How is inflation measured?"}
+
+
+def test_retrieval_respects_token_budget(fake_openai, tmp_path):
+    agent = make_agent(fake_openai, tmp_path, [
+        "inflation " * 200,
+        "Inflation fell last month.",
+    ], retrieval_top_k=2, retrieval_token_budget=50)
+    assert agent.retrieve_context("inflation") == ["Inflation fell last month."]
+
+
+def test_retrieval_can_be_disabled(fake_openai, tmp_path):
+    agent = make_agent(fake_openai, tmp_path, ["Inflation fell last month."], retrieval_top_k=0)
+    agent.ask_openai("inflation")
+    assert [m["role"] for m in fake_openai.requests[0]["messages"]] == ["system", "user"]
+
+
+def test_history_is_token_budgeted_and_summarized(fake_openai, tmp_path):
+    agent = make_agent(fake_openai, tmp_path, [], history_token_budget=200, history_max_messages=4)
+    agent.ask_openai("x" * 4000)  # far larger than the history budget
+    agent.ask_openai("second question")
+
+    messages = fake_openai.requests[-1]["messages"]
+    assert sum(len(m["content"]) for m in messages) < 1500
+
+    fake_openai.reply = "The user asked two questions."
+    agent.ask_openai("third question")  # history now exceeds four messages and is folded
+    assert "Current summary" in fake_openai.requests[-1]["messages"][-1]["content"]
+
+    fake_openai.reply = "ok"
+    agent.ask_openai("fourth question")
+    messages = next(r["messages"] for r in fake_openai.requests if r["messages"][-1]["content"] == "fourth question")
+    assert messages[1] == {"role": "system",
+                           "content": "Summary of the earlier conversation: The user asked two questions."}
+    assert all("x" * 100 not in m["content"] for m in messages)
+
+
+def test_sessions_keep_separate_histories(fake_openai, tmp_path):
+    agent = make_agent(fake_openai, tmp_path, [])
+    agent.ask_openai("My name is Alice", session_id="alice")
+    agent.ask_openai("My name is Bob", session_id="bob")
+    agent.ask_openai("What is my name?", session_id="alice")
+
+    contents = [m["content"] for m in fake_openai.requests[-1]["messages"]]
+    assert "My name is Alice" in contents
+    assert "My name is Bob" not in contents
+
+
+def test_least_recently_used_sessions_are_evicted_and_reloaded(fake_openai, tmp_path):
+    store = InMemorySessionStore()
+    agent = make_agent(fake_openai, tmp_path, [], session_store=store, max_sessions=2)
+    for session_id in (1, 2, 3):
+        agent.ask_openai(f"hello from {session_id}", session_id=session_id)
+    assert agent.active_sessions == 2
+
+    agent.ask_openai("again", session_id=1)  # evicted earlier, reloaded from the store
+    contents = [m["content"] for m in fake_openai.requests[-1]["messages"]]
+    assert "hello from 1" in contents
+
+
+def test_agents_share_one_index_per_knowledge_base(fake_openai, tmp_path, monkeypatch):
+    loads = []
+    from_file = KnowledgeBaseIndex.from_file.__func__
+    monkeypatch.setattr(KnowledgeBaseIndex, "from_file",
+                        classmethod(lambda cls, path: loads.append(path) or from_file(cls, path)))
+
+    agents = [make_agent(fake_openai, tmp_path, ["Inflation fell last month."]) for _ in range(3)]
+    assert all(agent.score_query("inflation") > 0 for agent in agents)
+    assert len(loads) == 1
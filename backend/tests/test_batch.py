@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+
+from backend.noovox.core import BaseAgent
+from backend.noovox.scheduler import RequestScheduler
+
+
+def make_agent(fake_openai, tmp_path):
+    return BaseAgent("Tester", "economics", str(tmp_path / "missing.txt"), api_key="test-key",
+                     base_url=fake_openai.base_url, scheduler=RequestScheduler(max_retries=0))
+
+
+def echo(body):
+    return f"answer to {body['messages'][-1]['content']}"
+
+
+def test_results_keep_prompt_order_and_skip_history(fake_openai, tmp_path):
+    fake_openai.reply = echo
+    agent = make_agent(fake_openai, tmp_path)
+    prompts = [f"question {i}" for i in range(20)]
+
+    assert agent.ask_batch(prompts, concurrency=4) == [f"answer to question {i}" for i in range(20)]
+    assert all(len(request["messages"]) == 2 for request in fake_openai.requests)
+
+
+def test_requests_run_concurrently(fake_openai, tmp_path):
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def slow_reply(body):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return "ok"
+
+    fake_openai.reply = slow_reply
+    make_agent(fake_openai, tmp_path).ask_batch([f"q{i}" for i in range(16)], concurrency=8)
+    assert 4 < peak <= 8
+
+
+def test_interrupted_batch_resumes_from_checkpoint(fake_openai, tmp_path):
+    fake_openai.reply = echo
+    fake_openai.failures = [400]  # the first request fails
+    checkpoint = tmp_path / "batch.jsonl"
+    agent = make_agent(fake_openai, tmp_path)
+    prompts = ["a", "b", "c"]
+
+    first = agent.ask_batch(prompts, concurrency=1, checkpoint_path=str(checkpoint))
+    assert first == [None, "answer to b", "answer to c"]
+    assert len(checkpoint.read_text().splitlines()) == 2
+
+    fake_openai.requests.clear()
+    assert agent.ask_batch(prompts, concurrency=1, checkpoint_path=str(checkpoint)) == \
+        ["answer to a", "answer to b", "answer to c"]
+    assert [request["messages"][-1]["content"] for request in fake_openai.requests] == ["a"]
+
+    # A changed prompt at a recorded position is answered again
+    fake_openai.requests.clear()
+    assert agent.ask_batch(["a", "B", "c"], checkpoint_path=str(checkpoint))[1] == "answer to B"
+    assert len(fake_openai.requests) == 1
+    assert json.loads(checkpoint.read_text().splitlines()[-1])["index"] == 1
@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+
+import mysql.connector
+import pytest
+
+from backend.noovox import server
+
+MISSING_CHAT = 404
+
+
+class FakeConnection:
+    """
+    Stores committed content_tracking rows. A row whose content_id is MISSING_CHAT violates
+    a foreign key, and `down` makes every statement fail as if the server went away.
+    """
+
+    def __init__(self):
+        self.committed = []
+        self.pending = []
+        self.down = False
+        self.rolled_back = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed += self.pending
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+        self.rolled_back += 1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, row):
+        if self.conn.down:
+            raise mysql.connector.OperationalError(msg="Lost connection to MySQL server", errno=2013)
+        if row[-1] == MISSING_CHAT:
+            raise mysql.connector.IntegrityError(msg="Cannot add or update a child row", errno=1452)
+        self.conn.pending.append(row)
+
+    def executemany(self, sql, rows):
+        # The whole statement fails when any row does
+        for row in rows:
+            if self.conn.down or row[-1] == MISSING_CHAT:
+                self.execute(sql, row)
+        self.conn.pending += rows
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @contextmanager
+    def connection(self):
+        try:
+            yield self.conn
+        except Exception:
+            self.conn.rollback()
+            raise
+
+
+@pytest.fixture
+def db(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(server, 'db_pool', pool)
+    return pool.conn
+
+
+@pytest.fixture
+def post():
+    client = server.app.test_client()
+
+    def post(items):
+        response = client.post('/api/content_tracking/batch', json=items)
+        return response.status_code, response.get_json()
+    return post
+
+
+def event(content_id, user_id=1):
+    return {'user_id': user_id, 'content_type': 'view', 'content_id': content_id}
+
+
+def test_all_items_created(db, post):
+    status, body = post([event(1), event(2)])
+    assert status == 201
+    assert body['created'] == 2 and body['failed'] == 0
+    assert db.committed == [(1, 'view', 1), (1, 'view', 2)]
+
+
+def test_invalid_items_are_reported_and_the_rest_inserted(db, post):
+    status, body = post([event(1), event('two'), {'user_id': 1}])
+    assert status == 207
+    assert [result['status'] for result in body['results']] == ['created', 'error', 'error']
+    assert db.committed == [(1, 'view', 1)]
+
+
+def test_nothing_valid(db, post):
+    status, body = post([event('x')])
+    assert status == 400
+    assert body['created'] == 0
+    assert db.committed == []
+
+    status, body = post({'not': 'a list'})
+    assert status == 400
+    assert 'error' in body
+
+
+def test_too_many_items(db, post):
+    status, _ = post([event(1)] * (server.MAX_BULK_ITEMS + 1))
+    assert status == 413
+    assert db.committed == []
+
+
+def test_rows_rejected_by_the_database_get_their_own_error(db, post):
+    status, body = post([event(1), event(MISSING_CHAT), event(3)])
+    assert status == 207
+    assert body['created'] == 2 and body['failed'] == 1
+    assert body['results'][1]['status'] == 'error'
+    assert 'child row' in body['results'][1]['error']
+    assert db.committed == [(1, 'view', 1), (1, 'view', 3)]
+
+
+def test_database_failure_inserts_nothing(db, post):
+    db.down = True
+    status, body = post([event(1), event(2)])
+    assert status == 503
+    assert 'Lost connection' in body['error']
+    assert db.committed == []
+    assert db.rolled_back == 1
+
+
+def test_tracking_flush_drops_only_the_rejected_events(db, caplog):
+    server.flush_tracking_events([(1, 'view', 1), (1, 'view', MISSING_CHAT), (1, 'like', 3)])
+    assert db.committed == [(1, 'view', 1), (1, 'like', 3)]
+    assert any(str(MISSING_CHAT) in record.getMessage() for record in caplog.records)
@@ -7,3 +7,27 @@ def test_chat_endpoint(client):
 def test_chat_invalid_request(client):
     response = client.post("/chat", json={})
     assert response.status_code == 422
+
+
+def test_anonymous_chats_do_not_share_history(fake_openai, tmp_path):
+    from fastapi.testclient import TestClient
+
+    from backend.noovox.asgi_server import app, get_chat_agent
+    from backend.noovox.core import BaseAgent
+
+    agent = BaseAgent("Noovox", "news", str(tmp_path / "missing.txt"), api_key="test-key",
+                      base_url=fake_openai.base_url)
+    app.dependency_overrides[get_chat_agent] = lambda: agent
+    try:
+        client = TestClient(app)
+        client.post("/chat", json={"message": "my account number is 1234"})
+        client.post("/chat", json={"message": "what did I just tell you?"})
+        client.post("/chat", json={"message": "remember me", "chat_id": 7})
+        client.post("/chat", json={"message": "who am I?", "chat_id": 7})
+    finally:
+        app.dependency_overrides.clear()
+
+    contents = [[m["content"] for m in request["messages"]] for request in fake_openai.requests]
+    assert not any("1234" in content for content in contents[1])
+    assert "remember me" in contents[3]
+    assert agent.active_sessions == 1
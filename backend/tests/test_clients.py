@@ -0,0 +1,41 @@
+import asyncio
+
+from backend.noovox import clients
+from backend.noovox.core import BaseAgent
+
+
+def test_clients_are_shared_per_key_and_base_url():
+    first = clients.get_client("key-a", "http://127.0.0.1:1/v1")
+    assert clients.get_client("key-a", "http://127.0.0.1:1/v1") is first
+    assert clients.get_client("key-b", "http://127.0.0.1:1/v1") is not first
+    assert clients.get_client("key-a", "http://127.0.0.1:2/v1") is not first
+
+
+def test_api_key_is_read_from_the_environment_at_call_time(monkeypatch):
+    monkeypatch.setenv("OPEN_AI_KEY", "late-key")
+    assert clients.get_client(base_url="http://127.0.0.1:1/v1").api_key == "late-key"
+
+
+def test_async_clients_are_shared_within_an_event_loop():
+    async def pair():
+        return clients.get_async_client("key-a"), clients.get_async_client("key-a")
+
+    first, second = asyncio.run(pair())
+    assert first is second
+    assert asyncio.run(pair())[0] is not first
+
+
+def test_agents_are_cheap_to_create_and_reuse_connections(fake_openai, tmp_path, monkeypatch):
+    knowledge_base = tmp_path / "kb.txt"
+    monkeypatch.setenv("OPEN_AI_KEY", "test-key")
+    agents = [BaseAgent(f"Agent {i}", "economics", str(knowledge_base), base_url=fake_openai.base_url)
+              for i in range(3)]
+
+    # The knowledge base is only read when an agent first needs it
+    knowledge_base.write_text("Inflation is measured with the consumer price index.")
+    for agent in agents:
+        agent.ask_openai("How is inflation measured?")
+
+    assert len(fake_openai.requests) == 3
+    assert "consumer price index" in fake_openai.requests[0]["messages"][1]["content"]
+    assert [key for key in clients._clients if key[1] == fake_openai.base_url] == [("test-key", fake_openai.base_url)]
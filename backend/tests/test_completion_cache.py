@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from backend.noovox.completion_cache import CompletionCache
+from backend.noovox.core import BaseAgent
+
+MODEL = "gpt-4o"
+
+
+def conversation(question):
+    return [{"role": "system", "content": "You are a helpful economics expert."},
+            {"role": "user", "content": question}]
+
+
+def test_hits_ignore_case_and_whitespace():
+    cache = CompletionCache()
+    cache.set(MODEL, 0.2, conversation("What is  inflation?"), "Rising prices.")
+
+    assert cache.get(MODEL, 0.2, conversation("what is inflation?")) == "Rising prices."
+    assert cache.get(MODEL, 0.0, conversation("what is inflation?")) is None
+    assert cache.get("other-model", 0.2, conversation("what is inflation?")) is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 2)
+    assert round(stats["hit_rate"], 2) == 0.33
+
+
+def test_high_temperature_bypasses_cache():
+    cache = CompletionCache(max_temperature=0.2)
+    cache.set(MODEL, 0.9, conversation("Tell me a story"), "Once upon a time")
+    assert cache.get(MODEL, 0.9, conversation("Tell me a story")) is None
+    assert cache.stats()["bypassed"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_expire_and_are_evicted_least_recently_used(monkeypatch):
+    cache = CompletionCache(max_entries=2, ttl=10)
+    cache.set(MODEL, 0, conversation("a"), "A")
+    cache.set(MODEL, 0, conversation("b"), "B")
+    cache.get(MODEL, 0, conversation("a"))
+    cache.set(MODEL, 0, conversation("c"), "C")  # evicts "b", the least recently used
+    assert cache.get(MODEL, 0, conversation("b")) is None
+    assert cache.get(MODEL, 0, conversation("a")) == "A"
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get(MODEL, 0, conversation("a")) is None
+
+
+def test_sqlite_tier_survives_restarts(tmp_path):
+    path = str(tmp_path / "completions.db")
+    CompletionCache(path=path).set(MODEL, 0, conversation("What is GDP?"), "Output of an economy.")
+
+    cache = CompletionCache(path=path)
+    assert cache.get(MODEL, 0, conversation("What is GDP?")) == "Output of an economy."
+    assert cache.get(MODEL, 0, conversation("What is GDP?")) == "Output of an economy."
+    assert (cache.stats()["disk_hits"], cache.stats()["memory_hits"]) == (1, 1)
+
+
+def test_near_duplicate_questions_share_an_entry():
+    cache = CompletionCache(similarity_threshold=0.6)
+    cache.set(MODEL, 0, conversation("How does the central bank set interest rates?"), "Through policy meetings.")
+
+    assert cache.get(MODEL, 0, conversation("How does a central bank set the interest rates")) \
+        == "Through policy meetings."
+    assert cache.get(MODEL, 0, conversation("Why do football clubs buy players?")) is None
+    assert cache.stats()["similar_hits"] == 1
+
+
+def test_agents_reuse_cached_completions(fake_openai, tmp_path):
+    knowledge_base = tmp_path / "kb.txt"
+    knowledge_base.write_text("")
+    cache = CompletionCache()
+    fake_openai.reply = "Rising prices."
+
+    def new_agent():
+        # A fresh agent per question, so each request carries the same (empty) history
+        return BaseAgent("Tester", "economics", str(knowledge_base), api_key="test-key",
+                         base_url=fake_openai.base_url, cache=cache)
+
+    assert new_agent().ask_openai("What is inflation?") == "Rising prices."
+    assert new_agent().ask_openai("what is  inflation?") == "Rising prices."
+    assert list(new_agent().stream_openai("What is inflation?")) == ["Rising prices."]
+
+    assert len(fake_openai.requests) == 1
+    assert cache.stats()["memory_hits"] == 2
+
+
+class SlowCache(CompletionCache):
+    """A cache whose lookups and writes block their thread, like its SQLite tier on a busy disk."""
+
+    def get(self, model, temperature, messages):
+        time.sleep(0.1)
+        return super().get(model, temperature, messages)
+
+    def set(self, model, temperature, messages, content):
+        time.sleep(0.1)
+        super().set(model, temperature, messages, content)
+
+
+def test_async_agent_keeps_cache_io_off_the_event_loop(fake_openai, tmp_path):
+    agent = BaseAgent("Tester", "economics", str(tmp_path / "missing.txt"), api_key="test-key",
+                      base_url=fake_openai.base_url, cache=SlowCache())
+
+    async def main():
+        # The tokenizer and HTTP client load once per process; only cache I/O is measured
+        await agent.ask_openai_async("warm up", stateless=True)
+        lags = []
+
+        async def ticker():
+            while True:
+                started = time.monotonic()
+                await asyncio.sleep(0.01)
+                lags.append(time.monotonic() - started - 0.01)
+
+        ticking = asyncio.create_task(ticker())
+        await agent.ask_openai_async("What is inflation?", stateless=True)
+        async for _ in agent.stream_openai_async("What is inflation?", stateless=True):
+            pass
+        ticking.cancel()
+        return lags
+
+    lags = asyncio.run(main())
+    assert max(lags) < 0.08
+    assert len(fake_openai.requests) == 2  # The streamed question was answered from the cache
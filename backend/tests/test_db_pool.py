@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+from backend.noovox.db import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+        self.rolled_back = False
+
+    def ping(self, reconnect=False):
+        if not self.healthy:
+            raise ConnectionError("gone away")
+
+    def rollback(self):
+        if not self.healthy:
+            raise ConnectionError("gone away")
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**options):
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **options), opened
+
+
+def test_connections_are_reused():
+    pool, opened = make_pool(max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert len(opened) == 1
+    assert pool.stats()["checkouts"] == 2
+
+
+def test_checkout_times_out_when_saturated():
+    pool, _ = make_pool(max_size=1, checkout_timeout=0.05)
+    with pool.connection():
+        with pytest.raises(PoolTimeoutError):
+            with pool.connection():
+                pass
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_waiter_gets_released_connection():
+    pool, opened = make_pool(max_size=1, checkout_timeout=2)
+    held = pool.acquire()
+    threading.Timer(0.05, pool.release, args=(held,)).start()
+    with pool.connection() as conn:
+        assert conn is held.raw
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["max_wait_ms"] > 0
+    assert len(opened) == 1
+
+
+def test_unhealthy_connection_is_replaced_on_checkout():
+    pool, opened = make_pool(max_size=1, health_check_interval=0)
+    with pool.connection() as conn:
+        conn.healthy = False
+    with pool.connection() as replacement:
+        assert replacement is not conn
+    assert conn.closed
+    assert len(opened) == 2
+
+
+def test_idle_and_expired_connections_are_evicted():
+    pool, opened = make_pool(max_size=2, idle_timeout=0.01)
+    with pool.connection():
+        pass
+    time.sleep(0.02)
+    assert pool.evict_idle() == 1
+    assert opened[0].closed
+
+    pool, opened = make_pool(max_size=2, max_lifetime=0)
+    with pool.connection():
+        pass
+    assert opened[0].closed
+    assert pool.stats()["open"] == 0
+
+
+def test_failed_block_rolls_back_and_returns_connection():
+    pool, opened = make_pool(max_size=1)
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("boom")
+    assert opened[0].rolled_back
+    assert pool.stats()["idle"] == 1
+
+
+def test_released_connection_is_rolled_back():
+    # Even a read leaves a transaction open, whose snapshot the next borrower would see
+    pool, opened = make_pool(max_size=1)
+    with pool.connection():
+        pass
+    assert opened[0].rolled_back
+
+    held = pool.acquire()
+    held.raw.rolled_back = False
+    pool.release(held)
+    assert held.raw.rolled_back
+    assert pool.stats()["idle"] == 1
+
+
+def test_connection_that_fails_to_roll_back_is_discarded():
+    pool, opened = make_pool(max_size=1)
+    with pool.connection() as conn:
+        conn.healthy = False
+    assert conn.closed
+    assert pool.stats()["idle"] == 0 and pool.stats()["discarded"] == 1
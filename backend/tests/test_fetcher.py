@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from backend.noovox.article_store import ArticleStore
+from backend.noovox.fetcher import AsyncFetcher
+from backend.noovox.http_cache import HTTPCache
+
+
+def test_global_and_per_host_limits(http_stub):
+    http_stub.delay = 0.05
+    http_stub.pages = {f"/page/{i}": "ok" for i in range(12)}
+    port = http_stub.server_address[1]
+    # Two host names for the same server, so the per-host limits apply separately
+    urls = [f"http://{host}:{port}/page/{i}" for host in ("127.0.0.1", "localhost") for i in range(12)]
+
+    async def main():
+        async with AsyncFetcher(max_concurrency=6, per_host=4) as fetcher:
+            responses = await fetcher.fetch_all(urls)
+            return responses, fetcher.stats()
+
+    responses, stats = asyncio.run(main())
+    assert [response.text for response in responses] == ["ok"] * 24
+    assert stats["peak_in_flight"] == 6
+    assert http_stub.peak_in_flight == 6
+
+
+def test_retries_without_blocking_and_gives_up_on_client_errors(http_stub):
+    http_stub.pages = {"/flaky": "ok"}
+    http_stub.statuses = [503, 429]
+
+    async def main():
+        async with AsyncFetcher(backoff_factor=0.01) as fetcher:
+            flaky, missing = await fetcher.fetch_all([f"{http_stub.url}/flaky", f"{http_stub.url}/missing"])
+            return flaky, missing, fetcher.stats()
+
+    flaky, missing, stats = asyncio.run(main())
+    assert flaky.text == "ok"
+    assert missing is None
+    assert (stats["retries"], stats["failures"]) == (2, 1)
+
+
+def test_cancellation_frees_every_slot(http_stub):
+    http_stub.delay = 0.5
+    http_stub.pages = {f"/slow/{i}": "ok" for i in range(10)}
+
+    async def main():
+        async with AsyncFetcher(max_concurrency=4) as fetcher:
+            task = asyncio.create_task(fetcher.fetch_all(f"{http_stub.url}/slow/{i}" for i in range(10)))
+            await asyncio.sleep(0.1)
+            assert fetcher.stats()["in_flight"] == 4
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return fetcher.stats()
+
+    assert asyncio.run(main())["in_flight"] == 0
+
+
+def test_retry_after_is_capped(http_stub):
+    http_stub.pages = {"/busy": "ok"}
+    http_stub.headers = {"/busy": {"Retry-After": "3600"}}
+    http_stub.statuses = [503]
+
+    async def main():
+        async with AsyncFetcher(backoff_factor=0.01, max_delay=0.2) as fetcher:
+            return await fetcher.fetch(f"{http_stub.url}/busy")
+
+    started = time.monotonic()
+    assert asyncio.run(main()).text == "ok"
+    assert 0.2 <= time.monotonic() - started < 2
+
+
+def test_async_search_matches_threaded_search(news_site, searcher):
+    threaded = searcher.search_news("inflation")
+    # Start the async search cold, so it downloads and parses every page itself
+    searcher.http_cache = HTTPCache()
+    searcher.article_store = ArticleStore()
+    news_site.hits.clear()
+    concurrent = asyncio.run(searcher.search_news_async("inflation"))
+
+    def comparable(articles):
+        # Both sources list /shared/article; the threaded search keeps whichever source answered first
+        return sorted(({k: v for k, v in a.items() if k != "source"} for a in articles), key=lambda a: a["url"])
+
+    assert len(concurrent) == 9
+    assert comparable(concurrent) == comparable(threaded)
+    assert all(article["full_text"] and article["images"] for article in concurrent)
+    assert len(news_site.hits) == 11  # Two listings and nine articles
+    assert "/a/articles/football" not in news_site.hits
+    scores = [article["relevance_score"] for article in concurrent]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_async_search_is_served_from_http_cache(news_site, searcher):
+    first = asyncio.run(searcher.search_news_async("inflation"))
+    searcher.article_store = ArticleStore()
+    news_site.hits.clear()
+    again = asyncio.run(searcher.search_news_async("inflation"))
+    assert news_site.hits == []
+    assert sorted(a["url"] for a in again) == sorted(a["url"] for a in first)
+    assert searcher.http_cache.stats()["memory_hits"] == 11
+
+
+def test_async_search_overlaps_listing_and_extraction(news_site, searcher):
+    # Source A answers at once but its article pages are slow, source B the other way round
+    news_site.delays["/b/search"] = 0.5
+    for i in range(4):
+        news_site.delays[f"/a/articles/{i}"] = 0.5
+
+    started = time.monotonic()
+    articles = asyncio.run(searcher.search_news_async("inflation"))
+    assert len(articles) == 9
+    assert time.monotonic() - started < 0.85
+
+
+def test_async_fetch_revalidates_stale_pages(http_stub, searcher):
+    http_stub.pages = {"/etag": "<html>v1</html>"}
+    http_stub.headers = {"/etag": {"Cache-Control": "max-age=0", "ETag": '"v1"'}}
+
+    async def main():
+        async with AsyncFetcher() as fetcher:
+            return [await searcher.fetch_page_async(fetcher, f"{http_stub.url}/etag") for _ in range(2)]
+
+    assert asyncio.run(main()) == ["<html>v1</html>"] * 2
+    assert searcher.http_cache.stats()["revalidated"] == 1
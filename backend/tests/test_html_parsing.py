@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from backend.noovox import html_parsing
+from backend.noovox.html_parsing import LISTING_STRAINERS, available_engines, make_soup, resolve_engine
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures")
+SOURCE_URLS = {
+    "google_news": "https://news.google.com/search?q=inflation",
+    "bing_news": "https://www.bing.com/news/search?q=inflation",
+    "yahoo_news": "https://news.search.yahoo.com/search?p=inflation",
+    "reuters": "https://www.reuters.com/search/news?blob=inflation",
+    "ft": "https://www.ft.com/search?q=inflation",
+}
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, f"{name}.html"), encoding="utf-8") as file:
+        return file.read()
+
+
+def extract(searcher, name):
+    source = searcher.ContentSource(name=name, url=SOURCE_URLS[name], type="search", category="general")
+    return searcher.extract_articles(read_fixture(name), SOURCE_URLS[name], source)
+
+
+@pytest.mark.parametrize("name", sorted(SOURCE_URLS))
+def test_every_engine_extracts_the_same_listing(searcher, name):
+    searcher.parser_engine = "html.parser"
+    expected = extract(searcher, name)
+    assert len(expected) == 40
+
+    for engine in available_engines():
+        searcher.parser_engine = engine
+        assert extract(searcher, name) == expected, engine
+
+
+def test_every_engine_extracts_the_same_article(searcher):
+    html = read_fixture("article")
+    results = []
+    for engine in available_engines():
+        searcher.parser_engine = engine
+        results.append(searcher.parse_full_article({"title": "Saved", "url": "https://example.com/a"}, html))
+    assert results[0]["text_length"] > 0 and len(results[0]["images"]) == 5
+    assert all(result == results[0] for result in results)
+
+
+def test_strained_parse_builds_only_the_listing_containers():
+    html = read_fixture("bing_news")
+    strainer = LISTING_STRAINERS["parse_bing_news"]
+    assert make_soup(html, "html.parser", strainer).find("nav") is not None
+    strained = make_soup(html, "strained", strainer)
+    assert strained.find("nav") is None
+    assert len(strained.find_all("div", class_="news-card")) == 40
+
+
+def test_resolve_engine(monkeypatch):
+    with pytest.raises(ValueError):
+        resolve_engine("html5")
+    monkeypatch.setattr(html_parsing, "lxml_available", lambda: False)
+    assert resolve_engine("lxml") == "html.parser"
+    assert resolve_engine("lxml-strained") == "strained"
+    assert available_engines() == ["html.parser", "strained"]
@@ -0,0 +1,89 @@
+import sqlite3
+
+from backend.noovox.http_cache import HTTPCache
+
+
+def test_repeat_requests_are_served_from_memory(http_stub, searcher):
+    http_stub.pages = {"/page": "<html>cached</html>"}
+    first = searcher.make_request(f"{http_stub.url}/page")
+    second = searcher.make_request(f"{http_stub.url}/page")
+
+    assert first.text == second.text == "<html>cached</html>"
+    assert second.headers["Content-Type"] == "text/html; charset=utf-8"
+    assert http_stub.hits == ["/page"]
+    stats = searcher.http_cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["stored"]) == (1, 1, 1)
+
+
+def test_no_store_and_errors_are_not_cached(http_stub, searcher):
+    http_stub.pages = {"/private": "secret"}
+    http_stub.headers = {"/private": {"Cache-Control": "private, no-store"}}
+    searcher.make_request(f"{http_stub.url}/private")
+    searcher.make_request(f"{http_stub.url}/private")
+    searcher.make_request(f"{http_stub.url}/missing")
+    searcher.make_request(f"{http_stub.url}/missing")
+
+    assert http_stub.hits == ["/private"] * 2 + ["/missing"] * 2
+    assert searcher.http_cache.stats()["entries"] == 0
+
+
+def test_stale_entries_are_revalidated_with_conditional_requests(http_stub, searcher):
+    http_stub.pages = {"/etag": "<html>v1</html>", "/plain": "<html>plain</html>"}
+    http_stub.headers = {"/etag": {"Cache-Control": "max-age=0", "ETag": '"v1"'},
+                         "/plain": {"Cache-Control": "no-cache"}}
+    for _ in range(3):
+        assert searcher.make_request(f"{http_stub.url}/etag").text == "<html>v1</html>"
+        assert searcher.make_request(f"{http_stub.url}/plain").text == "<html>plain</html>"
+
+    assert http_stub.hits == ["/etag", "/plain"] * 3
+    stats = searcher.http_cache.stats()
+    assert stats["revalidated"] == 2  # The ETag page's body was downloaded once
+    assert stats["misses"] == 4  # No validator, so every use of the plain page downloads it
+
+    http_stub.pages["/etag"] = "<html>v2</html>"
+    http_stub.headers["/etag"]["ETag"] = '"v2"'
+    assert searcher.make_request(f"{http_stub.url}/etag").text == "<html>v2</html>"
+
+
+def test_disk_tier_survives_restarts_and_evicts_least_recently_used(http_stub, searcher, tmp_path):
+    path = str(tmp_path / "http_cache.db")
+    http_stub.pages = {f"/page/{i}": f"<html>{i}</html>" + " " * 1000 for i in range(5)}
+    searcher.http_cache = HTTPCache(max_bytes=2500, path=path, max_disk_bytes=4000)  # Entries are about 1.2kB
+    for i in range(5):
+        searcher.make_request(f"{http_stub.url}/page/{i}")
+    assert searcher.http_cache.stats()["entries"] == 2
+    assert searcher.http_cache.stats()["evictions"] > 0
+
+    searcher.http_cache = HTTPCache(path=path, max_disk_bytes=4000)
+    http_stub.hits.clear()
+    for i in reversed(range(5)):
+        assert searcher.make_request(f"{http_stub.url}/page/{i}").text.startswith(f"<html>{i}</html>")
+    assert http_stub.hits == ["/page/1", "/page/0"]
+    assert searcher.http_cache.stats()["disk_hits"] == 3
+
+
+def test_repeat_search_is_served_from_cache(news_site, searcher):
+    searcher.article_store = None  # Otherwise the article pages are not even requested again
+    first = searcher.search_news("inflation")
+    news_site.hits.clear()
+    second = searcher.search_news("inflation")
+
+    assert news_site.hits == []
+    assert sorted(a["url"] for a in second) == sorted(a["url"] for a in first)
+    assert searcher.http_cache.stats()["hit_rate"] == 0.5
+
+
+def test_disk_byte_count_is_kept_without_summing_the_table(http_stub, searcher, tmp_path):
+    path = str(tmp_path / "http_cache.db")
+    http_stub.pages = {f"/page/{i}": f"<html>{i}</html>" + " " * 1000 for i in range(6)}
+    http_stub.headers = {"/page/0": {"Cache-Control": "max-age=0"}}  # Stale without validators: deleted on reuse
+    searcher.http_cache = HTTPCache(max_bytes=0, path=path, max_disk_bytes=4000)
+    for i in list(range(6)) + [5, 0]:
+        searcher.make_request(f"{http_stub.url}/page/{i}")
+
+    def disk_size():
+        with sqlite3.connect(path) as db:
+            return db.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    assert 0 < searcher.http_cache.stats()["disk_bytes"] == disk_size() <= 4000
+    assert HTTPCache(path=path, max_disk_bytes=4000).stats()["disk_bytes"] == disk_size()
@@ -0,0 +1,30 @@
+import logging
+
+
+def test_requests_reuse_keep_alive_connections(http_stub, searcher):
+    http_stub.pages = {f"/page/{i}": "<html>ok</html>" for i in range(20)}
+    for i in range(20):
+        assert searcher.make_request(f"{http_stub.url}/page/{i}").status_code == 200
+    assert len(http_stub.connections) == 1
+
+
+def test_server_errors_are_retried_by_the_transport(http_stub, searcher):
+    http_stub.pages = {"/flaky": "<html>ok</html>"}
+    http_stub.statuses = [503, 502]
+    assert searcher.make_request(f"{http_stub.url}/flaky").status_code == 200
+    assert len(http_stub.hits) == 3
+
+
+def test_client_errors_are_not_retried(http_stub, searcher):
+    assert searcher.make_request(f"{http_stub.url}/missing") is None
+    assert len(http_stub.hits) == 1
+
+
+def test_failure_log_reports_status_and_attempts(http_stub, searcher, caplog):
+    with caplog.at_level(logging.ERROR):
+        assert searcher.make_request(f"{http_stub.url}/missing") is None
+        http_stub.statuses = [503] * (searcher.max_retries + 1)
+        assert searcher.make_request(f"{http_stub.url}/down") is None
+    failures = [record.getMessage() for record in caplog.records if record.levelno == logging.ERROR]
+    assert "HTTP 404 after 1 attempt(s)" in failures[0]
+    assert f"HTTP 503 after {searcher.max_retries + 1} attempt(s)" in failures[1]
@@ -0,0 +1,92 @@
+from backend.noovox.knowledge_base import KnowledgeBaseIndex, MappedPassages
+
+PASSAGES = [
+    "Central banks raised interest rates to fight inflation.\n",
+    "The football season starts in August.\n",
+    "\n",
+    "Inflation eased as energy prices fell, economists said.\n",
+    "Interest in electric cars keeps growing.\n",
+]
+
+
+def test_relevance_is_full_for_a_covering_passage():
+    index = KnowledgeBaseIndex(PASSAGES)
+    assert len(index) == 4  # blank lines are skipped
+    assert index.relevance("interest rates inflation") == 100
+    assert index.relevance("Football SEASON") == 100
+
+
+def test_relevance_is_partial_or_zero():
+    index = KnowledgeBaseIndex(PASSAGES)
+    assert 0 < index.relevance("inflation quantum computing") < 50
+    assert index.relevance("quantum computing") == 0
+    assert index.relevance("") == 0
+    assert KnowledgeBaseIndex([]).relevance("anything") == 0
+
+
+def test_top_passages_ranks_by_bm25():
+    index = KnowledgeBaseIndex(PASSAGES)
+    passages = [passage for passage, _ in index.top_passages("inflation interest rates", k=2)]
+    assert passages[0] == "Central banks raised interest rates to fight inflation."
+    assert len(passages) == 2
+
+
+def test_mapped_passages_skip_blank_lines_and_decode_lazily(tmp_path):
+    path = tmp_path / "kb.txt"
+    path.write_bytes("  Café prices rose.  \n\n\t\nRents fell.\r\nLast line without newline".encode())
+
+    passages = MappedPassages(str(path))
+    assert len(passages) == 3
+    assert list(passages) == ["Café prices rose.", "Rents fell.", "Last line without newline"]
+    assert passages[-1] == "Last line without newline"
+    assert (tmp_path / "kb.txt.offsets").exists()
+
+
+def test_offset_index_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "kb.txt"
+    path.write_text("first\nsecond\n")
+    MappedPassages(str(path))
+
+    scans = []
+    scan = MappedPassages._MappedPassages__scan
+    monkeypatch.setattr(MappedPassages, "_MappedPassages__scan", lambda self: scans.append(1) or scan(self))
+    assert list(MappedPassages(str(path))) == ["first", "second"]
+    assert scans == []
+
+    path.write_text("first\nsecond\nthird\n")
+    assert list(MappedPassages(str(path))) == ["first", "second", "third"]
+    assert scans == [1]
+
+
+def test_corrupt_offset_index_is_rebuilt(tmp_path):
+    from array import array
+
+    path = tmp_path / "kb.txt"
+    path.write_text("first\nsecond\n")
+    index = tmp_path / "kb.txt.offsets"
+    MappedPassages(str(path))
+    valid = index.read_bytes()
+    stat = path.stat()
+
+    corruptions = [
+        valid[:13],  # Not a whole number of offsets
+        valid[:16],  # Shorter than the header
+        valid[:-8],  # Header promises more offsets than there are
+        array("Q", [stat.st_size, stat.st_mtime_ns, 1, 0, 10 ** 6]).tobytes(),  # Offset past the end of the file
+    ]
+    for corrupt in corruptions:
+        index.write_bytes(corrupt)
+        assert list(MappedPassages(str(path))) == ["first", "second"]
+        assert index.read_bytes() == valid
+
+
+def test_file_index_matches_in_memory_index(tmp_path):
+    lines = ["Inflation is measured with the consumer price index.", "", "The central bank sets interest rates.",
+             "Inflation expectations anchor wages."]
+    path = tmp_path / "kb.txt"
+    path.write_text("\n".join(lines))
+
+    mapped = KnowledgeBaseIndex.from_file(str(path))
+    assert len(mapped) == 3
+    assert mapped.top_passages("inflation rates") == KnowledgeBaseIndex(lines).top_passages("inflation rates")
+    assert len(KnowledgeBaseIndex.from_file(str(tmp_path / "missing.txt"))) == 0
@@ -0,0 +1,241 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager, contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from backend.noovox import asgi_server, server
+
+USERS = [{'user_id': user_id, 'username': f'user{user_id}'} for user_id in range(1, 8)]
+
+
+class FakeCursor:
+    """Answers the `{key} > %s ORDER BY {key} [LIMIT %s]` queries built by `list_rows` from `USERS`."""
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.pending = []
+
+    def execute(self, sql, params):
+        self.queries.append((sql, params))
+        limited = sql.endswith("LIMIT %s")
+        after_id = params[-2] if limited else params[-1]
+        rows = [row for row in USERS if row['user_id'] > after_id]
+        self.pending = rows[:params[-1]] if limited else rows
+
+    def fetchall(self):
+        rows, self.pending = self.pending, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self.pending = self.pending[:size], self.pending[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, queries):
+        self.queries = queries
+
+    def cursor(self, **options):
+        return FakeCursor(self.queries)
+
+
+class FakePooled:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+class FakePool:
+    def __init__(self):
+        self.queries = []
+        self.released = []
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(self.queries)
+
+    def acquire(self):
+        return FakePooled(FakeConnection(self.queries))
+
+    def release(self, pooled, discard=False):
+        self.released.append(discard)
+
+
+class FakeAsyncCursor(FakeCursor):
+    def __await__(self):
+        yield from ()
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, sql, params):
+        super().execute(sql, params)
+
+    async def fetchall(self):
+        return super().fetchall()
+
+    async def fetchmany(self, size):
+        return super().fetchmany(size)
+
+    async def close(self):
+        pass
+
+
+class FakeAsyncConnection(FakeConnection):
+    def cursor(self, cursor_class=None):
+        return FakeAsyncCursor(self.queries)
+
+
+class FakeDatabase(FakePool):
+    @asynccontextmanager
+    async def connection(self):
+        yield FakeAsyncConnection(self.queries)
+
+    async def acquire(self):
+        return FakeAsyncConnection(self.queries)
+
+
+@pytest.fixture
+def flask_db(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(server, 'db_pool', pool)
+    monkeypatch.setattr(server, 'STREAM_BATCH_SIZE', 2)
+    return pool
+
+
+@pytest.fixture
+def asgi_db(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(asgi_server, 'db', database)
+    monkeypatch.setattr(asgi_server, 'STREAM_BATCH_SIZE', 2)
+    return database
+
+
+@pytest.fixture(params=['flask', 'asgi'])
+def get(request):
+    """GETs a path from either server and returns (status, headers, body text)."""
+    if request.param == 'flask':
+        request.getfixturevalue('flask_db')
+        client = server.app.test_client()
+
+        def get(path, headers=None):
+            response = client.get(path, headers=headers)
+            return response.status_code, response.headers, response.get_data(as_text=True)
+    else:
+        request.getfixturevalue('asgi_db')
+        client = TestClient(asgi_server.app)
+
+        def get(path, headers=None):
+            response = client.get(path, headers=headers)
+            return response.status_code, response.headers, response.text
+    return get
+
+
+def test_pages_advertise_the_next_cursor(get):
+    status, headers, body = get('/api/users?limit=3&fields=username')
+    assert status == 200
+    assert [row['user_id'] for row in json.loads(body)] == [1, 2, 3]
+    assert headers['X-Next-Cursor'] == '3'
+    next_url = headers['Link'][1:headers['Link'].index('>')]
+    assert 'fields=username' in next_url and 'after_id=3' in next_url and 'limit=3' in next_url
+
+    status, headers, body = get('/api/users?after_id=6&limit=3')
+    assert [row['user_id'] for row in json.loads(body)] == [7]
+    assert 'X-Next-Cursor' not in headers and 'Link' not in headers
+
+
+@pytest.mark.parametrize("query", ["after_id=abc", "limit=ten", "after_id=1.5"])
+def test_non_integer_cursor_or_limit_is_rejected(get, query):
+    status, _, _ = get(f'/api/users?{query}')
+    assert status == 400
+
+
+def test_out_of_range_values_are_clamped(get):
+    _, headers, body = get('/api/users?after_id=-5&limit=-1')
+    assert [row['user_id'] for row in json.loads(body)] == [1]
+    assert headers['X-Next-Cursor'] == '1'
+
+    _, _, body = get('/api/users?limit=100000')
+    assert len(json.loads(body)) == len(USERS)
+
+
+def test_ndjson_streams_every_row(get):
+    status, headers, body = get('/api/users?format=ndjson&after_id=2')
+    assert status == 200
+    assert headers['Content-Type'].startswith('application/x-ndjson')
+    assert [json.loads(line)['user_id'] for line in body.splitlines()] == [3, 4, 5, 6, 7]
+
+
+@pytest.mark.parametrize("accept, ndjson", [
+    ("application/x-ndjson", True),
+    ("application/x-ndjson, application/json;q=0.9", True),
+    ("application/json, application/x-ndjson;q=0.5", False),
+    ("text/plain; note=application/x-ndjson", False),
+])
+def test_both_servers_negotiate_the_accept_header_alike(get, accept, ndjson):
+    _, headers, _ = get('/api/users', headers={'Accept': accept})
+    assert headers['Content-Type'].startswith('application/x-ndjson') == ndjson
+
+
+def test_ndjson_limit_is_clamped_before_reaching_sql(get):
+    _, _, body = get('/api/users?format=ndjson&limit=-3')
+    assert [json.loads(line)['user_id'] for line in body.splitlines()] == [1]
+
+
+def test_flask_stream_releases_connection(flask_db):
+    client = server.app.test_client()
+    client.get('/api/users?format=ndjson').get_data()
+    assert flask_db.released == [False]
+
+
+def test_flask_stream_discards_connection_on_early_disconnect(flask_db):
+    response = server.app.test_client().get('/api/users?format=ndjson', buffered=False)
+    first = next(iter(response.response))
+    assert [json.loads(line)['user_id'] for line in first.decode().splitlines()] == [1, 2]
+    response.close()
+    assert flask_db.released == [True]
+
+
+def test_asgi_stream_discards_connection_on_early_disconnect(asgi_db):
+    async def read_one_batch():
+        response = await asgi_server.stream_rows("SELECT * FROM users WHERE TRUE AND user_id > %s ORDER BY user_id",
+                                                 (0,))
+        first = await response.body_iterator.__anext__()
+        await response.body_iterator.aclose()
+        return first
+
+    first = asyncio.run(read_one_batch())
+    assert [json.loads(line)['user_id'] for line in first.splitlines()] == [1, 2]
+    assert asgi_db.released == [True]
+
+
+def test_asgi_stream_releases_connection_when_client_leaves_before_the_body(asgi_db):
+    async def send(message):
+        raise OSError("connection reset")
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def abandon():
+        response = await asgi_server.stream_rows("SELECT * FROM users WHERE TRUE AND user_id > %s ORDER BY user_id",
+                                                 (0,))
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        with pytest.raises(ClientDisconnect):
+            await response(scope, receive, send)
+
+    asyncio.run(abandon())
+    assert asgi_db.released == [True]
+
+
+def test_asgi_stream_releases_connection_once_when_read_to_the_end(asgi_db):
+    TestClient(asgi_server.app).get('/api/users?format=ndjson')
+    assert asgi_db.released == [False]
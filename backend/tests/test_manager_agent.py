@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from backend.noovox import core
+from backend.noovox.core import ManagerAgent
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    # ManagerAgent configures logging to agent_log.log in the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+class SleepyAgent:
+    def __init__(self, name, delay, relevance_score):
+        self.name = name
+        self.delay = delay
+        self.relevance_score = relevance_score
+        self.calls = 0
+
+    def score_query(self, query):
+        return self.relevance_score
+
+    def process_query(self, query, relevance_score=None, session_id=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {"response": f"{self.name}: {query}", "relevance_score": self.relevance_score}
+
+
+def test_route_query_fans_out_concurrently():
+    agents = [SleepyAgent(f"agent-{i}", 0.2, i * 10) for i in range(5)]
+    started = time.monotonic()
+    with ManagerAgent(agents, top_k=None) as manager:
+        result = manager.route_query("news")
+    assert time.monotonic() - started < 0.6
+    assert len(result["all_responses"]) == 5
+    assert result["best_response"]["agent"] == "agent-4"
+    assert result["timed_out"] == []
+
+
+def test_slow_agents_are_dropped_after_timeout():
+    agents = [SleepyAgent("fast", 0.05, 10), SleepyAgent("slow", 2, 90)]
+    started = time.monotonic()
+    with ManagerAgent(agents, agent_timeout=0.3, top_k=None) as manager:
+        result = manager.route_query("news")
+    assert time.monotonic() - started < 1
+    assert result["best_response"]["agent"] == "fast"
+    assert result["timed_out"] == ["slow"]
+
+
+def test_global_deadline_returns_whatever_answered():
+    agents = [SleepyAgent("fast", 0.05, 10), SleepyAgent("slow", 2, 90)]
+    with ManagerAgent(agents, agent_timeout=10, deadline=0.3, top_k=None) as manager:
+        result = manager.route_query("news")
+    assert [r["agent"] for r in result["all_responses"]] == ["fast"]
+
+
+def test_returns_early_once_relevance_threshold_is_met():
+    agents = [SleepyAgent("relevant", 0.05, 95), SleepyAgent("slow", 2, 10)]
+    started = time.monotonic()
+    with ManagerAgent(agents, relevance_threshold=80, top_k=None) as manager:
+        result = manager.route_query("news")
+    assert time.monotonic() - started < 1
+    assert result["best_response"]["agent"] == "relevant"
+
+
+def test_only_top_k_agents_call_the_llm():
+    agents = [SleepyAgent(f"agent-{i}", 0, i * 10) for i in range(5)]
+    with ManagerAgent(agents, top_k=2) as manager:
+        result = manager.route_query("news")
+    assert [agent.calls for agent in agents] == [0, 0, 0, 1, 1]
+    assert result["best_response"]["agent"] == "agent-4"
+    assert result["relevance_scores"]["agent-0"] == 0
+
+
+def test_min_relevance_cutoff_keeps_best_agent():
+    agents = [SleepyAgent("low", 0, 10), SleepyAgent("lower", 0, 5)]
+    with ManagerAgent(agents, top_k=None, min_relevance=50) as manager:
+        result = manager.route_query("news")
+    assert [agent.calls for agent in agents] == [1, 0]
+    assert result["best_response"]["agent"] == "low"
+
+
+def test_threshold_keeps_answers_that_finished_together(monkeypatch):
+    real_wait = core.wait
+
+    def late_wait(*args, **kwargs):
+        time.sleep(0.1)  # Both quick agents are done by the time routing looks
+        return real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(core, "wait", late_wait)
+    agents = [SleepyAgent("first", 0, 95), SleepyAgent("second", 0, 90), SleepyAgent("slow", 2, 10)]
+    with ManagerAgent(agents, relevance_threshold=80, top_k=None) as manager:
+        result = manager.route_query("news")
+    assert sorted(r["agent"] for r in result["all_responses"]) == ["first", "second"]
+
+
+def test_close_stops_the_agent_threads():
+    manager = ManagerAgent([SleepyAgent("agent", 0, 10)])
+    manager.route_query("news")
+    manager.close()
+    with pytest.raises(RuntimeError):
+        manager.route_query("news")
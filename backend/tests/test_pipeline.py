@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from backend.noovox.pipeline import StagedExecutor
+
+
+def test_stages_share_one_worker_budget():
+    release = threading.Event()
+    running = []
+    lock = threading.Lock()
+
+    def task(stage):
+        with lock:
+            running.append(stage)
+        release.wait(5)
+
+    executor = StagedExecutor(2, stages=("listing", "extraction", "unused"))
+    futures = [executor.submit("listing", task, "listing") for _ in range(2)]
+    futures += [executor.submit("extraction", task, "extraction") for _ in range(3)]
+
+    stats = executor.stats()
+    assert (stats["extraction"]["queued"], stats["extraction"]["max_queue_depth"]) == (3, 3)
+    release.set()
+    for future in futures:
+        future.result()
+    executor.shutdown()
+
+    stats = executor.stats()
+    assert sorted(running) == ["extraction"] * 3 + ["listing"] * 2
+    assert stats["listing"]["completed"] == 2 and stats["extraction"]["completed"] == 3
+    assert stats["extraction"]["queued"] == stats["extraction"]["running"] == 0
+    assert stats["extraction"]["avg_wait_ms"] > 0
+    assert stats["unused"]["submitted"] == 0
+
+
+def test_counts_failures_and_cancelled_tasks():
+    release = threading.Event()
+    executor = StagedExecutor(1)
+    blocker = executor.submit("listing", release.wait, 5)
+    failing = executor.submit("listing", lambda: 1 / 0)
+    extracted = []
+    executor.submit("extraction", extracted.append, "article")
+    executor.shutdown(cancel=True)
+    release.set()
+    blocker.result()
+
+    stats = executor.stats()
+    assert failing.cancelled() and stats["listing"]["cancelled"] == 1
+    assert stats["extraction"]["cancelled"] == 1 and stats["extraction"]["queued"] == 0
+    assert extracted == []
+
+    executor = StagedExecutor(1)
+    with pytest.raises(ZeroDivisionError):
+        executor.submit("listing", lambda: 1 / 0).result()
+    assert executor.stats()["listing"]["failed"] == 1
+    executor.shutdown()
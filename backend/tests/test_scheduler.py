@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import openai
+import pytest
+
+from backend.noovox.core import BaseAgent
+from backend.noovox.scheduler import Priority, RequestScheduler, TokenBucket
+
+MODEL = "gpt-4o-mini"
+
+
+def make_agent(fake_openai, tmp_path, scheduler):
+    return BaseAgent("Tester", "economics", str(tmp_path / "missing.txt"), api_key="test-key",
+                     base_url=fake_openai.base_url, scheduler=scheduler)
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(per_minute=600)  # 10 tokens per second
+    assert bucket.wait_time(600) == 0
+    bucket.consume(600)
+    assert 0.9 < bucket.wait_time(10) <= 1.0
+    assert bucket.wait_time(10_000) > 59  # larger than the bucket: admitted once it is full
+
+
+def test_retries_rate_limits_and_server_errors(fake_openai, tmp_path):
+    scheduler = RequestScheduler(base_delay=0.01)
+    fake_openai.failures = [429, 503]
+    assert make_agent(fake_openai, tmp_path, scheduler).ask_openai("hi") == "Hello from the fake model"
+
+    stats = scheduler.stats()[MODEL]
+    assert len(fake_openai.requests) == 3
+    assert (stats["retries"], stats["rate_limited"], stats["server_errors"], stats["failed"]) == (2, 1, 1, 0)
+
+
+def test_gives_up_after_max_retries_and_on_client_errors(fake_openai, tmp_path):
+    scheduler = RequestScheduler(base_delay=0.01, max_retries=1)
+    agent = make_agent(fake_openai, tmp_path, scheduler)
+
+    fake_openai.failures = [429, 429]
+    with pytest.raises(openai.RateLimitError):
+        agent.ask_openai("hi")
+
+    fake_openai.failures = [400]
+    with pytest.raises(openai.BadRequestError):
+        agent.ask_openai("hi")
+    assert len(fake_openai.requests) == 3
+    assert scheduler.stats()[MODEL]["failed"] == 2
+
+
+def test_interactive_requests_overtake_background_work():
+    scheduler = RequestScheduler(tokens_per_minute=6000)  # 100 tokens per second
+    scheduler.run(MODEL, lambda: None, tokens=6000)  # drain the bucket
+    order = []
+
+    def submit(name, priority):
+        thread = threading.Thread(target=scheduler.run, args=(MODEL, lambda: order.append(name), 10, priority))
+        thread.start()
+        while scheduler.stats()[MODEL]["queue_depth"] < len(threads) + 1:
+            time.sleep(0.001)
+        return thread
+
+    threads = []
+    threads.append(submit("background 1", Priority.BACKGROUND))
+    threads.append(submit("background 2", Priority.BACKGROUND))
+    threads.append(submit("interactive", Priority.INTERACTIVE))
+    stats = scheduler.stats()[MODEL]
+    assert (stats["queue_depth"], stats["interactive"], stats["background"]) == (3, 1, 2)
+
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "background 1", "background 2"]
+    assert scheduler.stats()[MODEL]["max_queue_depth"] == 3
+
+
+def test_cancelled_async_requests_leave_the_queue():
+    scheduler = RequestScheduler(requests_per_minute=1)
+
+    async def noop():
+        return None
+
+    async def main():
+        await scheduler.run_async(MODEL, noop)
+        waiting = asyncio.create_task(scheduler.run_async(MODEL, noop))
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()[MODEL]["queue_depth"] == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(main())
+    assert scheduler.stats()[MODEL]["queue_depth"] == 0
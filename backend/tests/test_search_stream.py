@@ -0,0 +1,56 @@
+import time
+
+
+def test_streams_every_article_of_the_full_search(news_site, searcher):
+    streamed = list(searcher.iter_news("inflation"))
+
+    assert len(streamed) == 9
+    assert len({article["url"] for article in streamed}) == 9
+    assert {a["url"] for a in streamed} == {a["url"] for a in searcher.search_news("inflation")}
+    assert all(article["relevance_score"] > 0 and article["full_text"] for article in streamed)
+
+
+def test_first_article_does_not_wait_for_the_slowest_source(news_site, searcher):
+    news_site.delays["/b/search"] = 0.5
+
+    started = time.monotonic()
+    stream = searcher.iter_news("inflation")
+    first = next(stream)
+    first_after = time.monotonic() - started
+    rest = list(stream)
+
+    assert first_after < 0.4
+    assert "/b/" not in first["url"]
+    assert len(rest) == 8
+
+
+def test_stops_after_limit_without_fetching_the_rest(news_site, searcher):
+    news_site.delays["/b/search"] = 0.5
+
+    started = time.monotonic()
+    articles = list(searcher.iter_news("inflation", limit=2))
+
+    assert len(articles) == 2
+    assert time.monotonic() - started < 0.4
+    assert not any(path.startswith("/b/articles") for path in news_site.hits)
+
+
+def test_search_news_overlaps_listing_and_extraction(news_site, searcher):
+    # Source A answers at once but its article pages are slow, source B the other way round.
+    # Without a barrier between the two phases the search takes one delay, not two.
+    searcher.max_threads = 10
+    news_site.delays["/b/search"] = 0.5
+    for i in range(4):
+        news_site.delays[f"/a/articles/{i}"] = 0.5
+
+    started = time.monotonic()
+    articles = searcher.search_news("inflation")
+    elapsed = time.monotonic() - started
+
+    assert len(articles) == 9
+    assert elapsed < 0.85
+    scores = [article["relevance_score"] for article in articles]
+    assert scores == sorted(scores, reverse=True)
+    stats = searcher.pipeline_stats
+    assert stats["listing"]["completed"] == 2
+    assert stats["extraction"]["completed"] == 9
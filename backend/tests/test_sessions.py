@@ -0,0 +1,236 @@
+import asyncio
+import itertools
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from backend.noovox.core import BaseAgent
+from backend.noovox.history import ConversationHistory
+from backend.noovox.sessions import InMemorySessionStore, MySQLSessionStore, SessionStore, SQLiteSessionStore
+
+
+class FakeMySQL:
+    """
+    Answers the statements of MySQLSessionStore the way the chat tables would.
+
+    Every chat exists except those in `missing`. Committed and rolled-back connections
+    are counted, and `open_transactions` counts connections released mid-transaction.
+    """
+
+    def __init__(self):
+        self.messages = []  # (message_id, chat_id, sender_type, message_text)
+        self.summaries = {}  # chat_id -> (summary_text, through_message_id)
+        self.missing = set()
+        self.ids = itertools.count(1)
+        self.open_transactions = 0
+
+    @contextmanager
+    def connection(self):
+        conn = FakeMySQLConnection(self)
+        yield conn
+        self.open_transactions += conn.in_transaction
+
+
+class FakeMySQLConnection:
+    def __init__(self, db):
+        self.db = db
+        self.in_transaction = False
+
+    def cursor(self):
+        return FakeMySQLCursor(self)
+
+    def commit(self):
+        self.in_transaction = False
+
+    def rollback(self):
+        self.in_transaction = False
+
+
+class FakeMySQLCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.db = conn.db
+        self.rowcount = 0
+        self.lastrowid = None
+        self.rows = []
+
+    def execute(self, sql, params):
+        self.conn.in_transaction = True
+        if sql.startswith("INSERT INTO chat_messages"):
+            role, content, chat_id = params
+            if chat_id in self.db.missing:
+                self.rowcount = 0
+                return
+            self.lastrowid = next(self.db.ids)
+            self.db.messages.append((self.lastrowid, chat_id, role, content))
+            self.rowcount = 1
+        elif sql.startswith("INSERT INTO chat_summaries"):
+            chat_id, summary, through = params
+            old_summary, old_through = self.db.summaries.get(chat_id, (summary, through))
+            if through >= old_through:
+                self.db.summaries[chat_id] = (summary, through)
+        elif sql.startswith("SELECT summary_text"):
+            self.rows = [self.db.summaries[params[0]]] if params[0] in self.db.summaries else []
+        elif sql.startswith("SELECT message_id"):
+            chat_id, after = params[:2]
+            rows = [(m_id, role, text) for m_id, c_id, role, text in reversed(self.db.messages)
+                    if c_id == chat_id and m_id > after]
+            self.rows = rows[:params[2]] if len(params) > 2 else rows
+        else:
+            raise AssertionError(f"Unexpected statement: {sql}")
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(params=["memory", "sqlite", "mysql"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    if request.param == "mysql":
+        return MySQLSessionStore(FakeMySQL())
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+def test_load_returns_newest_messages_after_the_summary(store):
+    ids = [store.append("chat-1", "user", f"message {i}") for i in range(6)]
+    store.append("chat-2", "user", "other chat")
+
+    snapshot = store.load("chat-1", limit=2)
+    assert [m.content for m in snapshot.messages] == ["message 4", "message 5"]
+    assert snapshot.summary == ""
+
+    store.save_summary("chat-1", "first three", through=ids[2])
+    store.save_summary("chat-1", "stale", through=ids[1])  # an older summary never wins
+    snapshot = store.load("chat-1")
+    assert (snapshot.summary, snapshot.summary_through) == ("first three", ids[2])
+    assert [m.content for m in snapshot.messages] == ["message 3", "message 4", "message 5"]
+    assert [m.content for m in store.load("chat-1", after=ids[4]).messages] == ["message 5"]
+
+
+def test_workers_share_a_session(store):
+    worker_a = ConversationHistory(store=store, session_id=7)
+    worker_b = ConversationHistory(store=store, session_id=7)
+
+    worker_a.append("user", "hello")
+    worker_a.append("assistant", "hi there")
+    assert [m["content"] for m in worker_b.window()] == ["hello", "hi there"]
+
+    worker_b.append("user", "how are you?")
+    assert [m["content"] for m in worker_a.window()] == ["hello", "hi there", "how are you?"]
+    assert len(worker_a) == 3
+
+
+def test_session_is_loaded_lazily_and_bounded(store):
+    for i in range(100):
+        store.append("long", "user" if i % 2 == 0 else "assistant", f"turn {i}")
+
+    history = ConversationHistory(max_messages=10, store=store, session_id="long")
+    assert len(history) == 0
+    history.window()
+    assert len(history) == 10
+    assert history.messages[-1]["content"] == "turn 99"
+
+
+def test_summaries_survive_restarts(store):
+    history = ConversationHistory(max_messages=4, store=store, session_id="s")
+    for i in range(6):
+        history.append("user" if i % 2 == 0 else "assistant", f"turn {i}")
+    history.compact(lambda summary, messages: f"{len(messages)} turns folded")
+
+    restarted = ConversationHistory(max_messages=4, store=store, session_id="s")
+    window = restarted.window()
+    assert window[0]["content"] == "Summary of the earlier conversation: 2 turns folded"
+    assert [m["content"] for m in window[1:]] == ["turn 2", "turn 3", "turn 4", "turn 5"]
+
+
+class SlowStore(InMemorySessionStore):
+    """A store whose every call blocks its thread, like SQLite on a busy disk."""
+
+    def append(self, session_id, role, content):
+        time.sleep(0.1)
+        return super().append(session_id, role, content)
+
+    def save_summary(self, session_id, summary, through):
+        time.sleep(0.1)
+        super().save_summary(session_id, summary, through)
+
+    def load(self, session_id, after=0, limit=None):
+        time.sleep(0.1)
+        return super().load(session_id, after, limit)
+
+
+def test_async_agent_keeps_store_io_off_the_event_loop(fake_openai, tmp_path):
+    agent = BaseAgent("Tester", "economics", str(tmp_path / "missing.txt"), api_key="test-key",
+                      base_url=fake_openai.base_url, session_store=SlowStore(), history_max_messages=2)
+
+    async def main():
+        # The tokenizer and HTTP client load once per process; only store I/O is measured
+        await agent.ask_openai_async("warm up", stateless=True)
+        lags = []
+
+        async def ticker():
+            while True:
+                started = time.monotonic()
+                await asyncio.sleep(0.01)
+                lags.append(time.monotonic() - started - 0.01)
+
+        ticking = asyncio.create_task(ticker())
+        await agent.ask_openai_async("first", session_id="s")
+        await agent.ask_openai_async("second", session_id="s")  # Over two messages, so the history is folded
+        async for _ in agent.stream_openai_async("third", session_id="s"):
+            pass
+        ticking.cancel()
+        return lags
+
+    lags = asyncio.run(main())
+    assert max(lags) < 0.08
+    assert any("Current summary" in r["messages"][-1]["content"] for r in fake_openai.requests)
+
+
+def test_incomplete_store_cannot_be_created():
+    class AppendOnlyStore(SessionStore):
+        def append(self, session_id, role, content):
+            return 1
+
+    with pytest.raises(TypeError):
+        AppendOnlyStore()
+
+
+def test_mysql_store_ends_every_transaction():
+    db = FakeMySQL()
+    store = MySQLSessionStore(db)
+    first = store.append(5, "user", "hello")
+    store.save_summary(5, "greeting", through=first)
+    store.load(5)
+    assert db.open_transactions == 0
+
+
+def test_mysql_store_rejects_unknown_chats():
+    db = FakeMySQL()
+    db.missing.add(404)
+    with pytest.raises(KeyError):
+        MySQLSessionStore(db).append(404, "user", "hello")
+    assert db.messages == []
+
+
+def test_asgi_app_builds_the_configured_store(monkeypatch, tmp_path):
+    from backend.noovox import asgi_server
+
+    monkeypatch.setattr(asgi_server, "SESSION_STORE", "mysql")
+    assert isinstance(asgi_server.build_session_store(), MySQLSessionStore)  # Connects on first use
+    monkeypatch.setattr(asgi_server, "SESSION_STORE", "sqlite")
+    monkeypatch.setattr(asgi_server, "SESSION_STORE_PATH", str(tmp_path / "sessions.db"))
+    assert isinstance(asgi_server.build_session_store(), SQLiteSessionStore)
+    monkeypatch.setattr(asgi_server, "SESSION_STORE", "memory")
+    assert asgi_server.build_session_store() is None
+    monkeypatch.setattr(asgi_server, "SESSION_STORE", "redis")
+    with pytest.raises(ValueError):
+        asgi_server.build_session_store()
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from backend.noovox.write_behind import BufferFullError, WriteBehindBuffer
+
+
+def test_flushes_when_batch_is_full():
+    batches = []
+    buffer = WriteBehindBuffer(batches.append, batch_size=3, flush_interval=10)
+    for i in range(6):
+        buffer.submit(i)
+    deadline = time.monotonic() + 2
+    while sum(len(b) for b in batches) < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    buffer.close()
+
+
+def test_flushes_after_interval():
+    flushed = threading.Event()
+    buffer = WriteBehindBuffer(lambda batch: flushed.set(), batch_size=100, flush_interval=0.05)
+    buffer.submit("event")
+    assert flushed.wait(1)
+    buffer.close()
+
+
+def test_rejects_when_full():
+    release = threading.Event()
+    buffer = WriteBehindBuffer(lambda batch: release.wait(), max_size=1, batch_size=1, flush_interval=0.01)
+    buffer.submit(1)  # picked up by the flush thread, which then blocks
+    time.sleep(0.05)
+    buffer.submit(2)  # fills the queue
+    with pytest.raises(BufferFullError):
+        buffer.submit(3)
+    assert buffer.stats()["rejected"] == 1
+    release.set()
+    buffer.close()
+
+
+def test_close_drains_pending_items():
+    written = []
+    buffer = WriteBehindBuffer(written.extend, batch_size=2, flush_interval=10)
+    for i in range(5):
+        buffer.submit(i)
+    buffer.close()
+    assert sorted(written) == [0, 1, 2, 3, 4]
+    with pytest.raises(BufferFullError):
+        buffer.submit(5)
+
+
+def test_failed_flush_is_retried_then_dropped():
+    attempts = []
+
+    def flush(batch):
+        attempts.append(batch)
+        raise RuntimeError("database down")
+
+    buffer = WriteBehindBuffer(flush, batch_size=10, flush_interval=0.01, max_retries=1)
+    buffer.submit("event")
+    buffer.close()
+    assert len(attempts) == 2
+    assert buffer.stats()["dropped"] == 1
+
+
+def test_close_does_not_wait_for_room_in_a_full_buffer():
+    release = threading.Event()
+    written = []
+
+    def flush(batch):
+        release.wait()
+        written.extend(batch)
+
+    buffer = WriteBehindBuffer(flush, max_size=1, batch_size=1, flush_interval=0.01)
+    buffer.submit(1)  # picked up by the flush thread, which then blocks
+    time.sleep(0.05)
+    buffer.submit(2)  # fills the queue
+
+    started = time.monotonic()
+    buffer.close(timeout=0.1)
+    assert time.monotonic() - started < 1
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while len(written) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert written == [1, 2]
+
+
+def test_every_accepted_item_is_flushed_when_closed_during_submits():
+    written = []
+    buffer = WriteBehindBuffer(written.extend, batch_size=50, flush_interval=0.01)
+
+    def produce():
+        while True:
+            try:
+                buffer.submit(object())
+            except BufferFullError:
+                return
+
+    producers = [threading.Thread(target=produce) for _ in range(4)]
+    for producer in producers:
+        producer.start()
+    time.sleep(0.05)
+    buffer.close()
+    for producer in producers:
+        producer.join()
+    assert buffer.stats()["accepted"] == len(written)
+
+
+def test_tracking_accepts_numeric_strings(monkeypatch):
+    from backend.noovox import server
+
+    submitted = []
+    monkeypatch.setattr(server.tracking_buffer, "submit", submitted.append)
+    response = server.app.test_client().post('/api/content_tracking',
+                                             json={'user_id': '1', 'content_type': 'view', 'content_id': '42'})
+    assert response.status_code == 202
+    assert submitted == [(1, 'view', 42)]